@@ -0,0 +1,83 @@
+"""
+Measures inline, thread and process execution of ``fds lint`` work for a
+growing number of files and reports where a worker pool starts paying off.
+
+Usage:
+    python benchmarks/bench_executor.py [--sizes 1,2,4,...] [--file-kb 4] [--repeat 3]
+
+The thresholds ``INLINE_MAX_FILES`` / ``INLINE_MAX_BYTES`` in ``fds_dev.main``
+are derived from this benchmark.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fds_dev.main import execute_plan, plan_execution  # noqa: E402
+from fds_dev.runner import LintRunner  # noqa: E402
+
+CONFIG = {
+    'rules': {
+        'require-section-license': 'on',
+        'section-order': {'order': ['About', 'Installation', 'Usage', 'Contributing', 'License']},
+        'broken-link-check': 'on',
+    }
+}
+MODES = ('inline', 'thread', 'process')
+
+
+def write_corpus(root: Path, count: int, file_kb: int):
+    section = "## {title}\n\nSee [the guide](#about) and [usage](usage.md).\n" + "Lorem ipsum dolor sit amet. " * 8 + "\n\n"
+    titles = ['About', 'Installation', 'Usage', 'Contributing', 'License']
+    body = "# Project\n\n"
+    while len(body) < file_kb * 1024:
+        body += section.format(title=titles[len(body) % len(titles)])
+    paths = []
+    for index in range(count):
+        path = root / f"doc_{index:05d}.md"
+        path.write_text(body, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def time_mode(mode: str, paths, repeat: int) -> float:
+    runner = LintRunner(CONFIG)
+    misses = [(path, None, os.path.getsize(path)) for path in paths]
+    best = float('inf')
+    for _ in range(repeat):
+        plan = plan_execution(misses, executor=mode)
+        start = time.perf_counter()
+        for _batch in execute_plan(plan, runner, misses):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='1,2,4,8,16,32,64,128,256')
+    parser.add_argument('--file-kb', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'files':>6} {'bytes':>10} " + " ".join(f"{mode:>10}" for mode in MODES) + "  fastest  auto")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (int(size) for size in args.sizes.split(',')):
+            root = Path(tmp) / str(count)
+            root.mkdir()
+            paths = write_corpus(root, count, args.file_kb)
+            timings = {mode: time_mode(mode, paths, args.repeat) for mode in MODES}
+            total_bytes = sum(os.path.getsize(p) for p in paths)
+            auto = plan_execution([(p, None, os.path.getsize(p)) for p in paths]).mode
+            fastest = min(timings, key=timings.get)
+            cells = " ".join(f"{timings[mode] * 1000:>8.1f}ms" for mode in MODES)
+            print(f"{count:>6} {total_bytes:>10} {cells}  {fastest:>7}  {auto}")
+
+
+if __name__ == '__main__':
+    main()
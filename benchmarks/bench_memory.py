@@ -0,0 +1,130 @@
+"""
+Measures the memory and pickle size of a parsed corpus with the slotted
+Document, Header, Link and LintError classes against the previous plain
+dataclasses, which also kept a list of line strings per document.
+
+Usage:
+    python benchmarks/bench_memory.py [--docs 100000]
+"""
+
+import argparse
+from dataclasses import dataclass, field
+import gc
+import pickle
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fds_dev.parser import MarkdownParser  # noqa: E402
+from fds_dev.rules import LintError  # noqa: E402
+
+TEMPLATE = (
+    "# Package {n}\n\n"
+    "Short introduction to package {n} with a [guide](docs/guide.md#install).\n\n"
+    "## Install\n\n"
+    "Run the installer and see [the site](https://example.com/{n}).\n\n"
+    "## Usage\n\n"
+    "- [Install](#install)\n- [Usage](#usage)\n\n"
+    "## License\n\nMIT\n"
+)
+RULE_NAMES = ("section-order", "broken-link-check-rule", "require-section-license")
+
+
+@dataclass
+class LegacyHeader:
+    level: int
+    text: str
+    line_number: int
+
+
+@dataclass
+class LegacyLink:
+    text: str
+    target: str
+    line_number: int
+    kind: str
+
+
+@dataclass
+class LegacyLintError:
+    line_number: int
+    message: str
+    rule_name: str
+
+
+@dataclass
+class LegacyDocument:
+    path: str
+    content: str
+    lines: List[str] = field(init=False)
+    headers: List[LegacyHeader] = field(default_factory=list)
+    links: List[LegacyLink] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.lines = self.content.splitlines()
+
+
+def fresh(value: str) -> str:
+    # A new string object, as produced by decoding a worker result or cache entry.
+    return value.encode().decode()
+
+
+def build_current(parser: MarkdownParser, count: int):
+    docs, errors = [], []
+    for n in range(count):
+        docs.append(parser.parse_text(f"docs/{n}.md", TEMPLATE.format(n=n)))
+        errors.extend(LintError(line_number=i, message="Broken link.", rule_name=fresh(name))
+                      for i, name in enumerate(RULE_NAMES, 1))
+    return docs, errors
+
+
+def build_legacy(parser: MarkdownParser, count: int):
+    docs, errors = [], []
+    for n in range(count):
+        parsed = parser.parse_text(f"docs/{n}.md", TEMPLATE.format(n=n))
+        doc = LegacyDocument(path=parsed.path, content=parsed.content)
+        doc.headers = [LegacyHeader(h.level, h.text, h.line_number) for h in parsed.headers]
+        doc.links = [LegacyLink(link.text, link.target, link.line_number, fresh(link.kind))
+                     for link in parsed.links]
+        docs.append(doc)
+        errors.extend(LegacyLintError(line_number=i, message="Broken link.", rule_name=fresh(name))
+                      for i, name in enumerate(RULE_NAMES, 1))
+    return docs, errors
+
+
+def measure(build, parser: MarkdownParser, count: int):
+    gc.collect()
+    tracemalloc.start()
+    docs, errors = build(parser, count)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    structure = [(doc.headers, doc.links) for doc in docs]
+    sizes = (len(pickle.dumps(structure, protocol=pickle.HIGHEST_PROTOCOL)),
+             len(pickle.dumps(errors, protocol=pickle.HIGHEST_PROTOCOL)))
+    return retained, sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--docs', type=int, default=100_000)
+    args = parser.parse_args()
+
+    markdown = MarkdownParser()
+    legacy = measure(build_legacy, markdown, args.docs)
+    current = measure(build_current, markdown, args.docs)
+    mb = 1024 * 1024
+    print(f"{args.docs} documents, {len(RULE_NAMES)} errors each")
+    print(f"{'':>22} {'legacy':>10} {'slotted':>10} {'saved':>7}")
+    rows = (("retained memory", legacy[0], current[0]),
+            ("pickled headers+links", legacy[1][0], current[1][0]),
+            ("pickled errors", legacy[1][1], current[1][1]))
+    for label, before, after in rows:
+        print(f"{label:>22} {before / mb:>8.1f}MB {after / mb:>8.1f}MB {1 - after / before:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
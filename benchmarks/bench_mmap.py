@@ -0,0 +1,92 @@
+"""
+Compares peak memory of regular and memory-mapped parsing of one large
+generated Markdown file. Each mode runs in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_mmap.py [--size-mb 200]
+
+``heap`` is the tracemalloc peak (Python allocations). ``peak rss`` also
+counts touched file pages of the mapping, which the OS can drop at any time.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import json, sys, time, tracemalloc
+sys.path.insert(0, sys.argv[3])
+from fds_dev.parser import MarkdownParser
+
+def peak_rss():
+    # VmHWM starts over at exec; ru_maxrss may include the parent's peak.
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+parser = MarkdownParser()
+tracemalloc.start()
+start = time.perf_counter()
+doc = parser.parse_mapped(sys.argv[2]) if sys.argv[1] == 'mapped' else parser.parse(sys.argv[2])
+elapsed = time.perf_counter() - start
+heap = tracemalloc.get_traced_memory()[1]
+maxrss = peak_rss()
+print(json.dumps({'heap': heap, 'maxrss': maxrss, 'seconds': elapsed,
+                  'headers': len(doc.headers), 'links': len(doc.links)}))
+"""
+
+
+def write_reference(path: str, size_mb: float):
+    """Writes a generated API reference: long prose with a heading and a link per entry."""
+    block = ("## Method {n}\n\n"
+             + "Returns the value of the field for the given key, or raises an error otherwise.\n" * 30
+             + "See [the spec](spec.md#method-{n}).\n\n")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# API Reference\n\n")
+        total = 0
+        n = 0
+        while total < size_mb * 1024 * 1024:
+            total += f.write(block.format(n=n))
+            n += 1
+
+
+def run_mode(mode: str, path: str) -> dict:
+    output = subprocess.run([sys.executable, '-c', CHILD, mode, path, str(ROOT)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-mb', type=float, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'reference.md')
+        write_reference(path, args.size_mb)
+        size = os.path.getsize(path)
+        print(f"file: {size / 1e6:.1f} MB")
+        print(f"{'mode':>8} {'heap':>10} {'peak rss':>10} {'time':>9} {'headers':>8} {'links':>8}")
+        for mode in ('regular', 'mapped'):
+            result = run_mode(mode, path)
+            print(f"{mode:>8} {result['heap'] / 1e6:>8.1f}MB {result['maxrss'] / 1e6:>8.1f}MB "
+                  f"{result['seconds']:>8.2f}s {result['headers']:>8} {result['links']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Measures MarkdownParser throughput on multi-MB Markdown documents against the
+previous two-regexes-per-line scanner.
+
+Usage:
+    python benchmarks/bench_parser.py [--sizes-mb 1,4,16] [--repeat 3]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fds_dev.parser import Document, Header, Link, MarkdownParser  # noqa: E402
+
+HEADER_REGEX = re.compile(r"^\s*(#{1,6})\s+(.*)")
+LINK_REGEX = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+
+
+def baseline_parse(content: str) -> Document:
+    """The pre-scanner approach: every line goes through both regexes, fences are ignored."""
+    doc = Document(path='bench.md', content=content)
+    for line_number, line in enumerate(doc.lines, 1):
+        match = HEADER_REGEX.match(line)
+        if match:
+            doc.headers.append(Header(level=len(match.group(1)), text=match.group(2).strip(), line_number=line_number))
+        for match in LINK_REGEX.finditer(line):
+            target = match.group(2).strip()
+            doc.links.append(Link(text=match.group(1).strip(), target=target, line_number=line_number,
+                                  kind=MarkdownParser._classify_link(target)))
+    return doc
+
+
+def make_document(size_mb: float) -> str:
+    """Prose with headings, link-heavy lists and fenced code, like a generated reference."""
+    block = (
+        "## Section {n}\n\n"
+        "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n"
+        "See [the guide](docs/guide.md#section-{n}) and [the API](https://example.com/api/{n}).\n\n"
+        "- [Item one](#section-{n})\n- Plain list item without links\n\n"
+        "```bash\n# install step {n}\npip install package-{n}\n```\n\n"
+    )
+    parts = []
+    total = 0
+    n = 0
+    while total < size_mb * 1024 * 1024:
+        part = block.format(n=n)
+        parts.append(part)
+        total += len(part)
+        n += 1
+    return "# Reference\n\n" + "".join(parts)
+
+
+def best_of(repeat: int, func, *args) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes-mb', default='1,4,16')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    markdown = MarkdownParser()
+    print(f"{'size':>8} {'baseline':>10} {'scanner':>10} {'speedup':>8} {'MB/s':>8}")
+    for size_mb in (float(size) for size in args.sizes_mb.split(',')):
+        content = make_document(size_mb)
+        baseline = best_of(args.repeat, baseline_parse, content)
+        scanner = best_of(args.repeat, markdown.parse_text, 'bench.md', content)
+        print(f"{size_mb:>6.1f}MB {baseline * 1000:>8.1f}ms {scanner * 1000:>8.1f}ms "
+              f"{baseline / scanner:>7.2f}x {size_mb / scanner:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Measures section-order on documents with many top-level headers against the
+previous per-header loop over every configured section name.
+
+Usage:
+    python benchmarks/bench_section_order.py [--sections 40] [--headers 1000,10000,100000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fds_dev.parser import Document, Header  # noqa: E402
+from fds_dev.rules import SectionOrder  # noqa: E402
+
+
+def baseline_apply(order, doc: Document) -> int:
+    """The previous matching: lowercase each name and header, test names in turn."""
+    errors = 0
+    last_found_index = -1
+    for header in doc.headers:
+        if header.level > 2:
+            continue
+        current_index = -1
+        for i, expected_text in enumerate(order):
+            if expected_text.lower() in header.text.lower():
+                current_index = i
+                break
+        if current_index != -1:
+            if current_index < last_found_index:
+                errors += 1
+            last_found_index = max(last_found_index, current_index)
+    return errors
+
+
+def make_order(count: int):
+    return [f"Section Topic {n:02d}" for n in range(count)]
+
+
+def make_document(order, header_count: int) -> Document:
+    """Generated reference docs: mostly unlisted headers, with listed sections in between."""
+    headers = []
+    for n in range(header_count):
+        if n % 10 == 0:
+            text = f"{order[(n // 10) % len(order)]} overview"
+        else:
+            text = f"Generated entry {n} for the reference of module number {n % 97}"
+        headers.append(Header(level=2, text=text, line_number=n + 1))
+    return Document(path='bench.md', content=None, headers=headers)
+
+
+def best_of(repeat: int, func, *args) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sections', type=int, default=40)
+    parser.add_argument('--headers', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    order = make_order(args.sections)
+    rule = SectionOrder({'order': order})
+    print(f"{args.sections} configured sections")
+    print(f"{'headers':>8} {'baseline':>10} {'matcher':>10} {'speedup':>8}")
+    for header_count in (int(count) for count in args.headers.split(',')):
+        doc = make_document(order, header_count)
+        assert len(rule.apply(doc)) == baseline_apply(order, doc)
+        baseline = best_of(args.repeat, baseline_apply, order, doc)
+        matcher = best_of(args.repeat, rule.apply, doc)
+        print(f"{header_count:>8} {baseline * 1000:>8.1f}ms {matcher * 1000:>8.1f}ms {baseline / matcher:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Times the main code paths on a generated corpus and compares the results
+with a stored baseline.
+
+Benchmarks:
+    parse           MarkdownParser.parse on every Markdown file
+    runner          LintRunner.run on every Markdown file, without a cache
+    lint.cold       `fds lint` in a subprocess, with the lint cache removed first
+    lint.warm       `fds lint` in a subprocess, with every file in the cache
+    detect          LanguageDetector.detect on the text of every Markdown file
+    comments.parse  CodeCommentParser.parse_file on every Python file
+    comments.render ParsedCodeFile.reconstruct_file on every parsed Python file
+
+Each benchmark reports the best and median of ``--repeat`` runs. Results are
+written as JSON; with ``--baseline``, a benchmark whose best time grew by
+more than ``--threshold`` (a fraction) and by at least ``--min-delta-ms``
+fails the run with exit status 1. The floor keeps timer noise on very short
+benchmarks from failing it. Compare results of the same corpus options on the same machine only.
+
+Usage:
+    python benchmarks/bench_suite.py [--output results.json] [--baseline baseline.json] [--threshold 0.1]
+                                     [--min-delta-ms 1] [--only parse,runner] [--repeat 5]
+                                     [corpus options, see corpus.py]
+
+Typical use: save a baseline on the main branch with ``--output``, then run
+a branch with ``--baseline`` pointing at it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from corpus import add_spec_arguments, spec_from_arguments, write_corpus  # noqa: E402
+from fds_dev.cache import resolve_cache_path  # noqa: E402
+from fds_dev.config import load_config  # noqa: E402
+from fds_dev.i18n.code_comment_parser import CodeCommentParser  # noqa: E402
+from fds_dev.i18n.language import LanguageDetector  # noqa: E402
+from fds_dev.parser import MarkdownParser  # noqa: E402
+from fds_dev.runner import LintRunner  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+def measure(repeat: int, func: Callable[[], object], setup: Callable[[], object] = None) -> Dict[str, float]:
+    """Best and median wall time of ``func`` over ``repeat`` runs; ``setup`` runs untimed before each."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {'best': min(samples), 'median': statistics.median(samples)}
+
+
+def fds_lint(target: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([sys.executable, '-m', 'fds_dev.main', 'lint', target], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"fds lint failed:\n{completed.stderr}")
+
+
+def build_benchmarks(paths: Dict[str, List[str]], docs: str) -> Dict[str, tuple]:
+    """Maps each benchmark name to ``(items, func, setup)``."""
+    markdown = paths['markdown']
+    python = paths['python']
+    parser = MarkdownParser()
+    detector = LanguageDetector()
+    comments = CodeCommentParser()
+    texts = [Path(path).read_text(encoding='utf-8') for path in markdown]
+    parsed = [comments.parse_file(path) for path in python]
+    config = load_config(docs)
+    cache_path = resolve_cache_path(docs)
+
+    def remove_cache():
+        for path in cache_path.parent.glob(cache_path.name + '*'):
+            path.unlink()
+
+    def fill_cache():
+        if not cache_path.exists():
+            fds_lint(docs)
+
+    def run_rules():
+        runner = LintRunner(config)
+        for path in markdown:
+            runner.run(path, {})
+
+    return {
+        'parse': (len(markdown), lambda: [parser.parse(path) for path in markdown], None),
+        'runner': (len(markdown), run_rules, None),
+        'lint.cold': (len(markdown), lambda: fds_lint(docs), remove_cache),
+        'lint.warm': (len(markdown), lambda: fds_lint(docs), fill_cache),
+        'detect': (len(texts), lambda: [detector.detect(text) for text in texts], None),
+        'comments.parse': (len(python), lambda: [comments.parse_file(path) for path in python], None),
+        'comments.render': (len(parsed), lambda: [item.reconstruct_file() for item in parsed], None),
+    }
+
+
+def compare(results: Dict[str, object], baseline: Dict[str, object], threshold: float,
+            min_delta: float) -> List[str]:
+    """Prints the change of every benchmark against ``baseline`` and returns the regressed names."""
+    if baseline.get('corpus') != results['corpus']:
+        print("warning: the baseline was measured on a different corpus", file=sys.stderr)
+    regressions = []
+    print(f"\n{'benchmark':<16} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in results['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None:
+            print(f"{name:<16} {'-':>10} {current['best'] * 1000:>8.1f}ms {'new':>8}")
+            continue
+        change = current['best'] / previous['best'] - 1
+        flag = ''
+        if change > threshold and current['best'] - previous['best'] >= min_delta:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<16} {previous['best'] * 1000:>8.1f}ms {current['best'] * 1000:>8.1f}ms {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', type=Path, help="write results as JSON")
+    parser.add_argument('--baseline', type=Path, help="compare with results written by an earlier run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default 0.1)")
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="slowdowns smaller than this are never regressions (default 1.0)")
+    parser.add_argument('--only', help="comma-separated benchmark names")
+    parser.add_argument('--repeat', type=int, default=5)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    spec = spec_from_arguments(args)
+    with tempfile.TemporaryDirectory(prefix='fds-bench-') as tmp:
+        paths = write_corpus(Path(tmp), spec)
+        benchmarks = build_benchmarks(paths, str(Path(tmp) / 'docs'))
+        selected = args.only.split(',') if args.only else list(benchmarks)
+        unknown = sorted(set(selected) - set(benchmarks))
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+        results = {
+            'version': RESULTS_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': spec.to_dict(),
+            'repeat': args.repeat,
+            'benchmarks': {},
+        }
+        print(f"{'benchmark':<16} {'items':>6} {'best':>10} {'median':>10} {'per item':>10}")
+        for name in selected:
+            items, func, setup = benchmarks[name]
+            timing = measure(args.repeat, func, setup)
+            results['benchmarks'][name] = dict(timing, items=items)
+            print(f"{name:<16} {items:>6} {timing['best'] * 1000:>8.1f}ms {timing['median'] * 1000:>8.1f}ms "
+                  f"{timing['best'] / max(items, 1) * 1e6:>8.1f}us")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Generates a deterministic documentation corpus for the benchmarks: Markdown
+files with a configurable size, header and link density and share of CJK
+paragraphs, and Python sources full of comments and docstrings.
+
+The same options and seed always produce byte-identical files, so results
+of different commits are measured on the same input.
+
+Usage:
+    python benchmarks/corpus.py OUTPUT [--files 200] [--file-kb 8] [--header-density 0.15]
+                                       [--link-density 0.3] [--cjk-ratio 0.1] [--python-files 50] [--seed 0]
+"""
+
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List
+
+WORDS = (
+    "the parser reads each file once and reports every section that is missing from the "
+    "configured order so documentation stays consistent across packages modules and guides "
+    "install configure cache worker index anchor heading link release build test deploy"
+).split()
+SECTIONS = ["About", "Installation", "Usage", "Configuration", "Contributing", "License"]
+LANGUAGES = ("python", "bash", "yaml")
+CONFIG = """rules:
+  require-section-license: 'on'
+  section-order:
+    order: [About, Installation, Usage, Configuration, Contributing, License]
+  broken-link-check: 'on'
+"""
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """
+    Shape of a generated corpus. Densities are the chance that a block is a
+    header and that a sentence carries a link; ``cjk_ratio`` is the share of
+    paragraphs and comments written in Korean, Chinese or Japanese.
+    """
+    files: int = 200
+    file_kb: int = 8
+    header_density: float = 0.15
+    link_density: float = 0.3
+    cjk_ratio: float = 0.1
+    python_files: int = 50
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def _cjk_word(rng: random.Random) -> str:
+    script = rng.randrange(3)
+    if script == 0:  # Hangul syllables
+        return ''.join(chr(rng.randrange(0xAC00, 0xD7A4)) for _ in range(rng.randint(2, 4)))
+    if script == 1:  # CJK unified ideographs
+        return ''.join(chr(rng.randrange(0x4E00, 0x9FA0)) for _ in range(rng.randint(2, 4)))
+    return ''.join(chr(rng.randrange(0x3041, 0x3097)) for _ in range(rng.randint(3, 6)))  # Hiragana
+
+
+def sentence(rng: random.Random, cjk: bool = False) -> str:
+    if cjk:
+        return ' '.join(_cjk_word(rng) for _ in range(rng.randint(4, 10))) + '.'
+    text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 16)))
+    return text[0].upper() + text[1:] + '.'
+
+
+def _link(rng: random.Random, spec: CorpusSpec, anchors: List[str]) -> str:
+    kind = rng.randrange(4)
+    if kind == 0 and anchors:
+        return f"[{rng.choice(WORDS)}](#{rng.choice(anchors)})"
+    if kind == 1:
+        section = rng.choice(SECTIONS).lower()
+        return f"[{rng.choice(WORDS)}](doc_{rng.randrange(spec.files):05d}.md#{section})"
+    if kind == 2:
+        return f"[{rng.choice(WORDS)}](doc_{rng.randrange(spec.files):05d}.md)"
+    return f"[{rng.choice(WORDS)}](https://example.com/{rng.choice(WORDS)}/{rng.randrange(1000)})"
+
+
+def markdown_document(spec: CorpusSpec, index: int) -> str:
+    """One Markdown file of roughly ``spec.file_kb`` KiB."""
+    rng = random.Random(f"md:{spec.seed}:{index}")
+    size = spec.file_kb * 1024
+    blocks = [f"# Package {index}"]
+    anchors: List[str] = []
+    sections = iter(SECTIONS)
+    length = 0
+    while length < size:
+        roll = rng.random()
+        if roll < spec.header_density:
+            # Listed sections come in order; the rest are free-form subsections.
+            title = next(sections, None) if rng.random() < 0.5 else None
+            level = 2 if title else rng.randint(2, 4)
+            title = title or sentence(rng, rng.random() < spec.cjk_ratio).rstrip('.')
+            anchors.append('-'.join(title.lower().split()))
+            block = f"{'#' * level} {title}"
+        elif roll < spec.header_density + 0.05:
+            lines = [f"# {rng.choice(WORDS)} = {rng.randrange(100)}" for _ in range(rng.randint(2, 6))]
+            block = f"```{rng.choice(LANGUAGES)}\n" + '\n'.join(lines) + "\n```"
+        else:
+            cjk = rng.random() < spec.cjk_ratio
+            parts = []
+            for _ in range(rng.randint(2, 6)):
+                parts.append(sentence(rng, cjk))
+                if rng.random() < spec.link_density:
+                    parts.append(_link(rng, spec, anchors))
+            block = ' '.join(parts)
+        blocks.append(block)
+        length += len(block.encode('utf-8')) + 2
+    return '\n\n'.join(blocks) + '\n'
+
+
+def python_source(spec: CorpusSpec, index: int) -> str:
+    """One Python module of roughly ``spec.file_kb`` KiB with comments and docstrings."""
+    rng = random.Random(f"py:{spec.seed}:{index}")
+    size = spec.file_kb * 1024
+    chunks = [f'"""{sentence(rng, rng.random() < spec.cjk_ratio)}"""\n\nimport os\n']
+    length = len(chunks[0])
+    function = 0
+    while length < size:
+        cjk = rng.random() < spec.cjk_ratio
+        lines = [f"# {sentence(rng, cjk)}" for _ in range(rng.randint(0, 3))]
+        lines.append(f"def function_{function}(path, depth=0):")
+        lines.append(f'    """{sentence(rng, cjk)}\n\n    {sentence(rng, cjk)}\n    """')
+        for step in range(rng.randint(2, 8)):
+            statement = f"    value_{step} = os.path.join(path, '#{step}')"
+            if rng.random() < 0.4:
+                statement += f"  # {sentence(rng, rng.random() < spec.cjk_ratio)}"
+            lines.append(statement)
+        lines.append("    return depth")
+        chunk = '\n\n' + '\n'.join(lines) + '\n'
+        chunks.append(chunk)
+        length += len(chunk.encode('utf-8'))
+        function += 1
+    return ''.join(chunks)
+
+
+def write_corpus(root: Path, spec: CorpusSpec) -> Dict[str, List[str]]:
+    """
+    Writes the corpus below ``root`` (Markdown in ``docs/`` with an
+    ``.fdsrc.yaml``, Python in ``src/``) and returns the written paths.
+    """
+    docs = root / 'docs'
+    src = root / 'src'
+    docs.mkdir(parents=True, exist_ok=True)
+    src.mkdir(parents=True, exist_ok=True)
+    (docs / '.fdsrc.yaml').write_text(CONFIG, encoding='utf-8')
+    paths: Dict[str, List[str]] = {'markdown': [], 'python': []}
+    for index in range(spec.files):
+        path = docs / f"doc_{index:05d}.md"
+        path.write_text(markdown_document(spec, index), encoding='utf-8', newline='\n')
+        paths['markdown'].append(str(path))
+    for index in range(spec.python_files):
+        path = src / f"module_{index:05d}.py"
+        path.write_text(python_source(spec, index), encoding='utf-8', newline='\n')
+        paths['python'].append(str(path))
+    return paths
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    defaults = CorpusSpec()
+    parser.add_argument('--files', type=int, default=defaults.files, help="Markdown files")
+    parser.add_argument('--file-kb', type=int, default=defaults.file_kb, help="approximate size of each file")
+    parser.add_argument('--header-density', type=float, default=defaults.header_density)
+    parser.add_argument('--link-density', type=float, default=defaults.link_density)
+    parser.add_argument('--cjk-ratio', type=float, default=defaults.cjk_ratio)
+    parser.add_argument('--python-files', type=int, default=defaults.python_files)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def spec_from_arguments(args: argparse.Namespace) -> CorpusSpec:
+    return CorpusSpec(files=args.files, file_kb=args.file_kb, header_density=args.header_density,
+                      link_density=args.link_density, cjk_ratio=args.cjk_ratio,
+                      python_files=args.python_files, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output', type=Path)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    paths = write_corpus(args.output, spec_from_arguments(args))
+    print(f"wrote {len(paths['markdown'])} Markdown and {len(paths['python'])} Python file(s) to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
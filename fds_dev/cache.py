@@ -0,0 +1,178 @@
+"""FDS-Dev module."""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_FILENAMES = {
+    'json': '.fds_cache.json',
+    'sqlite': '.fds_cache.sqlite',
+}
+
+def resolve_cache_path(target_path: str, backend: str = 'json') -> Path:
+    """
+    Returns the cache location for a lint target: inside the directory, or
+    next to the file when a single file is linted.
+    """
+    filename = CACHE_FILENAMES[backend]
+    path_obj = Path(target_path)
+    if path_obj.is_dir():
+        return path_obj / filename
+    parent = path_obj.parent if path_obj.parent.as_posix() else Path('.')
+    return parent / filename
+
+class CacheBackend(ABC):
+    """
+    Storage for per-file lint cache entries, keyed by file path.
+    Backends must be closed to persist pending writes.
+    """
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+
+    @abstractmethod
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def put(self, file_path: str, entry: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    def __getitem__(self, file_path: str) -> Dict[str, Any]:
+        entry = self.get(file_path)
+        if entry is None:
+            raise KeyError(file_path)
+        return entry
+
+    def __setitem__(self, file_path: str, entry: Dict[str, Any]):
+        self.put(file_path, entry)
+
+    def __contains__(self, file_path: str) -> bool:
+        return self.get(file_path) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class JsonCacheBackend(CacheBackend):
+    """
+    Keeps the whole cache in a single JSON document. Suited to small trees;
+    the file is parsed on first access and rewritten only if it changed.
+    """
+    def __init__(self, cache_path: Path):
+        super().__init__(cache_path)
+        self._entries: Optional[Dict[str, Any]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = {}
+            if self.cache_path.exists():
+                with self.cache_path.open('r', encoding='utf-8') as f:
+                    try:
+                        data = json.load(f)
+                    except json.JSONDecodeError:
+                        data = {}
+                if isinstance(data, dict):
+                    self._entries = data
+        return self._entries
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        return self._load().get(file_path)
+
+    def put(self, file_path: str, entry: Dict[str, Any]):
+        self._load()[file_path] = entry
+        self._dirty = True
+
+    def close(self):
+        if not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(self._entries, f, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+class SqliteCacheBackend(CacheBackend):
+    """
+    Stores one row per file in a WAL-mode SQLite database. Entries are read
+    on demand and updated rows are committed in batches while a run is still
+    in progress, so neither loading nor saving scales with the cache size.
+    """
+    SCHEMA_VERSION = 1
+
+    def __init__(self, cache_path: Path, batch_size: int = 500):
+        super().__init__(cache_path)
+        self.batch_size = batch_size
+        self._pending: Dict[str, str] = {}
+        import sqlite3
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(cache_path))
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version == self.SCHEMA_VERSION:
+            return
+        # Unknown or outdated layout: the cache is disposable, so start over.
+        with self._conn:
+            self._conn.execute('DROP TABLE IF EXISTS entries')
+            self._conn.execute('CREATE TABLE entries (path TEXT PRIMARY KEY, entry TEXT NOT NULL)')
+            self._conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        raw = self._pending.get(file_path)
+        if raw is None:
+            row = self._conn.execute('SELECT entry FROM entries WHERE path = ?', (file_path,)).fetchone()
+            if row is None:
+                return None
+            raw = row[0]
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+    def put(self, file_path: str, entry: Dict[str, Any]):
+        self._pending[file_path] = json.dumps(entry, separators=(',', ':'))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Commits all pending entries in a single transaction."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO entries (path, entry) VALUES (?, ?)',
+                self._pending.items(),
+            )
+        self._pending.clear()
+
+    def close(self):
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+CACHE_BACKENDS = {
+    'json': JsonCacheBackend,
+    'sqlite': SqliteCacheBackend,
+}
+
+def open_cache(target_path: str, backend: str = 'json') -> CacheBackend:
+    """Opens the lint cache for a target path using the named backend."""
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend '{backend}'. Choose one of: {', '.join(CACHE_BACKENDS)}.")
+    return CACHE_BACKENDS[backend](resolve_cache_path(target_path, backend))
@@ -1,7 +1,6 @@
 """FDS-Dev module."""
 
 import os
-import yaml
 from typing import Dict, Any
 
 DEFAULT_CONFIG = {
@@ -43,6 +42,8 @@ def load_config(start_path: str = '.') -> Dict[str, Any]:
     """
     config_path = find_config_file(start_path)
     if config_path:
+        import yaml
+
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
                 user_config = yaml.safe_load(f) or {}
@@ -56,6 +57,8 @@ def load_config(start_path: str = '.') -> Dict[str, Any]:
     return DEFAULT_CONFIG
 
 if __name__ == '__main__':
+    import yaml
+
     # To test, you would need a .fdsrc.yaml file in this directory or a parent.
     # We can create a dummy one for the test.
     dummy_yaml = """
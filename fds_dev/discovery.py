@@ -0,0 +1,162 @@
+"""FDS-Dev module."""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
+
+MARKDOWN_SUFFIXES = ('.md', '.markdown')
+
+@dataclass
+class IgnorePattern:
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+    # Directory (relative to the walk root, '' for the root) the pattern is scoped to.
+    base: str
+
+def _translate_glob(pattern: str) -> str:
+    """Translates a gitignore-style glob into a regex over '/'-separated paths."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            # 'dir/**' also matches the directory itself so it can be pruned.
+            parts.append('(?:/.*)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif char == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif char == '?':
+            parts.append('[^/]')
+            i += 1
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end + 1
+        elif char == '\\' and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return ''.join(parts)
+
+def parse_ignore_patterns(lines: Iterable[str], base: str = '') -> List[IgnorePattern]:
+    """
+    Parses .gitignore-style lines: comments, negation with '!', trailing '/'
+    for directories only, and patterns anchored when they contain a '/'.
+    """
+    patterns = []
+    for raw in lines:
+        line = raw.rstrip('\n').rstrip('\r')
+        if not line.strip() or line.startswith('#'):
+            continue
+        line = line.rstrip(' ')
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        anchored = '/' in line
+        line = line.lstrip('/')
+        body = _translate_glob(line)
+        regex = '^' + body + '$' if anchored else '^(?:.*/)?' + body + '$'
+        patterns.append(IgnorePattern(re.compile(regex), negate, dir_only, base))
+    return patterns
+
+def _is_ignored(patterns: List[IgnorePattern], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for pattern in patterns:
+        if pattern.dir_only and not is_dir:
+            continue
+        if pattern.base:
+            if not rel_path.startswith(pattern.base + '/'):
+                continue
+            candidate = rel_path[len(pattern.base) + 1:]
+        else:
+            candidate = rel_path
+        if pattern.regex.match(candidate):
+            ignored = not pattern.negate
+    return ignored
+
+def is_excluded(patterns: List[IgnorePattern], rel_path: str) -> bool:
+    """
+    Checks a file path against ignore patterns the way a walk would: the file
+    is excluded if it, or any directory above it, is ignored.
+    """
+    parts = rel_path.split('/')
+    for depth in range(1, len(parts)):
+        if _is_ignored(patterns, '/'.join(parts[:depth]), True):
+            return True
+    return _is_ignored(patterns, rel_path, False)
+
+def _read_gitignore(directory: str, base: str) -> List[IgnorePattern]:
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8') as f:
+            return parse_ignore_patterns(f, base)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+def discover_files(path: str, exclude: Optional[Iterable[str]] = None,
+                   suffixes: Tuple[str, ...] = MARKDOWN_SUFFIXES,
+                   use_gitignore: bool = True) -> Iterator[str]:
+    """
+    Yields the files under ``path`` that end with one of ``suffixes``.
+
+    The tree is walked once with ``os.scandir``. Hidden entries are skipped,
+    and so are paths matched by ``exclude`` globs (relative to ``path``) or by
+    ``.gitignore`` files found along the way. Ignored directories are pruned
+    without being listed. A file path is yielded as-is.
+    """
+    if not os.path.isdir(path):
+        yield path
+        return
+
+    patterns = parse_ignore_patterns(exclude or [])
+    # Each stack item carries the patterns in effect for that directory, so
+    # nested .gitignore files only apply to their own subtree.
+    stack = [(path, '', patterns)]
+    while stack:
+        directory, rel_dir, active = stack.pop()
+        if use_gitignore:
+            active = active + _read_gitignore(directory, rel_dir)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if _is_ignored(active, rel_path, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, rel_path, active))
+            elif entry.name.lower().endswith(suffixes):
+                yield entry.path
+        # Reversed so directories are visited in name order.
+        stack.extend(reversed(subdirs))
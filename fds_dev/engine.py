@@ -0,0 +1,120 @@
+"""FDS-Dev module."""
+
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from fds_dev.parser import Document
+from fds_dev.profiling import RunStats
+from fds_dev.rules import BaseRule, LintError, RuleContext, VisitorRule
+
+def _untimed(handler: Callable) -> Callable:
+    return handler
+
+def _timed(handler: Callable) -> Callable:
+    """Wraps a visitor handler to add its run time to the RuleContext passed last."""
+    def timed(*args):
+        started = time.perf_counter_ns()
+        handler(*args)
+        args[-1].elapsed += time.perf_counter_ns() - started
+    return timed
+
+class RuleEngine:
+    """
+    Runs a fixed set of rules over documents in a single traversal.
+
+    Visitor rules subscribe to header, link and line events by overriding the
+    matching ``visit_*`` methods; subscriptions and rule names are resolved
+    once, when the engine is built. Events are dispatched in document order:
+    for each line, the line itself, then its header, then its links. Rules
+    that only implement ``apply`` are called once per document instead.
+    """
+    def __init__(self, rules: Sequence[BaseRule]):
+        self.rules = list(rules)
+        # (rule, name, is_visitor) in registration order; errors keep this order.
+        entries = [(rule, rule.name, isinstance(rule, VisitorRule)) for rule in self.rules]
+        self._entries: List[Tuple[BaseRule, str, bool]] = entries
+        self._header_handlers: List[Tuple[int, Callable]] = []
+        self._link_handlers: List[Tuple[int, Callable]] = []
+        self._line_handlers: List[Tuple[int, Callable]] = []
+        for index, (rule, _, visitor) in enumerate(self._entries):
+            if not visitor:
+                continue
+            events = rule.subscriptions()
+            if 'header' in events:
+                self._header_handlers.append((index, rule.visit_header))
+            if 'link' in events:
+                self._link_handlers.append((index, rule.visit_link))
+            if 'line' in events:
+                self._line_handlers.append((index, rule.visit_line))
+
+    def run(self, doc: Document, stats: Optional[RunStats] = None) -> List[LintError]:
+        """
+        Applies every rule to ``doc`` and returns their errors, rule by rule.
+        With ``stats``, the time spent in each rule is recorded as well.
+        """
+        wrap = _timed if stats is not None else _untimed
+        contexts = [RuleContext(doc, name) if visitor else None for _, name, visitor in self._entries]
+        for (rule, _, visitor), context in zip(self._entries, contexts):
+            if visitor:
+                wrap(rule.begin)(context)
+
+        header_handlers = [(wrap(handler), contexts[index]) for index, handler in self._header_handlers]
+        link_handlers = [(wrap(handler), contexts[index]) for index, handler in self._link_handlers]
+        line_handlers = [(wrap(handler), contexts[index]) for index, handler in self._line_handlers]
+        headers = doc.headers if header_handlers else []
+        links = doc.links if link_handlers else []
+
+        if line_handlers:
+            self._walk_lines(doc, headers, links, header_handlers, link_handlers, line_handlers)
+        else:
+            self._walk_structure(headers, links, header_handlers, link_handlers)
+
+        errors: List[LintError] = []
+        for (rule, name, visitor), context in zip(self._entries, contexts):
+            if visitor:
+                wrap(rule.end)(context)
+                errors.extend(context.errors)
+                if stats is not None:
+                    stats.add_rule(name, context.elapsed)
+            elif stats is not None:
+                started = time.perf_counter_ns()
+                errors.extend(rule.apply(doc))
+                stats.add_rule(name, time.perf_counter_ns() - started)
+            else:
+                errors.extend(rule.apply(doc))
+        return errors
+
+    @staticmethod
+    def _walk_structure(headers, links, header_handlers, link_handlers):
+        # Headers and links are both in line order; merge them so that the
+        # events of one line are seen together.
+        link_index = 0
+        link_count = len(links)
+        for header in headers:
+            while link_index < link_count and links[link_index].line_number < header.line_number:
+                link = links[link_index]
+                for handler, context in link_handlers:
+                    handler(link, context)
+                link_index += 1
+            for handler, context in header_handlers:
+                handler(header, context)
+        for link in links[link_index:]:
+            for handler, context in link_handlers:
+                handler(link, context)
+
+    @staticmethod
+    def _walk_lines(doc, headers, links, header_handlers, link_handlers, line_handlers):
+        header_index = link_index = 0
+        header_count, link_count = len(headers), len(links)
+        for line_number in range(1, doc.line_count + 1):
+            line = doc.line(line_number)
+            for handler, context in line_handlers:
+                handler(line_number, line, context)
+            while header_index < header_count and headers[header_index].line_number == line_number:
+                for handler, context in header_handlers:
+                    handler(headers[header_index], context)
+                header_index += 1
+            while link_index < link_count and links[link_index].line_number == line_number:
+                for handler, context in link_handlers:
+                    handler(links[link_index], context)
+                link_index += 1
@@ -0,0 +1,94 @@
+"""FDS-Dev module."""
+
+import os
+from typing import Dict, Optional
+
+from fds_dev.profiling import RunStats
+
+class DirectoryCache:
+    """
+    Answers file existence questions from memoized directory listings.
+
+    Each directory is listed at most once with ``os.scandir`` and every
+    answer is remembered, so link tables that repeat the same targets cost
+    one dict lookup per link instead of a ``resolve()`` and ``stat()`` pair.
+    Paths are normalized lexically, the way a Markdown renderer resolves a
+    relative link.
+
+    With ``case_sensitive=True`` a name must match the listing exactly, even
+    on case-insensitive filesystems, which catches links that only work on
+    macOS or Windows. Otherwise a miss is confirmed with the filesystem so
+    its own case rules apply.
+
+    Hits and misses are also recorded as ``dircache.*`` counts into
+    ``run_stats`` while one is attached, for ``--profile`` and the metrics file.
+    """
+    def __init__(self, case_sensitive: bool = False, run_stats: Optional[RunStats] = None):
+        self.case_sensitive = case_sensitive
+        self.run_stats = run_stats
+        self.hits = 0
+        self.misses = 0
+        self.scans = 0
+        self._listings: Dict[str, Optional[Dict[str, bool]]] = {}
+        self._exists: Dict[str, bool] = {}
+
+    def clear(self):
+        """Forgets all listings, e.g. before re-linting after files changed."""
+        self._listings.clear()
+        self._exists.clear()
+
+    def _listing(self, directory: str) -> Optional[Dict[str, bool]]:
+        """Maps the names in ``directory`` to whether they are directories; None if it cannot be listed."""
+        if directory not in self._listings:
+            self.scans += 1
+            listing: Optional[Dict[str, bool]] = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            listing[entry.name] = entry.is_dir()
+                        except OSError:
+                            listing[entry.name] = False
+            except OSError:
+                listing = None
+            self._listings[directory] = listing
+        return self._listings[directory]
+
+    def exists(self, path: str) -> bool:
+        key = os.path.normpath(os.path.abspath(path))
+        if key in self._exists:
+            self.hits += 1
+            if self.run_stats is not None:
+                self.run_stats.add_count('dircache.hits')
+            return self._exists[key]
+        self.misses += 1
+        if self.run_stats is not None:
+            self.run_stats.add_count('dircache.misses')
+        self._exists[key] = result = self._lookup(key)
+        return result
+
+    def is_file(self, path: str) -> bool:
+        key = os.path.normpath(os.path.abspath(path))
+        if not self.exists(key):
+            return False
+        listing = self._listing(os.path.dirname(key))
+        name = os.path.basename(key)
+        if listing is not None and name in listing:
+            return not listing[name]
+        return os.path.isfile(key)
+
+    def _lookup(self, path: str) -> bool:
+        parent, name = os.path.split(path)
+        if not name:
+            return True  # The filesystem root.
+        if self.case_sensitive and not self.exists(parent):
+            return False
+        listing = self._listing(parent)
+        if listing is None:
+            return False
+        if name in listing:
+            return True
+        return not self.case_sensitive and os.path.exists(path)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'scans': self.scans}
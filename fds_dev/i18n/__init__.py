@@ -1,14 +1,36 @@
 """FDS-Dev module."""
 
-from .code_comment_parser import CodeCommentParser, CommentNode, ParsedCodeFile
-from .language import LanguageDetectionResult, LanguageDetector
-from .translation import TechnicalTermDatabase, TranslationEngine, TranslationResult
-from .metacognition import (
-    ConsistencyChecker,
-    ContextAnalyzer,
-    TranslationQualityOracle,
-    TranslationQualityTensor,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .code_comment_parser import CodeCommentParser, CommentNode, ParsedCodeFile
+    from .language import LanguageDetectionResult, LanguageDetector
+    from .translation import TechnicalTermDatabase, TranslationEngine, TranslationResult
+    from .metacognition import (
+        ConsistencyChecker,
+        ContextAnalyzer,
+        TranslationQualityOracle,
+        TranslationQualityTensor,
+    )
+
+# Public names mapped to the submodule that defines them. Submodules are
+# imported on first attribute access (PEP 562), so importing one part of the
+# package does not load the rest.
+_EXPORTS = {
+    "CodeCommentParser": ".code_comment_parser",
+    "CommentNode": ".code_comment_parser",
+    "ParsedCodeFile": ".code_comment_parser",
+    "LanguageDetector": ".language",
+    "LanguageDetectionResult": ".language",
+    "TranslationEngine": ".translation",
+    "TranslationResult": ".translation",
+    "TechnicalTermDatabase": ".translation",
+    "TranslationQualityOracle": ".metacognition",
+    "TranslationQualityTensor": ".metacognition",
+    "ConsistencyChecker": ".metacognition",
+    "ContextAnalyzer": ".metacognition",
+}
 
 __all__ = [
     "CodeCommentParser",
@@ -24,3 +46,16 @@ __all__ = [
     "ConsistencyChecker",
     "ContextAnalyzer",
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,45 @@
+"""FDS-Dev module."""
+
+import os
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, Optional
+
+def slugify(value: str) -> str:
+    """Turns heading text into the anchor slug used for '#fragment' links."""
+    value = value.strip().lower()
+    value = re.sub(r"[^\w\- ]", "", value)
+    value = value.replace(" ", "-")
+    return value
+
+def index_key(file_path: str) -> str:
+    """Normalizes a path so every spelling of the same file shares one entry."""
+    return os.path.normcase(os.path.abspath(file_path))
+
+class HeadingIndex:
+    """
+    The heading slugs of every Markdown file in a lint run, keyed by path.
+
+    It is built once per run from facts the lint phase already extracted (or
+    found in the cache), so checking a cross-file anchor is a dict and set
+    lookup. Files outside the run are loaded through ``loader`` on first use
+    and remembered; a loader result of None marks a file that does not exist.
+    """
+    def __init__(self, loader: Optional[Callable[[str], Optional[Iterable[str]]]] = None):
+        self.loader = loader
+        self._slugs: Dict[str, Optional[FrozenSet[str]]] = {}
+
+    def add(self, file_path: str, slugs: Iterable[str]):
+        self._slugs[index_key(file_path)] = frozenset(slugs)
+
+    def get(self, file_path: str) -> Optional[FrozenSet[str]]:
+        key = index_key(file_path)
+        if key not in self._slugs:
+            slugs = self.loader(file_path) if self.loader else None
+            self._slugs[key] = frozenset(slugs) if slugs is not None else None
+        return self._slugs[key]
+
+    def __contains__(self, file_path: str) -> bool:
+        return self.get(file_path) is not None
+
+    def __len__(self) -> int:
+        return sum(1 for slugs in self._slugs.values() if slugs is not None)
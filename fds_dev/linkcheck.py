@@ -0,0 +1,149 @@
+"""FDS-Dev module."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+LINK_CACHE_FILENAME = '.fds_links.json'
+
+DEFAULT_ALLOWED_STATUSES = (200, 201, 202, 203, 204, 205, 301, 302, 303, 307, 308)
+
+# Failures are often transient (timeouts, 5xx), so they are rechecked sooner.
+DEFAULT_FAILURE_TTL = 300.0
+
+class LinkCache:
+    """
+    Remembers external link results for ``ttl`` seconds, optionally in a JSON
+    file so later runs do not check the same URLs again. Without a path the
+    results only live as long as the object. Broken results expire after
+    ``failure_ttl`` seconds, capped at ``ttl``.
+    """
+    def __init__(self, cache_path: Optional[Path] = None, ttl: float = 86400.0,
+                 failure_ttl: float = DEFAULT_FAILURE_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.failure_ttl = min(failure_ttl, ttl)
+        self._entries: Optional[Dict[str, List]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, List]:
+        if self._entries is None:
+            self._entries = {}
+            if self.cache_path is not None and self.cache_path.exists():
+                try:
+                    with self.cache_path.open('r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    data = {}
+                if isinstance(data, dict):
+                    self._entries = data
+        return self._entries
+
+    def _expired(self, entry: List, now: float) -> bool:
+        return now - entry[1] >= (self.ttl if entry[0] else self.failure_ttl)
+
+    def get(self, url: str) -> Optional[bool]:
+        """The cached result for ``url``, or None if it is unknown or expired."""
+        entry = self._load().get(url)
+        if entry is None or self._expired(entry, time.time()):
+            return None
+        return entry[0]
+
+    def put(self, url: str, ok: bool):
+        self._load()[url] = [ok, time.time()]
+        self._dirty = True
+
+    def save(self):
+        """Writes the cache atomically, dropping expired entries."""
+        if not self._dirty or self.cache_path is None:
+            return
+        now = time.time()
+        live = {url: entry for url, entry in self._load().items() if not self._expired(entry, now)}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(live, f, separators=(',', ':'))
+        os.replace(tmp_path, self.cache_path)
+        self._entries = live
+        self._dirty = False
+
+class LinkChecker:
+    """
+    Checks external URLs concurrently on a thread pool. All requests share
+    one keep-alive connection pool, and at most ``per_host`` requests run
+    against the same host at a time.
+    """
+    def __init__(self, timeout: float = 3.0, allowed_statuses: Iterable[int] = DEFAULT_ALLOWED_STATUSES,
+                 max_workers: int = 16, per_host: int = 4):
+        self.timeout = timeout
+        self.allowed_statuses: Set[int] = set(allowed_statuses)
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.requests_made = 0
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def check_url(self, url: str) -> bool:
+        import requests
+
+        session = self._get_session()
+        with self._host_limit(url):
+            try:
+                with self._lock:
+                    self.requests_made += 1
+                response = session.head(url, allow_redirects=True, timeout=self.timeout)
+                response.close()
+                if response.status_code in self.allowed_statuses:
+                    return True
+                if response.status_code >= 400:
+                    # Some servers reject HEAD; retry with a streamed GET.
+                    with self._lock:
+                        self.requests_made += 1
+                    response = session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                    response.close()
+                    return response.status_code in self.allowed_statuses
+                return True
+            except requests.RequestException:
+                return False
+
+    def check(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """Checks every URL once and returns whether each one is reachable."""
+        unique = sorted(set(urls))
+        if not unique:
+            return {}
+        if len(unique) == 1:
+            return {unique[0]: self.check_url(unique[0])}
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as executor:
+            return dict(zip(unique, executor.map(self.check_url, unique)))
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,301 @@
+"""FDS-Dev module."""
+
+import json
+import queue
+import re
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+from fds_dev.config import find_config_file, load_config
+from fds_dev.parser import Document, Header, Link, MarkdownParser
+from fds_dev.rules import LintError
+from fds_dev.runner import LintRunner
+
+# LSP constants (see the Language Server Protocol specification).
+SYNC_INCREMENTAL = 2
+SEVERITY_WARNING = 2
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+_EOF = object()
+
+# Per-line parse results, stored without line numbers so that edits above a
+# line never invalidate it: ((level, text) or None, ((text, target, kind), ...),
+# fence marker or None). Fence state depends on earlier lines, so it is only
+# applied when a Document is materialized.
+ParsedLine = Tuple[Optional[Tuple[int, str]], Tuple[Tuple[str, str, str], ...], Optional[Tuple[str, int, bool]]]
+
+def uri_to_path(uri: str) -> str:
+    parsed = urlparse(uri)
+    if parsed.scheme != 'file':
+        return uri
+    return url2pathname(unquote(parsed.path))
+
+def _utf16_index(line: str, units: int) -> int:
+    """Converts an LSP character offset (UTF-16 code units) into a str index."""
+    if line.isascii():
+        return min(units, len(line))
+    count = 0
+    for index, char in enumerate(line):
+        if count >= units:
+            return index
+        count += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+def _utf16_length(line: str) -> int:
+    return len(line) + sum(1 for char in line if ord(char) > 0xFFFF)
+
+class DocumentBuffer:
+    """
+    An open editor buffer. Keeps the text as lines plus the parse result of
+    every line, and re-parses only the lines touched by an incremental edit.
+    """
+    def __init__(self, path: str, text: str, parser: MarkdownParser):
+        self.path = path
+        self.parser = parser
+        self.lines: List[str] = []
+        self.parsed: List[ParsedLine] = []
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        self.lines = _LINE_BREAK.split(text)
+        self.parsed = [self._parse_line(line) for line in self.lines]
+
+    def _parse_line(self, line: str) -> ParsedLine:
+        header, links = self.parser.parse_line(line, 0)
+        return (
+            (header.level, header.text) if header else None,
+            tuple((link.text, link.target, link.kind) for link in links),
+            self.parser.fence_marker(line),
+        )
+
+    def apply_change(self, change: Dict[str, Any]):
+        """Applies one TextDocumentContentChangeEvent."""
+        if 'range' not in change:
+            self.set_text(change['text'])
+            return
+
+        start, end = change['range']['start'], change['range']['end']
+        last = len(self.lines) - 1
+        start_line = min(start['line'], last)
+        end_line = min(end['line'], last)
+        start_char = _utf16_index(self.lines[start_line], start['character']) if start['line'] <= last else len(self.lines[last])
+        end_char = _utf16_index(self.lines[end_line], end['character']) if end['line'] <= last else len(self.lines[last])
+
+        prefix = self.lines[start_line][:start_char]
+        suffix = self.lines[end_line][end_char:]
+        new_lines = _LINE_BREAK.split(prefix + change['text'] + suffix)
+        self.lines[start_line:end_line + 1] = new_lines
+        self.parsed[start_line:end_line + 1] = [self._parse_line(line) for line in new_lines]
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    def document(self) -> Document:
+        """Materializes a Document from the per-line parse results, skipping fenced code."""
+        doc = Document(path=self.path, content=self.text)
+        fence: Optional[Tuple[str, int, int]] = None
+        for index, (header, links, marker) in enumerate(self.parsed):
+            line_number = index + 1
+            if fence is not None:
+                if MarkdownParser.closes_fence(fence, marker):
+                    doc.fences.append((fence[2], line_number))
+                    fence = None
+                continue
+            if marker is not None:
+                fence = (marker[0], marker[1], line_number)
+                continue
+            if header:
+                doc.headers.append(Header(level=header[0], text=header[1], line_number=line_number))
+            for text, target, kind in links:
+                doc.links.append(Link(text=text, target=target, line_number=line_number, kind=kind))
+        if fence is not None:
+            doc.fences.append((fence[2], doc.line_count))
+        return doc
+
+class LanguageServer:
+    """
+    A minimal stdio Language Server that publishes lint errors as diagnostics
+    for open Markdown buffers. Diagnostics after an edit are debounced so a
+    burst of keystrokes is linted once. Rules run offline: external links
+    are left to ``fds lint`` so the editor never waits on the network.
+    """
+    def __init__(self, reader: BinaryIO, writer: BinaryIO, debounce: float = 0.03):
+        self.reader = reader
+        self.writer = writer
+        self.debounce = debounce
+        self.parser = MarkdownParser()
+        self.buffers: Dict[str, DocumentBuffer] = {}
+        self.pending: Dict[str, float] = {}
+        self.published: Dict[str, List[Dict[str, Any]]] = {}
+        self.runners: Dict[Optional[str], LintRunner] = {}
+        self.messages: "queue.Queue[Any]" = queue.Queue()
+        self.shutdown_requested = False
+        self.running = True
+
+    # --- transport ---
+
+    def _read_message(self) -> Optional[Dict[str, Any]]:
+        length = None
+        while True:
+            line = self.reader.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            name, _, value = line.decode('ascii', errors='replace').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value.strip())
+        if length is None:
+            return None
+        return json.loads(self.reader.read(length).decode('utf-8'))
+
+    def _read_loop(self):
+        try:
+            while True:
+                message = self._read_message()
+                if message is None:
+                    break
+                self.messages.put(message)
+        finally:
+            self.messages.put(_EOF)
+
+    def send(self, payload: Dict[str, Any]):
+        body = json.dumps({'jsonrpc': '2.0', **payload}, separators=(',', ':')).encode('utf-8')
+        self.writer.write(f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+        self.writer.flush()
+
+    # --- main loop ---
+
+    def serve(self) -> int:
+        """Serves until 'exit' or end of input; returns the process exit code."""
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        while self.running:
+            timeout = None
+            if self.pending:
+                timeout = max(0.0, min(self.pending.values()) - time.monotonic())
+            try:
+                message = self.messages.get(timeout=timeout)
+            except queue.Empty:
+                message = None
+            if message is _EOF:
+                self._publish_due(flush=True)
+                break
+            if message is not None:
+                self.handle(message)
+            self._publish_due()
+        return 0 if self.shutdown_requested else 1
+
+    def handle(self, message: Dict[str, Any]):
+        """
+        Handles one message. Malformed params fail only that message: requests
+        get an invalid-params error and the server keeps serving.
+        """
+        if not isinstance(message, dict):
+            return
+        try:
+            self._dispatch(message)
+        except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+            if 'id' in message:
+                self.send({'id': message['id'],
+                           'error': {'code': INVALID_PARAMS, 'message': f"Invalid params: {e!r}"}})
+
+    def _dispatch(self, message: Dict[str, Any]):
+        method = message.get('method')
+        params = message.get('params') or {}
+        if 'id' in message and method is None:
+            return  # A response to a request we never send.
+
+        if method == 'initialize':
+            self._reply(message, {
+                'capabilities': {
+                    'textDocumentSync': {'openClose': True, 'change': SYNC_INCREMENTAL, 'save': True},
+                },
+                'serverInfo': {'name': 'fds-dev'},
+            })
+        elif method == 'shutdown':
+            self.shutdown_requested = True
+            self._reply(message, None)
+        elif method == 'exit':
+            self.running = False
+        elif method == 'textDocument/didOpen':
+            item = params['textDocument']
+            uri = item['uri']
+            self.buffers[uri] = DocumentBuffer(uri_to_path(uri), item.get('text', ''), self.parser)
+            self.pending[uri] = time.monotonic()
+        elif method == 'textDocument/didChange':
+            uri = params['textDocument']['uri']
+            buffer = self.buffers.get(uri)
+            if buffer is not None:
+                for change in params.get('contentChanges', []):
+                    buffer.apply_change(change)
+                self.pending[uri] = time.monotonic() + self.debounce
+        elif method == 'textDocument/didSave':
+            uri = params['textDocument']['uri']
+            if uri in self.buffers:
+                self.pending[uri] = time.monotonic()
+        elif method == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            self.buffers.pop(uri, None)
+            self.pending.pop(uri, None)
+            self.published.pop(uri, None)
+            self.send({'method': 'textDocument/publishDiagnostics', 'params': {'uri': uri, 'diagnostics': []}})
+        elif 'id' in message:
+            self.send({'id': message['id'], 'error': {'code': METHOD_NOT_FOUND, 'message': f"Method not found: {method}"}})
+
+    def _reply(self, message: Dict[str, Any], result: Any):
+        self.send({'id': message['id'], 'result': result})
+
+    # --- diagnostics ---
+
+    def _runner_for(self, path: str) -> LintRunner:
+        config_path = find_config_file(path)
+        if config_path not in self.runners:
+            self.runners[config_path] = LintRunner(load_config(path), offline=True)
+        return self.runners[config_path]
+
+    def _publish_due(self, flush: bool = False):
+        now = time.monotonic()
+        for uri in [uri for uri, due in self.pending.items() if flush or due <= now]:
+            del self.pending[uri]
+            buffer = self.buffers.get(uri)
+            if buffer is not None:
+                self.publish(uri, buffer)
+
+    def publish(self, uri: str, buffer: DocumentBuffer):
+        try:
+            runner = self._runner_for(buffer.path)
+            runner.reset()
+            document = buffer.document()
+            errors = runner.apply_rules(document)
+            # Cross-file checks see only this buffer; linked files are read from disk.
+            facts = runner.collect_facts(document)
+            if runner.needs_project_check(facts):
+                errors.extend(runner.check_project({buffer.path: facts}).get(buffer.path, []))
+        except Exception as e:
+            errors = [LintError(line_number=0, message=f"An unexpected error occurred: {e}", rule_name="runner")]
+        diagnostics = [self._diagnostic(buffer, error) for error in errors]
+        if self.published.get(uri) == diagnostics:
+            return
+        self.published[uri] = diagnostics
+        self.send({'method': 'textDocument/publishDiagnostics', 'params': {'uri': uri, 'diagnostics': diagnostics}})
+
+    @staticmethod
+    def _diagnostic(buffer: DocumentBuffer, error: LintError) -> Dict[str, Any]:
+        line = min(max(error.line_number - 1, 0), len(buffer.lines) - 1)
+        return {
+            'range': {
+                'start': {'line': line, 'character': 0},
+                'end': {'line': line, 'character': _utf16_length(buffer.lines[line])},
+            },
+            'severity': SEVERITY_WARNING,
+            'source': 'fds',
+            'code': error.rule_name,
+            'message': error.message,
+        }
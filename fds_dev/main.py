@@ -2,42 +2,137 @@
 
 import click
 import os
-import glob
-import json
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from functools import partial
-from pathlib import Path
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
 
+# Only lightweight modules are imported eagerly so that `fds --help` and
+# small pre-commit runs start quickly. Worker pools, git, the language server
+# and the translation stack are imported by the code paths that use them.
+from fds_dev.cache import CACHE_BACKENDS, open_cache
 from fds_dev.config import load_config
+from fds_dev.discovery import discover_files
 from fds_dev.runner import LintRunner
 from fds_dev.parser import MarkdownParser
-from fds_dev.language import LanguageDetector
-from fds_dev.translator import TranslationEngine
-from fds_dev.output import OutputFormatter
+from fds_dev.output import RESULT_FORMATS, OutputFormatter, create_result_writer
+from fds_dev.profiling import RunStats
+from fds_dev.watch import PollingWatcher
 
 
-def resolve_cache_path(target_path: str) -> Path:
-    path_obj = Path(target_path)
-    if path_obj.is_dir():
-        return path_obj / '.fds_cache.json'
-    parent = path_obj.parent if path_obj.parent.as_posix() else Path('.')
-    return parent / '.fds_cache.json'
+# Below these limits a worker pool costs more to start than the linting itself
+# (see benchmarks/bench_executor.py for the measured crossover).
+INLINE_MAX_FILES = 16
+INLINE_MAX_BYTES = 512 * 1024
+EXECUTOR_MODES = ('auto', 'inline', 'thread', 'process')
 
 
-def load_cache(cache_path: Path):
-    if cache_path.exists():
-        with cache_path.open('r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-    return {}
+@dataclass
+class ExecutionPlan:
+    mode: str
+    workers: int
+    files: int
+    total_bytes: int
+    cache_hits: int
 
 
-def save_cache(cache, cache_path: Path):
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    with cache_path.open('w') as f:
-        json.dump(cache, f, indent=2)
+def plan_execution(misses, cache_hits: int = 0, jobs: Optional[int] = None,
+                   executor: str = 'auto') -> ExecutionPlan:
+    """
+    Chooses how to lint the files that missed the cache.
+
+    Small jobs run inline in the current process and everything else uses a
+    process pool. Network checks run in the project-wide phase, after the
+    per-file work, so threads are only used when ``executor`` asks for them.
+    ``jobs`` and ``executor`` override the estimate.
+    """
+    files = len(misses)
+    total_bytes = sum(size for _, _, size in misses)
+
+    mode = executor
+    if mode == 'auto':
+        if files == 0 or jobs == 1:
+            mode = 'inline'
+        elif (jobs or os.cpu_count() or 1) == 1:
+            # A single worker process cannot beat linting in place.
+            mode = 'inline'
+        elif files <= INLINE_MAX_FILES and total_bytes <= INLINE_MAX_BYTES:
+            mode = 'inline'
+        else:
+            mode = 'process'
+
+    if mode == 'inline':
+        workers = 1
+    elif jobs:
+        workers = jobs
+    elif mode == 'thread':
+        workers = min(32, (os.cpu_count() or 1) + 4)
+    else:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, files or 1))
+    return ExecutionPlan(mode=mode, workers=workers, files=files, total_bytes=total_bytes, cache_hits=cache_hits)
+
+
+def execute_plan(plan: ExecutionPlan, runner: LintRunner, misses) -> Iterator[List[tuple]]:
+    """
+    Lints the cache misses according to the plan, yielding batches of
+    LintResult tuples (file_path, file_hash, file_stat, errors, facts) as
+    they complete; ``facts`` feed the project-wide phase of the run.
+    """
+    from concurrent.futures import as_completed
+
+    if plan.mode == 'inline':
+        for file_path, entry, _ in misses:
+            cache = {file_path: entry} if entry else {}
+            yield [runner.run(file_path, cache)]
+    elif plan.mode == 'thread':
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=plan.workers) as executor:
+            futures = [
+                executor.submit(runner.run, file_path, {file_path: entry} if entry else {})
+                for file_path, entry, _ in misses
+            ]
+            for future in as_completed(futures):
+                yield [future.result()]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from fds_dev.runner import balance_chunks, decode_result, init_worker, lint_chunk
+
+        # Workers build their own runner once and receive size-balanced chunks
+        # of files, each carrying only its own cache entry.
+        with ProcessPoolExecutor(max_workers=plan.workers, initializer=init_worker,
+                                 initargs=(runner.config, runner.verify_hashes, runner.stats is not None)) as executor:
+            futures = [executor.submit(lint_chunk, chunk) for chunk in balance_chunks(misses, plan.workers * 4)]
+            for future in as_completed(futures):
+                results, worker_stats = future.result()
+                if worker_stats is not None:
+                    runner.stats.merge(worker_stats)
+                yield [decode_result(encoded) for encoded in results]
+
+
+def _query_git(function_name: str, *args, **kwargs):
+    """Calls a fds_dev.vcs helper; git support is only imported when used."""
+    from fds_dev import vcs
+
+    try:
+        return getattr(vcs, function_name)(*args, **kwargs)
+    except vcs.GitError as e:
+        raise click.ClickException(str(e)) from e
+
+
+def _exclude_patterns(config) -> Optional[List[str]]:
+    """The ``exclude`` globs of the config; a single string is one pattern, not one per character."""
+    exclude = config.get('exclude')
+    if exclude is None:
+        return None
+    if isinstance(exclude, str):
+        return [exclude]
+    if not isinstance(exclude, list) or not all(isinstance(pattern, str) for pattern in exclude):
+        raise click.BadParameter("must be a glob or a list of globs.", param_hint="'exclude' in .fdsrc.yaml")
+    return exclude
+
 
 @click.group()
 def cli():
@@ -47,65 +142,188 @@ def cli():
     """
     pass
 
-def run_lint_on_file(runner, cache, file_path):
-    """Helper function to be called by the process pool."""
-    return runner.run(file_path, cache)
-
 @cli.command()
 @click.argument('path', type=click.Path(exists=True))
-def lint(path):
+@click.option('--verify-hashes', is_flag=True, help="Re-hash every file instead of trusting cached stat signatures.")
+@click.option('--cache-backend', type=click.Choice(sorted(CACHE_BACKENDS)), default=None,
+              help="Lint cache storage. Defaults to 'cache.backend' in .fdsrc.yaml, or 'json'.")
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help="Number of parallel workers. Defaults to the CPU count.")
+@click.option('--executor', type=click.Choice(EXECUTOR_MODES), default='auto', show_default=True,
+              help="How to run lint jobs; 'auto' picks based on the amount of work.")
+@click.option('--changed-since', metavar='REF', default=None,
+              help="Only lint Markdown files changed between REF and the working tree.")
+@click.option('--staged', is_flag=True, help="Only lint staged Markdown files, reading their contents from the git index.")
+@click.option('--format', 'output_format', type=click.Choice(RESULT_FORMATS), default='text', show_default=True,
+              help="Report format: human-readable text, JSON Lines or SARIF 2.1.0.")
+@click.option('--watch', is_flag=True, help="Keep running and re-lint files as they change.")
+@click.option('--interval', type=click.FloatRange(min=0.05), default=0.5, show_default=True,
+              help="Seconds between change checks in --watch mode.")
+@click.option('--profile', is_flag=True,
+              help="Print time per stage and per rule, the slowest files and the cache hit ratio to stderr.")
+@click.option('--metrics-file', type=click.Path(dir_okay=False), default=None,
+              help="Write run statistics to this file in the OpenMetrics text format.")
+def lint(path, verify_hashes, cache_backend, jobs, executor, changed_since, staged, output_format, watch, interval,
+         profile, metrics_file):
     """Checks documentation for structural issues."""
+    started = time.perf_counter()
+    if staged and changed_since:
+        raise click.UsageError("--staged and --changed-since cannot be used together.")
+    if watch and (staged or changed_since):
+        raise click.UsageError("--watch cannot be combined with --staged or --changed-since.")
+    if watch and output_format != 'text':
+        raise click.UsageError("--watch only supports the text format.")
 
     # 1. Load cache and initialize components
     config = load_config(path)
-    cache_path = resolve_cache_path(path)
-    cache = load_cache(cache_path)
-    runner = LintRunner(config)
+    backend = cache_backend or config.get('cache', {}).get('backend', 'json')
+    try:
+        cache = open_cache(path, backend)
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+    stats = RunStats() if profile or metrics_file else None
+    runner = LintRunner(config, verify_hashes=verify_hashes, cache_dir=str(cache.cache_path.parent), stats=stats)
     formatter = OutputFormatter()
 
-    files_to_lint = []
-    if os.path.isdir(path):
-        # Find all markdown files recursively
-        files_to_lint.extend(glob.glob(os.path.join(path, '**', '*.md'), recursive=True))
-        files_to_lint.extend(glob.glob(os.path.join(path, '**', '*.markdown'), recursive=True))
-    else:
-        files_to_lint.append(path)
+    # 2. Resolve unchanged files from the cache while the tree is being walked,
+    # then lint the rest inline, on threads or on processes depending on the
+    # amount of work. Git modes replace the walk with the changed paths.
+    with cache:
+        exclude = _exclude_patterns(config)
+        # Snapshot before the first run so edits made while it runs are picked up.
+        watcher = PollingWatcher(path, exclude=exclude, interval=interval) if watch else None
+        if staged:
+            blobs = _query_git('staged_files', path, exclude=exclude)
+        elif changed_since:
+            files_to_lint = _query_git('changed_files', path, changed_since, exclude=exclude)
+        else:
+            files_to_lint = discover_files(path, exclude=exclude)
+
+        # Results are written as soon as they are known: cache hits while the
+        # tree is walked, misses batch by batch. They are only kept in memory
+        # when --watch needs them to re-render the report, or until the
+        # project-wide phase (e.g. cross-file anchors) has checked the file.
+        writer = create_result_writer(output_format)
+        kept = {} if watcher else None
+        facts_by_file = {}
+        deferred = {}
 
-    click.echo(f"Found {len(files_to_lint)} file(s) to lint...")
+        def emit(file_path, errors, facts):
+            if kept is not None:
+                kept[file_path] = errors
+            if facts:
+                facts_by_file[file_path] = facts
+                if runner.needs_project_check(facts):
+                    deferred[file_path] = errors
+                    return
+            writer.write_file(file_path, errors)
 
-    # 2. Run linting in parallel
-    results = []
-    with ProcessPoolExecutor() as executor:
-        # Use functools.partial to create a function with runner and cache arguments pre-filled
-        lint_func = partial(run_lint_on_file, runner, cache)
+        if staged:
+            # Index blobs are already in memory, so they are linted in place.
+            hit_count = 0
+            file_count = len(blobs)
+            batches = ([runner.run_content(file_path, content, cache)] for file_path, content in blobs.items())
+        else:
+            misses = []
+            hit_count = 0
+            for file_path, errors, entry, size in runner.iter_cached(files_to_lint, cache):
+                if errors is None:
+                    misses.append((file_path, entry, size))
+                else:
+                    hit_count += 1
+                    emit(file_path, errors, runner.cached_facts(entry))
+            file_count = hit_count + len(misses)
+            plan = plan_execution(misses, cache_hits=hit_count, jobs=jobs, executor=executor)
+            batches = execute_plan(plan, runner, misses)
+        # Status and progress go to stderr so stdout carries only the report.
+        click.echo(f"Found {file_count} file(s) to lint...", err=True)
 
-        future_to_file = {executor.submit(lint_func, file): file for file in files_to_lint}
+        with click.progressbar(length=file_count, label="Linting files", file=sys.stderr) as bar:
+            bar.update(hit_count)
+            for batch in batches:
+                for file_path, file_hash, file_stat, errors, facts in batch:
+                    emit(file_path, errors, facts)
 
-        with click.progressbar(as_completed(future_to_file), length=len(files_to_lint), label="Linting files") as bar:
-            for future in bar:
-                file_path, file_hash, errors = future.result()
-                results.append((file_path, errors))
+                    # 3. Update cache with new results; backends persist them
+                    # incrementally or when the cache is closed.
+                    if file_hash:
+                        cache[file_path] = runner.cache_entry(file_hash, file_stat, errors, facts)
+                bar.update(len(batch))
 
-                # 3. Update cache with new results
+        # 4. Check project-wide facts once every file is known, then finish the report
+        project_errors = runner.check_project(facts_by_file) if facts_by_file else {}
+        for file_path, errors in deferred.items():
+            writer.write_file(file_path, errors + project_errors.get(file_path, []))
+        writer.finish()
+        if profile:
+            click.echo("\nProfile:", err=True)
+            for line in stats.report():
+                click.echo(line, err=True)
+        if metrics_file:
+            from fds_dev.metrics import lint_metrics
+
+            lint_metrics(stats, file_count, writer.total_errors, time.perf_counter() - started).write(metrics_file)
+
+        if watcher:
+            watch_and_relint(watcher, runner, cache, formatter, kept.items(), facts_by_file)
+
+
+def watch_and_relint(watcher, runner, cache, formatter, results, facts_by_file=None):
+    """
+    Re-lints changed files with the resident runner and cache, then
+    re-renders the full result set, until interrupted.
+    """
+    results_by_file = dict(results)
+    facts_by_file = dict(facts_by_file or {})
+    click.secho("\nWatching for changes (press Ctrl+C to stop)...", fg="cyan")
+    try:
+        for changed, removed in watcher.changes():
+            runner.reset()
+            for file_path in removed:
+                results_by_file.pop(file_path, None)
+                facts_by_file.pop(file_path, None)
+            for file_path in changed:
+                file_path, file_hash, file_stat, errors, facts = runner.run(file_path, cache)
+                results_by_file[file_path] = errors
+                facts_by_file[file_path] = facts
                 if file_hash:
-                    cache[file_path] = {
-                        'hash': file_hash,
-                        'errors': [e.__dict__ for e in errors]
-                    }
+                    cache[file_path] = runner.cache_entry(file_hash, file_stat, errors, facts)
+            # Anchors into an edited file may have broken elsewhere, so the
+            # project-wide phase always re-checks every file.
+            project_errors = runner.check_project(facts_by_file) if facts_by_file else {}
+            click.clear()
+            formatter.display_lint_results(
+                (file_path, errors + project_errors.get(file_path, []))
+                for file_path, errors in sorted(results_by_file.items())
+            )
+            click.secho("\nWatching for changes (press Ctrl+C to stop)...", fg="cyan")
+    except KeyboardInterrupt:
+        pass
+
 
-    # 4. Save the updated cache
-    save_cache(cache, cache_path)
+@cli.command()
+@click.option('--debounce', type=click.FloatRange(min=0), default=0.03, show_default=True,
+              help="Seconds to wait after an edit before publishing diagnostics.")
+def lsp(debounce):
+    """Runs a Language Server over stdio for editor integration."""
+    from fds_dev.lsp import LanguageServer
 
-    # 5. Display results
-    formatter.display_lint_results(results)
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer, debounce=debounce)
+    sys.exit(server.serve())
 
 
 @cli.command()
 @click.argument('path', type=click.Path(exists=True))
 @click.option('--output', '-o', help="Output file path for the translated document.")
 @click.option('--in-place', is_flag=True, help="Translate the file in-place (overwrites the original).")
-def translate(path, output, in_place):
+@click.option('--metrics-file', type=click.Path(dir_okay=False), default=None,
+              help="Write run statistics to this file in the OpenMetrics text format.")
+def translate(path, output, in_place, metrics_file):
     """Translates docs and code comments to English."""
+    from fds_dev.language import LanguageDetector
+    from fds_dev.translator import TranslationEngine
+
+    started = time.perf_counter()
     click.echo(f"Translating {path}...")
 
     parser = MarkdownParser()
@@ -113,9 +331,10 @@ def translate(path, output, in_place):
     config = load_config(path)
     engine = TranslationEngine(config)
     formatter = OutputFormatter()
+    omega_scores = []
 
     try:
-        doc = parser.parse(path)
+        doc = parser.parse(path, features={'text'})
         source_lang_config = config.get('language', {}).get('source', 'auto')
         target_lang_config = config.get('language', {}).get('target', 'en')
 
@@ -130,6 +349,8 @@ def translate(path, output, in_place):
             return
 
         translated_content = engine.translate(doc.content, source_lang, target_lang_config)
+        if metrics_file:
+            omega_scores = _omega_scores(doc.content, translated_content, source_lang)
 
         if in_place:
             with open(path, 'w', encoding='utf-8') as f:
@@ -146,6 +367,26 @@ def translate(path, output, in_place):
         click.secho(f"Error: File not found at {path}", fg="red")
     except Exception as e:
         click.secho(f"An unexpected error occurred: {e}", fg="red")
+    finally:
+        if metrics_file:
+            from fds_dev.metrics import translate_metrics
+
+            translate_metrics(engine.translator.name, len(engine.latencies), engine.characters_sent, engine.latencies,
+                              omega_scores, time.perf_counter() - started).write(metrics_file)
+
+
+def _omega_scores(original: str, translated: str, source_lang: str) -> List[float]:
+    """
+    Ω scores of the translation from TranslationQualityOracle, paragraph by
+    paragraph when both texts have the same paragraphs, else for the whole text.
+    """
+    from fds_dev.i18n.metacognition import TranslationQualityOracle
+
+    oracle = TranslationQualityOracle()
+    originals = [part for part in re.split(r'\n\s*\n', original) if part.strip()]
+    translations = [part for part in re.split(r'\n\s*\n', translated) if part.strip()]
+    pairs = zip(originals, translations) if len(originals) == len(translations) else [(original, translated)]
+    return [oracle.evaluate(source, target, source_lang).omega_score for source, target in pairs]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,43 @@
+"""FDS-Dev module."""
+
+import re
+from typing import Dict, Iterable
+
+class SectionMatcher:
+    """
+    Finds the earliest of a list of section names contained in a header.
+
+    All names are lowercased once and compiled into a single alternation,
+    so a header that contains none of them (the common case in generated
+    docs) costs one regex search. When the search finds a name, only the
+    names listed before it still need a substring check. Names and text are
+    compared lowercased, as ``str.lower()`` would.
+    """
+    def __init__(self, sections: Iterable[str]):
+        self.sections = list(sections)
+        self._names = [section.lower() for section in self.sections]
+        # First index of each name; duplicates resolve to their earliest entry.
+        self._indexes: Dict[str, int] = {}
+        for index, name in enumerate(self._names):
+            self._indexes.setdefault(name, index)
+        self._search = None
+        if self._names:
+            # Capturing groups would disable the literal-prefix optimizations of re.
+            self._search = re.compile('|'.join(re.escape(name) for name in self._names)).search
+
+    def __bool__(self) -> bool:
+        return bool(self.sections)
+
+    def match(self, text: str) -> int:
+        """Returns the index of the earliest section name found in ``text``, or -1."""
+        if self._search is None:
+            return -1
+        lowered = text.lower()
+        found = self._search(lowered)
+        if found is None:
+            return -1
+        best = self._indexes[found.group()]
+        for index in range(best):
+            if self._names[index] in lowered:
+                return index
+        return best
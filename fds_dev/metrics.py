@@ -0,0 +1,216 @@
+"""FDS-Dev module."""
+
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fds_dev.profiling import RunStats
+
+# Upper bounds of the histogram buckets, in seconds for durations.
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                    1.0, 2.5, 5.0, 10.0)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+OMEGA_BUCKETS = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 1.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or (isinstance(value, float) and value.is_integer()):
+        return str(int(value))
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return '{' + pairs + '}' if pairs else ''
+
+class MetricFamily(ABC):
+    """A named metric with its samples by label set."""
+    kind = 'unknown'
+
+    def __init__(self, name: str, help_text: str, unit: Optional[str] = None):
+        if unit and not name.endswith('_' + unit):
+            raise ValueError(f"Metric name '{name}' must end with its unit '{unit}'.")
+        self.name = name
+        self.help_text = help_text
+        self.unit = unit
+        self._samples: Dict[Labels, object] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.kind}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        lines.append(f"# HELP {self.name} {_escape(self.help_text)}")
+        for labels, sample in self._samples.items():
+            lines.extend(self._render_sample(labels, sample))
+        return lines
+
+    @abstractmethod
+    def _render_sample(self, labels: Labels, sample) -> List[str]:
+        """The exposition lines of one label set."""
+
+class Counter(MetricFamily):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._samples[key] = self._samples.get(key, 0) + amount
+
+    def _render_sample(self, labels: Labels, sample) -> List[str]:
+        return [f"{self.name}_total{_format_labels(labels)} {_format_value(sample)}"]
+
+class Gauge(MetricFamily):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels: str):
+        self._samples[self._key(labels)] = value
+
+    def _render_sample(self, labels: Labels, sample) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(sample)}"]
+
+class Histogram(MetricFamily):
+    """Cumulative histogram over fixed bucket upper bounds."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], unit: Optional[str] = None):
+        super().__init__(name, help_text, unit)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        sample = self._samples.get(key)
+        if sample is None:
+            sample = self._samples[key] = [[0] * len(self.buckets), 0, 0.0]
+        counts = sample[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        sample[1] += 1
+        sample[2] += value
+
+    def _render_sample(self, labels: Labels, sample) -> List[str]:
+        counts, count, total = sample
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', repr(float(bound))),))} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Collects metric families and writes them in the OpenMetrics text format,
+    e.g. for the node-exporter textfile collector.
+    """
+    def __init__(self):
+        self.families: Dict[str, MetricFamily] = {}
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self.families:
+            raise ValueError(f"Metric '{family.name}' is already registered.")
+        self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, help_text: str, unit: Optional[str] = None) -> Counter:
+        return self._register(Counter(name, help_text, unit))
+
+    def gauge(self, name: str, help_text: str, unit: Optional[str] = None) -> Gauge:
+        return self._register(Gauge(name, help_text, unit))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float], unit: Optional[str] = None) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets, unit))
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families.values():
+            lines.extend(family.render())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        Writes the metrics atomically: a collector reading the file while it
+        is replaced sees either the previous or the new run, never a mix.
+        """
+        target = Path(path)
+        tmp_path = target.with_name(target.name + '.tmp')
+        with tmp_path.open('w', encoding='utf-8', newline='\n') as f:
+            f.write(self.render())
+        os.replace(tmp_path, target)
+
+def lint_metrics(stats: RunStats, files: int, issues: int, duration: float) -> MetricsRegistry:
+    """The metrics of an ``fds lint`` run, built from its RunStats."""
+    registry = MetricsRegistry()
+    registry.counter('fds_lint_files', "Markdown files scanned.").inc(files)
+    registry.counter('fds_lint_cache_hits', "Files whose lint results came from the cache.").inc(stats.cache_hits)
+    registry.counter('fds_lint_cache_misses', "Files linted because the cache had no current result.").inc(
+        stats.cache_misses)
+    registry.counter('fds_lint_read_bytes', "Bytes of Markdown read from disk or the git index.",
+                     unit='bytes').inc(stats.counts.get('read_bytes', 0))
+    links = registry.counter('fds_lint_links_checked', "Links validated by broken-link-check, by kind.")
+    for name, amount in sorted(stats.counts.items()):
+        if name.startswith('links.'):
+            links.inc(amount, kind=name[len('links.'):])
+    registry.counter('fds_lint_dircache_hits', "File-link lookups answered by the directory listing cache.").inc(
+        stats.counts.get('dircache.hits', 0))
+    registry.counter('fds_lint_dircache_misses',
+                     "File-link lookups the directory listing cache had not answered before.").inc(
+        stats.counts.get('dircache.misses', 0))
+    registry.counter('fds_lint_issues', "Lint issues reported.").inc(issues)
+
+    rules = registry.histogram('fds_lint_rule_duration_seconds',
+                               "Time spent in each rule per file (apply and collect) and in its project-wide phase.",
+                               DURATION_BUCKETS, unit='seconds')
+    for name, samples in sorted(stats.rules.items()):
+        rule_name, collect, _ = name.partition(' [collect]')
+        for elapsed in samples:
+            rules.observe(elapsed / 1e9, rule=rule_name, phase='collect' if collect else 'apply')
+    for rule_name, elapsed in sorted(stats.project.items()):
+        rules.observe(elapsed / 1e9, rule=rule_name, phase='project')
+
+    stages = registry.histogram('fds_lint_stage_duration_seconds', "Time spent per file in each stage of linting.",
+                                DURATION_BUCKETS, unit='seconds')
+    for stage, samples in sorted(stats.stages.items()):
+        for elapsed in samples:
+            stages.observe(elapsed / 1e9, stage=stage)
+
+    registry.gauge('fds_lint_duration_seconds', "Wall time of the run.", unit='seconds').set(duration)
+    registry.gauge('fds_lint_last_run_timestamp_seconds', "Unix time at which the run finished.",
+                   unit='seconds').set(time.time())
+    return registry
+
+def translate_metrics(provider: str, documents: int, characters: int, latencies: Iterable[float],
+                      omega_scores: Iterable[float], duration: float) -> MetricsRegistry:
+    """The metrics of an ``fds translate`` run."""
+    registry = MetricsRegistry()
+    registry.counter('fds_translate_documents', "Documents translated.").inc(documents, provider=provider)
+    registry.counter('fds_translate_characters', "Characters sent to the translation provider.").inc(
+        characters, provider=provider)
+    latency = registry.histogram('fds_translate_provider_latency_seconds', "Latency of each provider call.",
+                                 LATENCY_BUCKETS, unit='seconds')
+    for elapsed in latencies:
+        latency.observe(elapsed, provider=provider)
+    omega = registry.histogram('fds_translate_omega_score',
+                               "Translation quality (Ω score of TranslationQualityOracle) per paragraph.",
+                               OMEGA_BUCKETS)
+    for score in omega_scores:
+        omega.observe(score, provider=provider)
+    registry.gauge('fds_translate_duration_seconds', "Wall time of the run.", unit='seconds').set(duration)
+    registry.gauge('fds_translate_last_run_timestamp_seconds', "Unix time at which the run finished.",
+                   unit='seconds').set(time.time())
+    return registry
@@ -0,0 +1,149 @@
+"""FDS-Dev module."""
+
+import random
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# MinHash permutations are h(x) = (a * x + b) mod P over 32-bit shingle
+# hashes. With P < 2**31, a * x + b stays below 2**64, so NumPy's uint64
+# arithmetic is exact and both implementations produce the same signatures,
+# which keeps cached signatures valid whether or not NumPy is installed.
+_PRIME = (1 << 31) - 1
+
+_WORD = re.compile(r"\w+")
+
+# Shingles hashed per NumPy block. Each block allocates a few
+# num_perm x _BLOCK uint64 arrays (about 2 MB at 64 permutations), so peak
+# memory stays flat however large the document is.
+_BLOCK = 4096
+
+_numpy = None
+
+def _load_numpy():
+    """Imports NumPy on first use; returns None if it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+def words(text: str) -> List[str]:
+    """The lowercased words of ``text``."""
+    return _WORD.findall(text.lower())
+
+def shingles(tokens: Sequence[str], size: int = 5) -> Set[int]:
+    """
+    Hashes every run of ``size`` consecutive tokens to 32 bits. Shorter
+    token lists yield a single shingle.
+    """
+    if not tokens:
+        return set()
+    if len(tokens) <= size:
+        return {zlib.crc32(' '.join(tokens).encode('utf-8'))}
+    return {zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8')) for i in range(len(tokens) - size + 1)}
+
+class MinHasher:
+    """Computes MinHash signatures with ``num_perm`` seeded permutations."""
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self.a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+
+    def signature(self, hashes: Iterable[int]) -> List[int]:
+        """The minimum of each permutation over ``hashes``; empty if there are none."""
+        values = list(hashes)
+        if not values:
+            return []
+        numpy = _load_numpy()
+        if numpy is not None:
+            x = numpy.asarray(values, dtype=numpy.uint64)
+            a = numpy.asarray(self.a, dtype=numpy.uint64)[:, None]
+            b = numpy.asarray(self.b, dtype=numpy.uint64)[:, None]
+            prime = numpy.uint64(_PRIME)
+            minimum = None
+            for start in range(0, len(x), _BLOCK):
+                block = (a * x[start:start + _BLOCK] + b) % prime
+                block_min = block.min(axis=1)
+                minimum = block_min if minimum is None else numpy.minimum(minimum, block_min)
+            return minimum.tolist()
+        return [min((a * x + b) % _PRIME for x in values) for a, b in zip(self.a, self.b)]
+
+def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """The Jaccard similarity estimated from two signatures of equal length."""
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+def choose_bands(num_perm: int, threshold: float) -> int:
+    """
+    The number of LSH bands (a divisor of ``num_perm``) whose S-curve
+    midpoint, (1 / bands) ** (bands / num_perm), is closest to ``threshold``.
+    """
+    divisors = [bands for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    return min(divisors, key=lambda bands: abs((1 / bands) ** (bands / num_perm) - threshold))
+
+class LshIndex:
+    """
+    Groups signatures that agree on every row of at least one band.
+    Only keys sharing a bucket are ever compared, so finding near-duplicates
+    takes time roughly linear in the number of signatures.
+    """
+    def __init__(self, num_perm: int, bands: int):
+        self.rows = num_perm // bands
+        self.bands = bands
+        self.signatures: Dict[str, List[int]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+
+    def add(self, key: str, signature: List[int]):
+        self.signatures[key] = signature
+        rows = self.rows
+        for band in range(self.bands):
+            bucket = (band, tuple(signature[band * rows:(band + 1) * rows]))
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def clusters(self, threshold: float) -> List[List[str]]:
+        """
+        Groups of keys linked by an estimated similarity of at least
+        ``threshold``. Every pair in a bucket is compared unless the two keys
+        are already in the same group, so groups of copies still take one
+        comparison per member, and links found in different buckets are
+        joined through union-find.
+        """
+        parent: Dict[str, str] = {}
+
+        def find(key: str) -> str:
+            while parent.get(key, key) != key:
+                parent[key] = parent.get(parent[key], parent[key])
+                key = parent[key]
+            return key
+
+        for members in self._buckets.values():
+            if len(members) < 2:
+                continue
+            for index, first in enumerate(members):
+                for other in members[index + 1:]:
+                    root, other_root = find(first), find(other)
+                    if root != other_root and similarity(self.signatures[first], self.signatures[other]) >= threshold:
+                        parent[other_root] = root
+
+        groups: Dict[str, List[str]] = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        for root, members in groups.items():
+            if root not in members:
+                members.append(root)
+        return [sorted(members) for members in groups.values()]
+
+def closest(key: str, others: Iterable[str], signatures: Dict[str, List[int]]) -> Optional[Tuple[str, float]]:
+    """The member of ``others`` with the highest estimated similarity to ``key``."""
+    best: Optional[Tuple[str, float]] = None
+    for other in others:
+        score = similarity(signatures[key], signatures[other])
+        if best is None or score > best[1]:
+            best = (other, score)
+    return best
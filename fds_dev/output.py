@@ -1,39 +1,160 @@
 """FDS-Dev module."""
 
 import click
-from typing import List, Tuple
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from fds_dev.rules import LintError
 
+RESULT_FORMATS = ('text', 'jsonl', 'sarif')
+
+class ResultWriter(ABC):
+    """
+    Writes lint results one file at a time, as they become available.
+    Only counters are kept between files, so memory use does not grow with
+    the number of issues. Output is collected into blocks and written once
+    per ``BUFFER_SIZE`` bytes, or once per file when the stream is a terminal.
+    """
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.interactive = self.stream.isatty() if hasattr(self.stream, 'isatty') else False
+        self.file_count = 0
+        self.files_with_errors = 0
+        self.total_errors = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def start(self):  # noqa: B027 - optional hook, most formats have no header
+        """Optional hook that writes a header before the first file."""
+
+    def write_file(self, file_path: str, errors: List[LintError]):
+        self.file_count += 1
+        if errors:
+            self.files_with_errors += 1
+            self.total_errors += len(errors)
+        self.format_file(file_path, sorted(errors, key=lambda e: e.line_number))
+        if self.interactive:
+            self.flush()
+
+    @abstractmethod
+    def format_file(self, file_path: str, errors: List[LintError]):
+        """Writes the results of one file, sorted by line, through ``write()``."""
+
+    def finish(self):
+        self.flush()
+
+    def write(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            click.echo(''.join(self._buffer), file=self.stream, nl=False)
+            self._buffer.clear()
+            self._buffered = 0
+        self.stream.flush()
+
+class TextResultWriter(ResultWriter):
+    """The human-readable report, grouped by file."""
+    def format_file(self, file_path: str, errors: List[LintError]):
+        if not errors:
+            return
+        plural = 's' if len(errors) > 1 else ''
+        lines = [f"\n❌ Found {len(errors)} issue{plural} in {file_path}:"]
+        for error in errors:
+            line_info = f"L{error.line_number:<4}"
+            rule_info = f"({error.rule_name})"
+            lines.append(f"  - {line_info} {click.style(rule_info, fg='yellow'):<25} {error.message}")
+        self.write('\n'.join(lines) + '\n')
+
+    def finish(self):
+        if self.total_errors == 0:
+            plural = 's' if self.file_count > 1 else ''
+            self.write(click.style(f"\n✅ No issues found in {self.file_count} file{plural}.", fg="green") + '\n')
+        else:
+            self.write("-" * 40 + '\n')
+            self.write(click.style(f"Summary: Found {self.total_errors} total issues in {self.files_with_errors} files.", bold=True) + '\n')
+        super().finish()
+
+class JsonLinesResultWriter(ResultWriter):
+    """One JSON object per issue: path, line, rule and message."""
+    def format_file(self, file_path: str, errors: List[LintError]):
+        for error in errors:
+            record = {'path': file_path, 'line': error.line_number, 'rule': error.rule_name, 'message': error.message}
+            self.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+class SarifResultWriter(ResultWriter):
+    """
+    A SARIF 2.1.0 log with a single run. Results are streamed into the
+    document as they arrive; the tool description, which lists the rules
+    that reported issues, is written after them.
+    """
+    SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+    INFORMATION_URI = 'https://github.com/flamehaven01/FDS-Dev'
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        super().__init__(stream)
+        self.rule_ids: Set[str] = set()
+        self._separator = ''
+
+    def start(self):
+        self.write(f'{{"version":"2.1.0","$schema":"{self.SCHEMA}","runs":[{{"results":[')
+
+    def format_file(self, file_path: str, errors: List[LintError]):
+        uri = file_path.replace(os.sep, '/')
+        for error in errors:
+            location: Dict[str, Any] = {'artifactLocation': {'uri': uri}}
+            if error.line_number > 0:
+                location['region'] = {'startLine': error.line_number}
+            result = {
+                'ruleId': error.rule_name,
+                'level': 'warning',
+                'message': {'text': error.message},
+                'locations': [{'physicalLocation': location}],
+            }
+            self.write(self._separator + json.dumps(result, separators=(',', ':'), ensure_ascii=False))
+            self._separator = ','
+            self.rule_ids.add(error.rule_name)
+
+    def finish(self):
+        driver = {
+            'name': 'fds-dev',
+            'informationUri': self.INFORMATION_URI,
+            'rules': [{'id': rule_id} for rule_id in sorted(self.rule_ids)],
+        }
+        self.write('],"tool":' + json.dumps({'driver': driver}, separators=(',', ':')) + '}]}\n')
+        super().finish()
+
+RESULT_WRITERS = {
+    'text': TextResultWriter,
+    'jsonl': JsonLinesResultWriter,
+    'sarif': SarifResultWriter,
+}
+
+def create_result_writer(output_format: str, stream: Optional[IO[str]] = None) -> ResultWriter:
+    """Returns a started writer for one of ``RESULT_FORMATS``."""
+    if output_format not in RESULT_WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}'. Choose one of: {', '.join(RESULT_FORMATS)}.")
+    writer = RESULT_WRITERS[output_format](stream)
+    writer.start()
+    return writer
+
 class OutputFormatter:
-    def display_lint_results(self, results: List[Tuple[str, List[LintError]]]):
+    def display_lint_results(self, results: Iterable[Tuple[str, List[LintError]]]):
         """
         Displays a formatted list of linting errors, grouped by file.
         """
-        total_errors = 0
-        files_with_errors = 0
-
+        writer = create_result_writer('text')
         for file_path, errors in results:
-            if errors:
-                files_with_errors += 1
-                error_count = len(errors)
-                total_errors += error_count
-                plural = 's' if error_count > 1 else ''
-
-                click.secho(f"\n❌ Found {error_count} issue{plural} in {file_path}:")
-                for error in sorted(errors, key=lambda e: e.line_number):
-                    line_info = f"L{error.line_number:<4}"
-                    rule_info = f"({error.rule_name})"
-                    click.echo(f"  - {line_info} {click.style(rule_info, fg='yellow'):<25} {error.message}")
-
-        if total_errors == 0:
-            file_count = len(results)
-            plural = 's' if file_count > 1 else ''
-            click.secho(f"\n✅ No issues found in {file_count} file{plural}.", fg="green")
-        else:
-            click.echo("-" * 40)
-            click.secho(f"Summary: Found {total_errors} total issues in {files_with_errors} files.", bold=True)
-
+            writer.write_file(file_path, errors)
+        writer.finish()
 
     def display_translation_preview(self, original_path: str, translated_content: str):
         """
@@ -1,72 +1,445 @@
 """FDS-Dev module."""
 
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass
+import mmap
+import os
 import re
-from typing import List
+import sys
+from typing import Any, Iterable, Iterator, List, Match, Optional, Pattern, Tuple
+
+# Slotted classes keep large corpora compact. Python 3.9 has no
+# dataclass(slots=True), so __slots__ is declared by hand; __reduce__ pickles
+# the field values as a plain tuple instead of a per-object state dict.
 
 @dataclass
 class Header:
+    __slots__ = ('level', 'text', 'line_number')
     level: int
     text: str
     line_number: int
 
+    def __reduce__(self):
+        return Header, (self.level, self.text, self.line_number)
+
 @dataclass
 class Link:
+    __slots__ = ('text', 'target', 'line_number', 'kind')
     text: str
     target: str
     line_number: int
     kind: str
 
-@dataclass
+    def __post_init__(self):
+        # There are only a few kinds; each is stored once however many links there are.
+        self.kind = sys.intern(self.kind)
+
+    def __reduce__(self):
+        return Link, (self.text, self.target, self.line_number, self.kind)
+
+# Newlines are counted in slices of this size so that counting never copies
+# a large part of a memory-mapped file at once.
+_COUNT_CHUNK = 1 << 20
+
+def _count_newlines(buffer, start: int, end: int) -> int:
+    count = 0
+    while start < end:
+        stop = min(end, start + _COUNT_CHUNK)
+        count += buffer[start:stop].count(b'\n')
+        start = stop
+    return count
+
+def _line_patterns(body: bytes) -> Tuple[Pattern[bytes], Pattern[bytes]]:
+    return re.compile(body), re.compile(rb"\n" + body)
+
+def _match_lines(patterns: Tuple[Pattern[bytes], Pattern[bytes]], buffer, start: int, end: int) -> Iterator[Tuple[int, Match[bytes]]]:
+    """Yields (line_offset, match) for each line in buffer[start:end] that starts with a match."""
+    first, following = patterns
+    if start == 0:
+        match = first.match(buffer, 0, end)
+        if match:
+            yield 0, match
+    for match in following.finditer(buffer, start, end):
+        yield match.start() + 1, match
+
+def _number_lines(buffer, matches: Iterable[Tuple[int, Any]]) -> Iterator[Tuple[int, Any]]:
+    """Turns (offset, item) pairs in ascending offset order into (line_number, item) pairs."""
+    line_number = 1
+    position = 0
+    for offset, item in matches:
+        line_number += _count_newlines(buffer, position, offset)
+        position = offset
+        yield line_number, item
+
+# Document features a rule can depend on: 'text' is the raw ``content``; the
+# others are extracted by MarkdownParser.
+FEATURES = frozenset({'headers', 'links', 'fences', 'text'})
+STRUCTURE_FEATURES = frozenset({'headers', 'links', 'fences'})
+
 class Document:
-    path: str
-    content: str
-    lines: List[str] = field(init=False)
-    headers: List[Header] = field(default_factory=list)
-    links: List[Link] = field(default_factory=list)
+    """
+    A parsed Markdown document. The text is kept once, in ``content``; lines
+    are addressed through an ``array('I')`` of line start offsets rather than
+    a second copy of the text as a list of strings.
 
-    def __post_init__(self):
-        self.lines = self.content.splitlines()
-        if self.content == "":
-            self.lines = [""]
+    Documents returned by MarkdownParser hold only the features that were
+    asked for; ``headers``, ``links`` and ``fences`` are extracted by the
+    parser on first access otherwise.
+    """
+    __slots__ = ('path', 'content', '_headers', '_links', '_fences', '_line_offsets', '_parser')
+
+    def __init__(self, path: str, content: Optional[str], headers: Optional[List[Header]] = None,
+                 links: Optional[List[Link]] = None, fences: Optional[List[Tuple[int, int]]] = None,
+                 line_offsets: Optional[array] = None, parser: Optional['MarkdownParser'] = None):
+        self.path = path
+        # None for documents parsed from a memory-mapped file, which keep only
+        # the extracted structure.
+        self.content = content
+        # Without a parser to extract them later, missing features start empty.
+        lazy = parser is not None
+        self._headers: Optional[List[Header]] = headers if headers is not None or lazy else []
+        self._links: Optional[List[Link]] = links if links is not None or lazy else []
+        # (first_line, last_line) of each fenced code block, fence lines included.
+        self._fences: Optional[List[Tuple[int, int]]] = fences if fences is not None or lazy else []
+        self._line_offsets = line_offsets
+        self._parser = parser
+
+    @property
+    def headers(self) -> List[Header]:
+        if self._headers is None:
+            self._parser.complete(self, 'headers')
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: List[Header]):
+        self._headers = value
+
+    @property
+    def links(self) -> List[Link]:
+        if self._links is None:
+            self._parser.complete(self, 'links')
+        return self._links
+
+    @links.setter
+    def links(self, value: List[Link]):
+        self._links = value
+
+    @property
+    def fences(self) -> List[Tuple[int, int]]:
+        if self._fences is None:
+            self._parser.complete(self, 'fences')
+        return self._fences
+
+    @fences.setter
+    def fences(self, value: List[Tuple[int, int]]):
+        self._fences = value
+
+    @property
+    def line_offsets(self) -> array:
+        """Start offset in ``content`` of each line; computed on first use if the parser did not."""
+        if self._line_offsets is None:
+            self._line_offsets = _line_offsets(self.content)
+        return self._line_offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_offsets)
+
+    def line(self, line_number: int) -> str:
+        """Returns the text of a 1-based line without its line break."""
+        offsets = self.line_offsets
+        start = offsets[line_number - 1]
+        end = offsets[line_number] if line_number < len(offsets) else len(self.content)
+        return self.content[start:end].rstrip(_LINE_BREAKS)
+
+    @property
+    def lines(self) -> List[str]:
+        """The document's lines, built on demand; an empty document has one empty line."""
+        if self.content is None:
+            return []
+        return [line[:-1] if line.endswith('\r') else line for line in _split_lines(self.content)]
+
+    def __repr__(self) -> str:
+        loaded = [name for name in ('headers', 'links', 'fences') if getattr(self, '_' + name) is not None]
+        return f"Document(path={self.path!r}, lines={self.line_count}, loaded={loaded})"
+
+    def __reduce__(self):
+        # Line offsets are cheap to recompute and are left out of pickles.
+        return Document, (self.path, self.content, self.headers, self.links, self.fences)
+
+# Lines end at '\n' only, as in the byte scan of memory-mapped files; a '\r'
+# before it belongs to the line break. str.splitlines() would also break on
+# '\r', '\x0b', '\u2028' and others, so a file would parse differently
+# depending on whether it is mapped.
+_LINE_BREAKS = '\r\n'
+
+def _split_lines(content: str) -> List[str]:
+    """The lines of ``content`` without their '\\n'; an empty text has one empty line."""
+    lines = content.split('\n')
+    if len(lines) > 1 and not lines[-1]:
+        lines.pop()  # A final '\n' ends the last line rather than starting a new one.
+    return lines
+
+def _line_offsets(content: Optional[str]) -> array:
+    offsets = array('I')
+    if content is None:
+        return offsets
+    offsets.append(0)
+    position = 0
+    for line in _split_lines(content):
+        position += len(line) + 1
+        offsets.append(position)
+    # The last entry is the end of the final line; drop it unless the text is
+    # empty, which still counts as one (empty) line.
+    if len(offsets) > 1:
+        offsets.pop()
+    return offsets
 
 class MarkdownParser:
     """
     A simple parser to extract structural elements from a Markdown file.
+
+    Lines are scanned once. Fenced code blocks are tracked so that their
+    contents are never reported as headers or links, and cheap substring
+    checks decide whether a line needs a regex at all.
     """
-    def __init__(self):
-        self.header_regex = re.compile(r"^\s*(#{1,6})\s+(.*)")
+    # Bumped whenever the extracted structure changes, invalidating cached lint results.
+    version = 3
+
+    def __init__(self, mmap_threshold: Optional[int] = None):
+        # Files of at least this many bytes are parsed with parse_mapped().
+        self.mmap_threshold = mmap_threshold
+        # Header whitespace is ASCII only, like the byte pattern below; '\s'
+        # would also accept e.g. a no-break space after the '#'.
+        self.header_regex = re.compile(r"^[ \t\f\v]*(#{1,6})[ \t\f\v]+(.*)")
         self.link_regex = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+        self.fence_regex = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$")
+        # Byte-level equivalents for scanning a whole buffer, where a match
+        # must not run past the end of its line. Line patterns come as a pair:
+        # one for the first line and one anchored on the preceding newline,
+        # which lets the regex engine jump between newlines instead of trying
+        # a MULTILINE '^' at every byte.
+        self.header_bytes_regex = _line_patterns(rb"[ \t\f\v]*(#{1,6})[ \t\f\v]+([^\n]*)")
+        self.fence_bytes_regex = _line_patterns(rb"( {0,3}(?:`{3,}|~{3,})[^\n]*)")
+        self.link_bytes_regex = re.compile(rb"\[([^\]\n]+)\]\(([^)\n]+)\)")
 
-    def parse(self, file_path: str) -> Document:
+    def parse(self, file_path: str, features: Optional[Iterable[str]] = None) -> Document:
         """
         Parses a Markdown file and returns a Document object.
+
+        ``features`` names the parts of FEATURES to extract up front (all of
+        them by default); the others are extracted on first access.
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
+        wanted = STRUCTURE_FEATURES if features is None else frozenset(features)
+        # Mapped documents have no text, so rules that read it get a regular parse.
+        if 'text' not in wanted and self.maps(os.path.getsize(file_path)):
+            return self.parse_mapped(file_path, wanted)
+
+        # Line breaks are kept as written, the way parse_mapped() and parse_bytes() see them.
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
             content = f.read()
 
-        doc = Document(path=file_path, content=content)
+        return self.parse_text(file_path, content, wanted)
+
+    def maps(self, size: int) -> bool:
+        """Whether a file of ``size`` bytes is parsed through a memory map."""
+        return self.mmap_threshold is not None and size >= self.mmap_threshold
+
+    def parse_bytes(self, file_path: str, data: bytes, features: Optional[Iterable[str]] = None) -> Document:
+        """
+        Parses UTF-8 Markdown bytes that were already read, e.g. to hash them,
+        so the file does not have to be opened again.
+        """
+        return self.parse_text(file_path, data.decode('utf-8'), features)
+
+    def parse_mapped(self, file_path: str, features: Optional[Iterable[str]] = None) -> Document:
+        """
+        Parses a Markdown file through a read-only memory map. The file is
+        scanned as bytes and only matched headers and links are decoded, so
+        memory use follows the size of the extracted structure rather than
+        the file. The returned Document has no ``content``.
+        """
+        wanted = STRUCTURE_FEATURES if features is None else frozenset(features)
+        if os.path.getsize(file_path) == 0:
+            return self.parse_text(file_path, '', wanted)
+        doc = Document(path=file_path, content=None, parser=self)
+        if wanted & STRUCTURE_FEATURES:
+            self._extract_mapped(doc, 'headers' in wanted, 'links' in wanted)
+        return doc
+
+    def parse_text(self, file_path: str, content: str, features: Optional[Iterable[str]] = None) -> Document:
+        """
+        Parses Markdown content that is already in memory, e.g. a staged blob.
+        """
+        wanted = STRUCTURE_FEATURES if features is None else frozenset(features)
+        doc = Document(path=file_path, content=content, parser=self)
+        if wanted & STRUCTURE_FEATURES:
+            self._extract_text(doc, 'headers' in wanted, 'links' in wanted)
+        return doc
+
+    def complete(self, doc: Document, feature: str):
+        """Extracts a feature of ``doc`` that was not requested when it was parsed."""
+        want_headers, want_links = feature == 'headers', feature == 'links'
+        if doc.content is not None:
+            self._extract_text(doc, want_headers, want_links)
+        else:
+            self._extract_mapped(doc, want_headers, want_links)
+
+    def _extract_mapped(self, doc: Document, want_headers: bool, want_links: bool):
+        with open(doc.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self._scan_buffer(doc, buffer, want_headers, want_links)
+
+    def _scan_buffer(self, doc: Document, buffer, want_headers: bool, want_links: bool):
+        # Fence lines are rare, so they are resolved first. The header and
+        # link regexes then run in C over the byte ranges between fenced
+        # blocks, and only their matches are decoded.
+        fences: List[Tuple[int, int]] = []
+        segments = []
+        segment_start = 0
+        fence: Optional[Tuple[str, int, int, int]] = None
+        line_number = 0
+        fence_lines = _number_lines(buffer, _match_lines(self.fence_bytes_regex, buffer, 0, len(buffer)))
+        for line_number, match in fence_lines:
+            marker = self.fence_marker(match.group(1).decode('utf-8'))
+            if fence is not None:
+                if self.closes_fence(fence, marker):
+                    fences.append((fence[2], line_number))
+                    segment_start = match.end()
+                    fence = None
+            elif marker is not None:
+                fence = (marker[0], marker[1], line_number, match.start(1))
+                segments.append((segment_start, match.start(1)))
+        if fence is not None:
+            # An unclosed fence runs to the end of the document.
+            line_count = 1 + _count_newlines(buffer, 0, len(buffer))
+            if buffer[len(buffer) - 1:] == b'\n':
+                line_count -= 1
+            fences.append((fence[2], line_count))
+        else:
+            segments.append((segment_start, len(buffer)))
+        if doc._fences is None:
+            doc.fences = fences
+
+        if want_headers:
+            headers: List[Header] = []
+            header_lines = (item for start, end in segments
+                            for item in _match_lines(self.header_bytes_regex, buffer, start, end))
+            for line_number, match in _number_lines(buffer, header_lines):
+                headers.append(Header(level=len(match.group(1)), text=match.group(2).decode('utf-8').strip(),
+                                      line_number=line_number))
+            doc.headers = headers
 
-        for i, line in enumerate(doc.lines):
+        if want_links:
+            links: List[Link] = []
+            matches = ((match.start(), match) for start, end in segments
+                       for match in self.link_bytes_regex.finditer(buffer, start, end))
+            for line_number, match in _number_lines(buffer, matches):
+                target = match.group(2).decode('utf-8').strip()
+                links.append(Link(text=match.group(1).decode('utf-8').strip(), target=target,
+                                  line_number=line_number, kind=self._classify_link(target)))
+            doc.links = links
+
+    def _extract_text(self, doc: Document, want_headers: bool, want_links: bool):
+        # Fences and line offsets come with every scan; headers and links
+        # only when asked for.
+        offsets = array('I', [0])
+        fences: List[Tuple[int, int]] = []
+        headers: List[Header] = []
+        links: List[Link] = []
+        match_header = self.header_regex.match
+        find_links = self.link_regex.finditer
+        classify = self._classify_link
+        add_offset = offsets.append
+        position = 0
+        fence: Optional[Tuple[str, int, int]] = None
+
+        for line_number, line in enumerate(_split_lines(doc.content), 1):
+            # The list of lines is dropped after the scan.
+            position += len(line) + 1
+            add_offset(position)
+            if line.endswith('\r'):
+                line = line[:-1]
+            # Substring checks run in C and rule out most lines before any regex.
+            marker = self.fence_marker(line) if ('```' in line or '~~~' in line) else None
+            if fence is not None:
+                if self.closes_fence(fence, marker):
+                    fences.append((fence[2], line_number))
+                    fence = None
+                continue
+            if marker is not None:
+                fence = (marker[0], marker[1], line_number)
+                continue
+
+            if want_headers and '#' in line:
+                header_match = match_header(line)
+                if header_match:
+                    headers.append(Header(level=len(header_match.group(1)), text=header_match.group(2).strip(),
+                                          line_number=line_number))
+            if want_links and '](' in line:
+                for match in find_links(line):
+                    target = match.group(2).strip()
+                    links.append(Link(text=match.group(1).strip(), target=target,
+                                      line_number=line_number, kind=classify(target)))
+
+        if len(offsets) > 1:
+            offsets.pop()
+        if fence is not None:
+            # An unclosed fence runs to the end of the document.
+            fences.append((fence[2], len(offsets)))
+        if doc._line_offsets is None:
+            doc._line_offsets = offsets
+        if doc._fences is None:
+            doc.fences = fences
+        if want_headers:
+            doc.headers = headers
+        if want_links:
+            doc.links = links
+
+    def fence_marker(self, line: str) -> Optional[Tuple[str, int, bool]]:
+        """
+        Returns (fence character, fence length, has info string) if the line
+        opens or closes a fenced code block, otherwise None.
+        """
+        stripped = line.lstrip(' ')
+        if not stripped.startswith(('```', '~~~')):
+            return None
+        match = self.fence_regex.match(line)
+        if not match:
+            return None
+        fence, info = match.group(1), match.group(2).strip()
+        if fence[0] == '`' and '`' in info:
+            return None  # Inline code such as ```a``` is not a fence.
+        return fence[0], len(fence), bool(info)
+
+    @staticmethod
+    def closes_fence(fence: Tuple[str, int, int], marker: Optional[Tuple[str, int, bool]]) -> bool:
+        """Whether ``marker`` closes the open ``fence`` (same character, at least as long, no info string)."""
+        return marker is not None and marker[0] == fence[0] and marker[1] >= fence[1] and not marker[2]
+
+    def parse_line(self, line: str, line_number: int) -> Tuple[Optional[Header], List[Link]]:
+        """
+        Extracts the header (if any) and the links of a single line, ignoring
+        fences. Headers and links never span lines, so editors can re-parse
+        only the lines they touch.
+        """
+        header = None
+        if '#' in line:
             header_match = self.header_regex.match(line)
             if header_match:
                 level = len(header_match.group(1))
                 text = header_match.group(2).strip()
-                doc.headers.append(Header(level=level, text=text, line_number=i + 1))
-
-        doc.links = self._extract_links(doc.lines)
-
-        return doc
+                header = Header(level=level, text=text, line_number=line_number)
 
-    def _extract_links(self, lines: List[str]) -> List[Link]:
         links: List[Link] = []
-        for line_number, line in enumerate(lines, start=1):
-            for match in self.link_regex.finditer(line):
-                text = match.group(1).strip()
-                target = match.group(2).strip()
-                kind = self._classify_link(target)
-                links.append(Link(text=text, target=target, line_number=line_number, kind=kind))
-        return links
+        if '](' not in line:
+            return header, links
+        for match in self.link_regex.finditer(line):
+            text = match.group(1).strip()
+            target = match.group(2).strip()
+            kind = self._classify_link(target)
+            links.append(Link(text=text, target=target, line_number=line_number, kind=kind))
+        return header, links
 
     @staticmethod
     def _classify_link(target: str) -> str:
@@ -0,0 +1,138 @@
+"""FDS-Dev module."""
+
+import heapq
+import math
+import threading
+from typing import Any, Dict, List, Tuple
+
+# Stages of linting one file, in the order they run. 'lookup' resolves a
+# cache hit in the main process; the others run wherever the file is linted.
+STAGES = ('lookup', 'stat', 'read', 'hash', 'parse', 'rules', 'collect')
+
+DEFAULT_SLOWEST = 10
+
+def percentile(samples: List[int], fraction: float) -> int:
+    """The nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(round(fraction * len(ordered), 6)))
+    return ordered[rank - 1]
+
+class RunStats:
+    """
+    Timings of a lint run, in nanoseconds: samples per stage and per rule,
+    the slowest files, the project-wide phase of each rule and cache hits.
+    ``counts`` holds plain totals such as bytes read or links checked.
+
+    The runner only records into a RunStats when one is attached, so runs
+    without ``--profile`` pay for a few ``is None`` checks per file. Worker
+    processes keep their own instance and ship it back with ``export()``.
+    """
+    def __init__(self, slowest: int = DEFAULT_SLOWEST):
+        self.slowest = slowest
+        # Threads of one run share the runner and so its stats.
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Drops every sample in place. Rules hold a reference to the runner's
+        stats, so workers reset them after each export instead of replacing them.
+        """
+        self.stages: Dict[str, List[int]] = {}
+        self.rules: Dict[str, List[int]] = {}
+        self.project: Dict[str, int] = {}
+        # Min-heap of (duration, file_path) holding the slowest files.
+        self.files: List[Tuple[int, str]] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.counts: Dict[str, int] = {}
+
+    def add_stage(self, stage: str, elapsed: int):
+        self.stages.setdefault(stage, []).append(elapsed)
+
+    def add_rule(self, rule_name: str, elapsed: int):
+        self.rules.setdefault(rule_name, []).append(elapsed)
+
+    def add_project(self, rule_name: str, elapsed: int):
+        self.project[rule_name] = self.project.get(rule_name, 0) + elapsed
+
+    def add_file(self, file_path: str, elapsed: int):
+        with self._lock:
+            if len(self.files) < self.slowest:
+                heapq.heappush(self.files, (elapsed, file_path))
+            elif elapsed > self.files[0][0]:
+                heapq.heapreplace(self.files, (elapsed, file_path))
+
+    def add_cache_result(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def add_count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def export(self) -> Dict[str, Any]:
+        """A picklable snapshot for sending the stats of a worker to the parent."""
+        return {
+            'stages': self.stages,
+            'rules': self.rules,
+            'project': self.project,
+            'files': self.files,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'counts': self.counts,
+        }
+
+    def merge(self, exported: Dict[str, Any]):
+        """Adds the samples of an ``export()`` snapshot to these stats."""
+        for stage, samples in exported['stages'].items():
+            self.stages.setdefault(stage, []).extend(samples)
+        for rule_name, samples in exported['rules'].items():
+            self.rules.setdefault(rule_name, []).extend(samples)
+        for rule_name, elapsed in exported['project'].items():
+            self.add_project(rule_name, elapsed)
+        for elapsed, file_path in exported['files']:
+            self.add_file(file_path, elapsed)
+        self.cache_hits += exported['cache_hits']
+        self.cache_misses += exported['cache_misses']
+        for name, amount in exported['counts'].items():
+            self.add_count(name, amount)
+
+    def report(self) -> List[str]:
+        """The profile as lines of text: stage and rule tables, slowest files and the cache hit ratio."""
+        lines = [f"{'stage':<28} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9}"]
+        stages = [stage for stage in STAGES if stage in self.stages]
+        stages += sorted(stage for stage in self.stages if stage not in STAGES)
+        lines.extend(self._row(stage, self.stages[stage]) for stage in stages)
+
+        lines.append('')
+        lines.append(f"{'rule':<28} {'files':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>9}")
+        for rule_name, samples in sorted(self.rules.items(), key=lambda item: -sum(item[1])):
+            lines.append(self._row(rule_name, samples))
+        for rule_name, elapsed in sorted(self.project.items(), key=lambda item: -item[1]):
+            lines.append(self._row(f"{rule_name} [project]", [elapsed]))
+
+        if self.files:
+            lines.append('')
+            lines.append(f"slowest {len(self.files)} file(s):")
+            for elapsed, file_path in sorted(self.files, reverse=True):
+                lines.append(f"{elapsed / 1e6:>10.2f} ms  {file_path}")
+
+        total = self.cache_hits + self.cache_misses
+        ratio = self.cache_hits / total if total else 0.0
+        lines.append('')
+        lines.append(f"cache: {self.cache_hits}/{total} file(s) from cache ({ratio:.1%})")
+        lines.extend(f"{name}: {amount}" for name, amount in sorted(self.counts.items()))
+        return lines
+
+    @staticmethod
+    def _row(label: str, samples: List[int]) -> str:
+        total = sum(samples)
+        return (f"{label:<28} {len(samples):>7} {total / 1e6:>10.2f} {total / len(samples) / 1e6:>9.3f} "
+                f"{percentile(samples, 0.95) / 1e6:>9.3f}")
+
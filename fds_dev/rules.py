@@ -2,32 +2,81 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-import re
+from functools import lru_cache
+import hashlib
+import json
+import os
+import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 from urllib.parse import urldefrag
 
-import requests
-
-from fds_dev.parser import Document, Header
+from fds_dev.discovery import MARKDOWN_SUFFIXES
+from fds_dev.fscache import DirectoryCache
+from fds_dev.index import HeadingIndex, slugify
+from fds_dev.linkcheck import DEFAULT_ALLOWED_STATUSES, DEFAULT_FAILURE_TTL, LINK_CACHE_FILENAME, LinkCache, LinkChecker
+from fds_dev.matcher import SectionMatcher
+from fds_dev.minhash import LshIndex, MinHasher, choose_bands, closest, shingles, words
+from fds_dev.parser import FEATURES, Document, Header, Link, MarkdownParser
+from fds_dev.profiling import RunStats
 
 @dataclass
 class LintError:
+    __slots__ = ('line_number', 'message', 'rule_name')
     line_number: int
     message: str
     rule_name: str
 
+    def __post_init__(self):
+        # Errors decoded from worker results or the cache share one name string per rule.
+        self.rule_name = sys.intern(self.rule_name)
+
+    def __reduce__(self):
+        return LintError, (self.line_number, self.message, self.rule_name)
+
+@lru_cache(maxsize=None)
+def _rule_name(cls: type) -> str:
+    # Generates a rule name from the class name, e.g., RequireLicenseSection -> require-license-section
+    return sys.intern(''.join(['-' + i.lower() if i.isupper() else i for i in cls.__name__]).lstrip('-'))
+
 class BaseRule(ABC):
     """
     The base class for all linting rules.
+
+    Bump ``version`` whenever a rule's behavior changes so cached results
+    produced by the previous implementation are discarded.
     """
+    version = 1
+    # Project-wide rules extract per-file facts while a file is linted and
+    # check them against each other once every file of the run is known.
+    project_wide = False
+    # The Document features (see fds_dev.parser.FEATURES) that apply() and
+    # collect() read. The runner only extracts what its rules need up front.
+    requires = FEATURES
+
     def __init__(self, config):
         self.config = config
+        # Directory for state a rule keeps between runs; set by the runner.
+        self.cache_dir: Optional[str] = None
+        # RunStats to add counts to (e.g. links checked); set by the runner
+        # only when statistics are recorded.
+        self.stats: Optional[RunStats] = None
+        # Set by the runner where network I/O must be skipped, e.g. in the
+        # language server, which lints on every keystroke.
+        self.offline = False
 
     @property
     def name(self) -> str:
-        # Generates a rule name from the class name, e.g., RequireLicenseSection -> require-license-section
-        return ''.join(['-' + i.lower() if i.isupper() else i for i in self.__class__.__name__]).lstrip('-')
+        return _rule_name(self.__class__)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A digest of the rule's name, implementation version and configuration.
+        Cached results are only reused when the fingerprint is unchanged.
+        """
+        payload = json.dumps([self.name, self.version, self.config], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
 
     @abstractmethod
     def apply(self, doc: Document) -> List[LintError]:
@@ -37,88 +86,179 @@ class BaseRule(ABC):
         """
         pass
 
+    def reset(self):  # noqa: B027 - optional hook, a no-op for stateless rules
+        """
+        Optional hook that drops state shared between the files of a run, such
+        as filesystem caches. Stateless rules keep this no-op.
+        """
+
+    def collect(self, doc: Document) -> Any:
+        """
+        Returns the facts about a document that ``check_project`` needs.
+        Facts are stored in the lint cache, so they must be JSON-serializable.
+        """
+        return None
+
+    def needs_project_check(self, facts: Any) -> bool:
+        """Whether ``check_project`` may report errors for a file with these facts."""
+        return False
+
+    def check_project(self, facts_by_file: Dict[str, Any]) -> Dict[str, List[LintError]]:
+        """
+        Checks the collected facts of every file in the run and returns the
+        resulting errors by file path. Runs once per run, in the main process.
+        """
+        return {}
+
+class RuleContext:
+    """The state of one visitor rule while the engine traverses one document."""
+    __slots__ = ('doc', 'rule_name', 'errors', 'state', 'elapsed')
+
+    def __init__(self, doc: Document, rule_name: str):
+        self.doc = doc
+        self.rule_name = rule_name
+        self.errors: List[LintError] = []
+        # Free for the rule's per-document state; rule instances are shared
+        # between threads, so state must not be kept on the rule itself.
+        self.state: Any = None
+        # Nanoseconds spent in the rule's handlers, when profiling.
+        self.elapsed = 0
+
+    def report(self, line_number: int, message: str):
+        self.errors.append(LintError(line_number=line_number, message=message, rule_name=self.rule_name))
+
+class VisitorRule(BaseRule):
+    """
+    A rule driven by fds_dev.engine.RuleEngine. It subscribes to events by
+    overriding ``visit_header``, ``visit_link`` or ``visit_line`` and reports
+    errors through the context, so all rules share one traversal of a document.
+    ``requires`` follows from the subscribed events unless set explicitly.
+    """
+    # Event name -> the Document feature its handler reads.
+    EVENTS = {'header': 'headers', 'link': 'links', 'line': 'text'}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'requires' not in vars(cls):
+            cls.requires = frozenset(VisitorRule.EVENTS[event] for event in cls.subscriptions())
+
+    @classmethod
+    def subscriptions(cls) -> FrozenSet[str]:
+        """The events whose ``visit_*`` handler the rule overrides."""
+        return frozenset(event for event in cls.EVENTS
+                         if getattr(cls, 'visit_' + event) is not getattr(VisitorRule, 'visit_' + event))
+
+    def begin(self, ctx: RuleContext):
+        """Called before the first event of a document."""
+        pass
+
+    def visit_header(self, header: Header, ctx: RuleContext):
+        pass
+
+    def visit_link(self, link: Link, ctx: RuleContext):
+        pass
+
+    def visit_line(self, line_number: int, line: str, ctx: RuleContext):
+        pass
+
+    def end(self, ctx: RuleContext):
+        """Called after the last event of a document."""
+        pass
+
+    def apply(self, doc: Document) -> List[LintError]:
+        from fds_dev.engine import RuleEngine
+
+        return RuleEngine([self]).run(doc)
+
 # --- Example Rule Implementations ---
 
-class RequireSectionLicense(BaseRule):
+class RequireSectionLicense(VisitorRule):
     """
     Checks if a 'License' section exists in the document.
     A 'License' section is identified by a header containing the word "License".
     """
-    def apply(self, doc: Document) -> List[LintError]:
-        found_license = False
-        for header in doc.headers:
-            if "license" in header.text.lower():
-                found_license = True
-                break
+    def begin(self, ctx: RuleContext):
+        ctx.state = False
 
-        if not found_license:
-            # Report error at line 1 if the section is missing entirely.
-            return [LintError(line_number=1, message="Document is missing a 'License' section.", rule_name=self.name)]
+    def visit_header(self, header: Header, ctx: RuleContext):
+        if not ctx.state and "license" in header.text.lower():
+            ctx.state = True
 
-        return []
+    def end(self, ctx: RuleContext):
+        if not ctx.state:
+            # Report error at line 1 if the section is missing entirely.
+            ctx.report(1, "Document is missing a 'License' section.")
 
-class SectionOrder(BaseRule):
+class SectionOrder(VisitorRule):
     """
     Checks if top-level sections appear in a predefined order.
     The order is defined in the '.fdsrc.yaml' config file.
     """
-    def apply(self, doc: Document) -> List[LintError]:
-        errors: List[LintError] = []
-        expected_order: Optional[List[str]] = self.config.get('order')
-
-        if not expected_order:
-            return [] # No order defined, so nothing to check.
-
-        # Get only top-level (h1 or h2) headers from the document
-        top_level_headers = [h for h in doc.headers if h.level <= 2]
+    def __init__(self, config):
+        super().__init__(config)
+        # The configured order is compiled once, not matched name by name per header.
+        self.matcher = SectionMatcher(self.config.get('order') or [])
 
-        last_found_index = -1
+    def begin(self, ctx: RuleContext):
+        # Index in the expected order of the furthest section seen so far.
+        ctx.state = -1
 
-        for header in top_level_headers:
-            try:
-                # Find the current header's text in the expected order list
-                current_index = -1
-                for i, expected_text in enumerate(expected_order):
-                    if expected_text.lower() in header.text.lower():
-                        current_index = i
-                        break
-
-                if current_index != -1:
-                    if current_index < last_found_index:
-                        expected_section = expected_order[last_found_index]
-                        line_number = max(1, header.line_number - 1)
-                        errors.append(LintError(
-                            line_number=line_number,
-                            message=f"Section '{header.text}' appears out of order. It should not come before '{expected_section}'.",
-                            rule_name=self.name
-                        ))
-                    last_found_index = max(last_found_index, current_index)
+    def visit_header(self, header: Header, ctx: RuleContext):
+        # No order defined, so nothing to check; only top-level (h1 or h2) headers count.
+        if not self.matcher or header.level > 2:
+            return
 
-            except ValueError:
-                # This header is not in our defined order, so we ignore it.
-                pass
-
-        return errors
+        # Headers that are not in the defined order are ignored.
+        current_index = self.matcher.match(header.text)
+        if current_index != -1:
+            last_found_index = ctx.state
+            if current_index < last_found_index:
+                expected_section = self.matcher.sections[last_found_index]
+                line_number = max(1, header.line_number - 1)
+                ctx.report(line_number,
+                           f"Section '{header.text}' appears out of order. It should not come before '{expected_section}'.")
+            ctx.state = max(last_found_index, current_index)
 
 class BrokenLinkCheckRule(BaseRule):
     """
     Validates internal anchors, relative file references, and (optionally) external URLs.
+    Anchors into other Markdown files are checked against the project's heading index.
+    External URLs are deduplicated across the run and checked concurrently
+    once all files are linted; results are cached for ``cache_ttl`` seconds,
+    broken ones only for ``failure_cache_ttl`` seconds.
     """
+    version = 3
+    project_wide = True
+    requires = frozenset({'headers', 'links'})
+
     def __init__(self, config):
         super().__init__(config or {})
         self.check_external = self.config.get("check_external", False)
         self.timeout = float(self.config.get("timeout", 3.0))
-        self.allowed_statuses = set(self.config.get("allowed_statuses", [200, 201, 202, 203, 204, 205, 301, 302, 303, 307, 308]))
+        self.allowed_statuses = set(self.config.get("allowed_statuses", DEFAULT_ALLOWED_STATUSES))
+        self.cache_ttl = float(self.config.get("cache_ttl", 86400))
+        self.failure_cache_ttl = float(self.config.get("failure_cache_ttl", DEFAULT_FAILURE_TTL))
+        self.max_connections = int(self.config.get("max_connections", 16))
+        self.per_host = int(self.config.get("per_host", 4))
+        self._link_cache: Optional[LinkCache] = None
+        # Every file-link check of the run goes through one listing cache.
+        self.fs = DirectoryCache(case_sensitive=bool(self.config.get("case_sensitive", False)))
+        self._parser: Optional[MarkdownParser] = None
 
     def apply(self, doc: Document) -> List[LintError]:
         errors: List[LintError] = []
         if not doc.links:
             return errors
 
+        # The runner attaches its stats after the rule is built.
+        self.fs.run_stats = self.stats
         anchor_index = self._build_anchor_index(doc.headers)
         base_dir = Path(doc.path).parent
+        checked = {"anchor": 0, "file": 0}
 
         for link in doc.links:
+            if link.kind in checked:
+                checked[link.kind] += 1
             if link.kind == "anchor":
                 if not self._anchor_exists(link.target, anchor_index):
                     errors.append(
@@ -137,20 +277,127 @@ class BrokenLinkCheckRule(BaseRule):
                             rule_name=self.name,
                         )
                     )
-            elif link.kind == "external":
-                if self.check_external and not self._external_ok(link.target):
-                    errors.append(
+        if self.stats is not None:
+            for kind, count in checked.items():
+                self.stats.add_count(f"links.{kind}", count)
+        return errors
+
+    def collect(self, doc: Document) -> Dict[str, Any]:
+        """
+        The document's heading slugs, its [line, target] links to anchors in
+        other Markdown files and, if external checks are on, its [line, url] HTTP links.
+        """
+        anchors = []
+        urls = []
+        for link in doc.links:
+            if link.kind == "file":
+                file_target, fragment = urldefrag(link.target)
+                if fragment and file_target.lower().endswith(MARKDOWN_SUFFIXES):
+                    anchors.append([link.line_number, link.target])
+            elif link.kind == "external" and self._checks_urls and link.target.lower().startswith(("http://", "https://")):
+                urls.append([link.line_number, link.target])
+        return {"slugs": sorted(self._build_anchor_index(doc.headers)), "anchors": anchors, "urls": urls}
+
+    def needs_project_check(self, facts: Any) -> bool:
+        return bool(facts and (facts["anchors"] or facts["urls"]))
+
+    def check_project(self, facts_by_file: Dict[str, Any]) -> Dict[str, List[LintError]]:
+        errors: Dict[str, List[LintError]] = {}
+        self.fs.run_stats = self.stats
+        self._check_anchors(facts_by_file, errors)
+        if self._checks_urls:
+            self._check_urls(facts_by_file, errors)
+        return errors
+
+    def _check_anchors(self, facts_by_file: Dict[str, Any], errors: Dict[str, List[LintError]]):
+        index = HeadingIndex(loader=self._load_slugs)
+        for file_path, facts in facts_by_file.items():
+            index.add(file_path, facts["slugs"])
+
+        checked = 0
+        for file_path, facts in facts_by_file.items():
+            base_dir = os.path.dirname(file_path)
+            checked += len(facts["anchors"])
+            for line_number, target in facts["anchors"]:
+                file_target, fragment = urldefrag(target)
+                slugs = index.get(os.path.join(base_dir, file_target))
+                # A missing file is already reported by apply().
+                if slugs is not None and slugify(fragment) not in slugs:
+                    errors.setdefault(file_path, []).append(
                         LintError(
-                            line_number=link.line_number,
-                            message=f"Broken external link: '{link.target}' is unreachable.",
+                            line_number=line_number,
+                            message=f"Broken anchor link: '{target}' does not match any heading in '{file_target}'.",
+                            rule_name=self.name,
+                        )
+                    )
+        if self.stats is not None:
+            self.stats.add_count("links.cross-file", checked)
+
+    def _check_urls(self, facts_by_file: Dict[str, Any], errors: Dict[str, List[LintError]]):
+        cache = self._get_link_cache()
+        results: Dict[str, bool] = {}
+        pending = set()
+        for facts in facts_by_file.values():
+            for _, url in facts["urls"]:
+                if url in results or url in pending:
+                    continue
+                cached = cache.get(url)
+                if cached is None:
+                    pending.add(url)
+                else:
+                    results[url] = cached
+
+        if self.stats is not None:
+            # Only URLs without a fresh cached result are requested.
+            self.stats.add_count("links.external", len(pending))
+        if pending:
+            checker = LinkChecker(self.timeout, self.allowed_statuses, self.max_connections, self.per_host)
+            try:
+                for url, ok in checker.check(pending).items():
+                    cache.put(url, ok)
+                    results[url] = ok
+            finally:
+                checker.close()
+            cache.save()
+
+        for file_path, facts in facts_by_file.items():
+            for line_number, url in facts["urls"]:
+                if not results[url]:
+                    errors.setdefault(file_path, []).append(
+                        LintError(
+                            line_number=line_number,
+                            message=f"Broken external link: '{url}' is unreachable.",
                             rule_name=self.name,
                         )
                     )
-        return errors
+
+    @property
+    def _checks_urls(self) -> bool:
+        return self.check_external and not self.offline
+
+    def _get_link_cache(self) -> LinkCache:
+        if self._link_cache is None:
+            path = Path(self.cache_dir) / LINK_CACHE_FILENAME if self.cache_dir and self.cache_ttl > 0 else None
+            self._link_cache = LinkCache(path, ttl=self.cache_ttl, failure_ttl=self.failure_cache_ttl)
+        return self._link_cache
+
+    def reset(self):
+        self.fs.clear()
+
+    def _load_slugs(self, file_path: str) -> Optional[List[str]]:
+        """Reads the headings of a linked file that is not part of the run."""
+        if not self.fs.is_file(file_path):
+            return None
+        if self._parser is None:
+            self._parser = MarkdownParser()
+        try:
+            return list(self._build_anchor_index(self._parser.parse(file_path).headers))
+        except (OSError, UnicodeDecodeError):
+            return None
 
     @staticmethod
     def _build_anchor_index(headers: List[Header]) -> set:
-        slugs = {BrokenLinkCheckRule._slugify(header.text) for header in headers}
+        slugs = {slugify(header.text) for header in headers}
         return slugs
 
     @staticmethod
@@ -159,29 +406,73 @@ class BrokenLinkCheckRule(BaseRule):
         slug = BrokenLinkCheckRule._slugify(anchor)
         return slug in slug_index
 
-    @staticmethod
-    def _file_exists(base_dir: Path, target: str) -> bool:
+    def _file_exists(self, base_dir: Path, target: str) -> bool:
         file_target, _ = urldefrag(target)
         if not file_target:
             return True
-        resolved = (base_dir / file_target).resolve()
-        return resolved.exists()
-
-    def _external_ok(self, url: str) -> bool:
-        try:
-            response = requests.head(url, allow_redirects=True, timeout=self.timeout)
-            if response.status_code in self.allowed_statuses:
-                return True
-            if response.status_code >= 400:
-                response = requests.get(url, allow_redirects=True, timeout=self.timeout)
-                return response.status_code in self.allowed_statuses
-            return True
-        except requests.RequestException:
-            return False
+        return self.fs.exists(os.path.join(base_dir, file_target))
 
     @staticmethod
     def _slugify(value: str) -> str:
-        value = value.strip().lower()
-        value = re.sub(r"[^\w\- ]", "", value)
-        value = value.replace(" ", "-")
-        return value
+        return slugify(value)
+
+class NearDuplicate(BaseRule):
+    """
+    Reports documents that are nearly identical to another file of the run,
+    such as READMEs copied between packages and drifting apart. Each file is
+    reduced to a MinHash signature of its word shingles, which is kept in the
+    lint cache with the rule's facts; locality-sensitive hashing then finds
+    candidate pairs without comparing every file with every other.
+
+    Only files of the run are compared: with ``--changed-since`` or
+    ``--staged`` a changed file that copies an unchanged one is not reported.
+    Unlike cross-file anchors, which load one known target on demand, finding
+    a copy would mean reading the whole tree, which those modes exist to avoid.
+    """
+    project_wide = True
+    requires = frozenset({'text'})
+    # Files compared when picking the closest copy to name in a message.
+    _COMPARE_LIMIT = 16
+
+    def __init__(self, config):
+        super().__init__(config or {})
+        self.threshold = float(self.config.get("threshold", 0.8))
+        self.shingle_size = int(self.config.get("shingle_size", 5))
+        # Short stubs share most of their words and are not reported.
+        self.min_words = int(self.config.get("min_words", 50))
+        self.num_perm = int(self.config.get("num_perm", 64))
+        self.hasher = MinHasher(self.num_perm)
+        self.bands = choose_bands(self.num_perm, self.threshold)
+
+    def apply(self, doc: Document) -> List[LintError]:
+        return []
+
+    def collect(self, doc: Document) -> Optional[Dict[str, Any]]:
+        """The MinHash signature of the document, or None if it is too short to compare."""
+        if doc.content is None:
+            return None
+        tokens = words(doc.content)
+        if len(tokens) < self.min_words:
+            return None
+        return {"signature": self.hasher.signature(shingles(tokens, self.shingle_size))}
+
+    def needs_project_check(self, facts: Any) -> bool:
+        return bool(facts)
+
+    def check_project(self, facts_by_file: Dict[str, Any]) -> Dict[str, List[LintError]]:
+        index = LshIndex(self.num_perm, self.bands)
+        for file_path, facts in facts_by_file.items():
+            if len(facts["signature"]) == self.num_perm:
+                index.add(file_path, facts["signature"])
+
+        errors: Dict[str, List[LintError]] = {}
+        for cluster in index.clusters(self.threshold):
+            for file_path in cluster:
+                others = [other for other in cluster if other != file_path]
+                match, score = closest(file_path, others[:self._COMPARE_LIMIT], index.signatures)
+                message = (f"Document is a near-duplicate of '{os.path.relpath(match, os.path.dirname(file_path))}' "
+                           f"(estimated {score:.0%} similar)")
+                if len(others) > 1:
+                    message += f" and {len(others) - 1} other file(s)"
+                errors[file_path] = [LintError(line_number=1, message=message + ".", rule_name=self.name)]
+        return errors
@@ -1,35 +1,112 @@
 """FDS-Dev module."""
 
 import hashlib
-import yaml
-from typing import List, Dict, Any, Tuple, Optional
+import heapq
+import json
+import os
+import time
+from typing import List, Dict, Any, Callable, FrozenSet, Iterable, Iterator, Tuple, Optional
 
+from fds_dev.engine import RuleEngine
 from fds_dev.parser import Document, MarkdownParser
-from fds_dev.rules import BaseRule, LintError, RequireSectionLicense, SectionOrder, BrokenLinkCheckRule
+from fds_dev.profiling import RunStats
+from fds_dev.rules import BaseRule, LintError, RequireSectionLicense, SectionOrder, BrokenLinkCheckRule, NearDuplicate
 
 # A mapping from rule names in the config to their class implementations.
 AVAILABLE_RULES = {
     "require-section-license": RequireSectionLicense,
     "section-order": SectionOrder,
     "broken-link-check": BrokenLinkCheckRule,
+    "near-duplicate": NearDuplicate,
 }
 
+# Files at least this large are parsed through a memory map by default.
+DEFAULT_MMAP_THRESHOLD_MB = 64
+
+# Stat fields stored in each cache entry; when all of them match, the file is
+# assumed unchanged and its content is not re-hashed.
+STAT_KEYS = ('mtime_ns', 'size', 'inode')
+
+# Files modified this recently may still be written to within the same mtime
+# tick, so their stat signature is not trusted on the next run.
+_RACY_WINDOW_NS = 2_000_000_000
+
+def _hash_bytes(data: bytes) -> str:
+    """Computes the BLAKE2b hash of content that is already in memory."""
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
 def _get_file_hash(file_path: str) -> str:
-    """Computes the SHA256 hash of a file's content."""
-    h = hashlib.sha256()
+    """Computes the BLAKE2b hash of a file's content."""
+    h = hashlib.blake2b(digest_size=32)
     with open(file_path, 'rb') as f:
         while True:
-            chunk = f.read(8192)
+            chunk = f.read(65536)
             if not chunk:
                 break
             h.update(chunk)
     return h.hexdigest()
 
+def _get_file_stat(file_path: str) -> Dict[str, Optional[int]]:
+    """
+    Returns the stat signature used by the cache fast path.
+    Racily-clean files get an empty signature so they are hashed next time.
+    """
+    st = os.stat(file_path)
+    if time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS:
+        return {key: None for key in STAT_KEYS}
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'inode': st.st_ino}
+
+def _stat_matches(entry: Dict[str, Any], file_stat: Dict[str, Optional[int]]) -> bool:
+    return all(file_stat[key] is not None and entry.get(key) == file_stat[key] for key in STAT_KEYS)
+
+def _combine_fingerprints(fingerprints: Dict[str, str]) -> str:
+    payload = json.dumps(fingerprints, sort_keys=True)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+# The result of linting one file: (file_path, file_hash, file_stat, errors, facts),
+# where facts holds the collected facts of each project-wide rule by rule name.
+LintResult = Tuple[str, Optional[str], Dict[str, Optional[int]], List[LintError], Dict[str, Any]]
+
+# Compact, picklable forms used to ship results from worker processes:
+# (file_path, file_hash, (mtime_ns, size, inode), ((line_number, message, rule_name), ...), facts)
+EncodedError = Tuple[int, str, str]
+EncodedResult = Tuple[str, Optional[str], Tuple[Optional[int], ...], Tuple[EncodedError, ...], Dict[str, Any]]
+
+def encode_result(file_path: str, file_hash: Optional[str], file_stat: Dict[str, Optional[int]],
+                  errors: List[LintError], facts: Optional[Dict[str, Any]] = None) -> EncodedResult:
+    stat_values = tuple(file_stat.get(key) for key in STAT_KEYS) if file_stat else ()
+    return file_path, file_hash, stat_values, tuple((e.line_number, e.message, e.rule_name) for e in errors), facts or {}
+
+def decode_result(encoded: EncodedResult) -> LintResult:
+    file_path, file_hash, stat_values, errors, facts = encoded
+    file_stat = dict(zip(STAT_KEYS, stat_values))
+    return file_path, file_hash, file_stat, [LintError(line, message, rule) for line, message, rule in errors], facts
+
 class LintRunner:
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], verify_hashes: bool = False, cache_dir: Optional[str] = None,
+                 stats: Optional[RunStats] = None, offline: bool = False):
         self.config = config
+        self.verify_hashes = verify_hashes
+        # Stage and rule timings are only recorded when stats are attached
+        # (--profile or --metrics-file).
+        self.stats = stats
         self.rules = self._initialize_rules()
-        self.parser = MarkdownParser()
+        for rule in self.rules:
+            rule.cache_dir = cache_dir
+            rule.stats = stats
+            rule.offline = offline
+        self.project_rules = [rule for rule in self.rules if rule.project_wide]
+        self._engines: Dict[Tuple[str, ...], RuleEngine] = {}
+        # Very large files are scanned through a memory map (parser.mmap_threshold_mb).
+        threshold_mb = config.get('parser', {}).get('mmap_threshold_mb', DEFAULT_MMAP_THRESHOLD_MB)
+        self.parser = MarkdownParser(mmap_threshold=int(threshold_mb * 1024 * 1024) if threshold_mb else None)
+        # Per-rule fingerprints also cover the parser version, since every
+        # rule's output depends on the structure the parser extracts.
+        self.fingerprints = {
+            rule.name: _combine_fingerprints({'rule': rule.fingerprint, 'parser': str(self.parser.version)})
+            for rule in self.rules
+        }
+        self.ruleset_fingerprint = _combine_fingerprints(self.fingerprints)
 
     def _initialize_rules(self) -> List[BaseRule]:
         initialized_rules = []
@@ -56,32 +133,286 @@ class LintRunner:
             initialized_rules.append(rule_instance)
         return initialized_rules
 
-    def run(self, file_path: str, cache: Dict[str, Any]) -> Tuple[str, Optional[str], List[LintError]]:
+    def iter_cached(self, file_paths: Iterable[str], cache) -> Iterator[Tuple[str, Optional[List[LintError]], Optional[Dict[str, Any]], int]]:
+        """
+        Resolves cache hits using only a stat call, so unchanged files never
+        need to be sent to a worker.
+        Yields (file_path, cached_errors, cache_entry, size) for every file;
+        ``cached_errors`` is None for a miss, which keeps its entry so that
+        unchanged rules can still be reused.
+        """
+        stats = self.stats
+        for file_path in file_paths:
+            started = time.perf_counter_ns() if stats is not None else 0
+            entry = cache.get(file_path)
+            try:
+                file_stat = _get_file_stat(file_path)
+            except OSError:
+                yield file_path, None, entry, 0
+                continue
+            if (entry and not self.verify_hashes and entry.get('ruleset') == self.ruleset_fingerprint
+                    and _stat_matches(entry, file_stat)):
+                errors = self._cached_errors(entry['rules'], self.rules)
+                if stats is not None:
+                    stats.add_stage('lookup', time.perf_counter_ns() - started)
+                    stats.add_cache_result(True)
+                yield file_path, errors, entry, file_stat['size']
+            else:
+                yield file_path, None, entry, file_stat['size'] or os.path.getsize(file_path)
+
+    def run(self, file_path: str, cache: Dict[str, Any]) -> LintResult:
         """
         Runs all initialized rules against a single file, utilizing a cache.
-        Returns the file path, its content hash, and a list of errors.
+        Returns the file path, its content hash, its stat signature, a list of
+        errors and the facts collected for project-wide rules.
+
+        Files whose stat signature matches the cache entry are not re-read
+        unless the runner was created with ``verify_hashes=True``. Otherwise
+        the file is read once and the same bytes are hashed and parsed; only
+        files above the memory-map threshold are hashed and parsed separately.
         """
+        stats = self.stats
+        started = time.perf_counter_ns() if stats is not None else 0
         try:
-            file_hash = _get_file_hash(file_path)
+            file_stat = _get_file_stat(file_path)
+            entry = cache.get(file_path)
+            if stats is not None:
+                stats.add_stage('stat', time.perf_counter_ns() - started)
 
-            # Check cache
-            if file_path in cache and cache[file_path].get('hash') == file_hash:
-                # Return cached errors, converting them back to LintError objects
-                cached_errors_data = cache[file_path].get('errors', [])
-                cached_errors = [LintError(**data) for data in cached_errors_data]
-                return file_path, file_hash, cached_errors
+            if entry and not self.verify_hashes and _stat_matches(entry, file_stat):
+                file_hash = entry.get('hash')
+            else:
+                stage_started = time.perf_counter_ns() if stats is not None else 0
+                with open(file_path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    data = None if self.parser.maps(size) else f.read()
+                if stats is not None:
+                    stats.add_count('read_bytes', size if data is None else len(data))
+                if data is not None:
+                    if stats is not None:
+                        stats.add_stage('read', time.perf_counter_ns() - stage_started)
+                    result = self._run_bytes(file_path, data, cache, file_stat)
+                    if stats is not None:
+                        stats.add_file(file_path, time.perf_counter_ns() - started)
+                    return result
+                file_hash = _get_file_hash(file_path)
+                if stats is not None:
+                    stats.add_stage('hash', time.perf_counter_ns() - stage_started)
 
-            # If not in cache or hash mismatch, run linting
-            all_errors: List[LintError] = []
-            document = self.parser.parse(file_path)
+            errors, facts = self._lint(file_hash, entry, lambda features: self.parser.parse(file_path, features))
+            if stats is not None:
+                stats.add_file(file_path, time.perf_counter_ns() - started)
+            return file_path, file_hash, file_stat, errors, facts
 
-            for rule in self.rules:
-                errors = rule.apply(document)
-                all_errors.extend(errors)
+        except FileNotFoundError:
+            return file_path, None, {}, [LintError(line_number=0, message=f"File not found: {file_path}", rule_name="runner")], {}
+        except Exception as e:
+            return file_path, None, {}, [LintError(line_number=0, message=f"An unexpected error occurred: {e}", rule_name="runner")], {}
 
-            return file_path, file_hash, all_errors
+    def run_content(self, file_path: str, content: bytes, cache: Dict[str, Any],
+                    file_stat: Optional[Dict[str, Optional[int]]] = None) -> LintResult:
+        """
+        Lints in-memory content (such as a staged git blob) as if it were the
+        file at ``file_path``. Results are cached by content hash; the stat
+        signature is left empty unless the bytes were just read from disk.
+        """
+        stats = self.stats
+        started = time.perf_counter_ns() if stats is not None else 0
+        if stats is not None:
+            stats.add_count('read_bytes', len(content))
+        result = self._run_bytes(file_path, content, cache, file_stat)
+        if stats is not None:
+            stats.add_file(file_path, time.perf_counter_ns() - started)
+        return result
 
-        except FileNotFoundError:
-            return file_path, None, [LintError(line_number=0, message=f"File not found: {file_path}", rule_name="runner")]
+    def _run_bytes(self, file_path: str, content: bytes, cache: Dict[str, Any],
+                   file_stat: Optional[Dict[str, Optional[int]]]) -> LintResult:
+        try:
+            stats = self.stats
+            started = time.perf_counter_ns() if stats is not None else 0
+            file_hash = _hash_bytes(content)
+            if stats is not None:
+                stats.add_stage('hash', time.perf_counter_ns() - started)
+            errors, facts = self._lint(file_hash, cache.get(file_path),
+                                       lambda features: self.parser.parse_bytes(file_path, content, features))
+            return file_path, file_hash, file_stat or {}, errors, facts
         except Exception as e:
-            return file_path, None, [LintError(line_number=0, message=f"An unexpected error occurred: {e}", rule_name="runner")]
+            return file_path, None, {}, [LintError(line_number=0, message=f"An unexpected error occurred: {e}", rule_name="runner")], {}
+
+    def lint_text(self, content: str, file_path: str = '<text>') -> List[LintError]:
+        """
+        Lints Markdown held in memory without touching the cache. ``file_path``
+        is only used to resolve relative links; project-wide rules see the
+        document as the only file of the project.
+        """
+        document = self.parser.parse_text(file_path, content, self.required_features(self.rules))
+        errors = self.apply_rules(document)
+        facts = self.collect_facts(document)
+        if self.needs_project_check(facts):
+            errors.extend(self.check_project({file_path: facts}).get(file_path, []))
+        return errors
+
+    def _lint(self, file_hash: str, entry: Optional[Dict[str, Any]],
+              parse: Callable[[FrozenSet[str]], Document]) -> Tuple[List[LintError], Dict[str, Any]]:
+        stats = self.stats
+        cached_rules = {}
+        if entry and entry.get('hash') == file_hash:
+            if entry.get('ruleset') == self.ruleset_fingerprint:
+                if stats is not None:
+                    stats.add_cache_result(True)
+                return self._cached_errors(entry['rules'], self.rules), self.cached_facts(entry)
+            cached_rules = entry.get('rules', {})
+        if stats is not None:
+            stats.add_cache_result(False)
+
+        # Reuse results of rules whose fingerprint is unchanged and only
+        # parse the document if at least one rule has to run again.
+        reusable = [rule for rule in self.rules
+                    if cached_rules.get(rule.name, {}).get('fingerprint') == self.fingerprints[rule.name]]
+        all_errors = self._cached_errors(cached_rules, reusable)
+        facts = {rule.name: cached_rules[rule.name].get('facts') for rule in reusable if rule.project_wide}
+        stale = [rule for rule in self.rules if rule not in reusable]
+
+        if stale:
+            # Only what the stale rules declare is extracted up front. The
+            # clock reads cost far less than parsing, so they are not guarded.
+            started = time.perf_counter_ns()
+            document = parse(self.required_features(stale))
+            parsed = time.perf_counter_ns()
+            all_errors.extend(self.apply_rules(document, stale))
+            applied = time.perf_counter_ns()
+            facts.update(self.collect_facts(document, stale))
+            if stats is not None:
+                stats.add_stage('parse', parsed - started)
+                stats.add_stage('rules', applied - parsed)
+                stats.add_stage('collect', time.perf_counter_ns() - applied)
+
+        return all_errors, facts
+
+    def apply_rules(self, document: Document, rules: Optional[List[BaseRule]] = None) -> List[LintError]:
+        """Applies the given rules (all enabled rules by default) to a parsed document in one traversal."""
+        return self._engine(self.rules if rules is None else rules).run(document, self.stats)
+
+    def _engine(self, rules: List[BaseRule]) -> RuleEngine:
+        # One engine per distinct rule subset, e.g. the rules left to re-run
+        # after a configuration change.
+        key = tuple(rule.name for rule in rules)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = RuleEngine(rules)
+        return engine
+
+    @staticmethod
+    def required_features(rules: List[BaseRule]) -> FrozenSet[str]:
+        """The Document features the given rules declare in ``requires``."""
+        return frozenset().union(*(rule.requires for rule in rules))
+
+    def reset(self):
+        """Clears per-run rule state so a resident runner sees files that changed since."""
+        for rule in self.rules:
+            rule.reset()
+
+    def collect_facts(self, document: Document, rules: Optional[List[BaseRule]] = None) -> Dict[str, Any]:
+        """Collects the facts of the given project-wide rules (all by default) for a parsed document."""
+        rules = [rule for rule in (self.project_rules if rules is None else rules) if rule.project_wide]
+        if self.stats is None:
+            return {rule.name: rule.collect(document) for rule in rules}
+        facts = {}
+        for rule in rules:
+            started = time.perf_counter_ns()
+            facts[rule.name] = rule.collect(document)
+            self.stats.add_rule(f"{rule.name} [collect]", time.perf_counter_ns() - started)
+        return facts
+
+    def cached_facts(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """The facts of project-wide rules stored in a cache entry."""
+        return {rule.name: entry['rules'][rule.name].get('facts') for rule in self.project_rules}
+
+    def needs_project_check(self, facts: Dict[str, Any]) -> bool:
+        """Whether the project phase may report more errors for a file with these facts."""
+        return any(rule.needs_project_check(facts.get(rule.name)) for rule in self.project_rules)
+
+    def check_project(self, facts_by_file: Dict[str, Dict[str, Any]]) -> Dict[str, List[LintError]]:
+        """
+        Runs the project-wide phase of every rule over the facts collected for
+        the files of a run and returns the errors by file path.
+        """
+        errors: Dict[str, List[LintError]] = {}
+        for rule in self.project_rules:
+            started = time.perf_counter_ns()
+            rule_facts = {file_path: facts[rule.name] for file_path, facts in facts_by_file.items()
+                          if facts.get(rule.name) is not None}
+            for file_path, rule_errors in rule.check_project(rule_facts).items():
+                errors.setdefault(file_path, []).extend(rule_errors)
+            if self.stats is not None:
+                self.stats.add_project(rule.name, time.perf_counter_ns() - started)
+        return errors
+
+    @staticmethod
+    def _cached_errors(cached_rules: Dict[str, Any], rules: List[BaseRule]) -> List[LintError]:
+        errors: List[LintError] = []
+        for rule in rules:
+            for line_number, message in cached_rules[rule.name]['errors']:
+                errors.append(LintError(line_number=line_number, message=message, rule_name=rule.name))
+        return errors
+
+    def cache_entry(self, file_hash: str, file_stat: Dict[str, Optional[int]], errors: List[LintError],
+                    facts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Builds the cache entry for a linted file, storing errors (and facts of
+        project-wide rules) per rule together with the fingerprint of the rule
+        that produced them.
+        """
+        rules = {rule.name: {'fingerprint': self.fingerprints[rule.name], 'errors': []} for rule in self.rules}
+        for name, rule_facts in (facts or {}).items():
+            if name in rules:
+                rules[name]['facts'] = rule_facts
+        for error in errors:
+            if error.rule_name in rules:
+                rules[error.rule_name]['errors'].append([error.line_number, error.message])
+        return {
+            'hash': file_hash,
+            **file_stat,
+            'ruleset': self.ruleset_fingerprint,
+            'rules': rules,
+        }
+
+def balance_chunks(tasks: List[Tuple[str, Optional[Dict[str, Any]], int]], chunk_count: int) -> List[List[Tuple[str, Optional[Dict[str, Any]]]]]:
+    """
+    Distributes (file_path, cache_entry, size) tasks over at most ``chunk_count``
+    chunks so that every chunk holds roughly the same number of bytes
+    (largest files first, each assigned to the lightest chunk).
+    """
+    chunk_count = max(1, min(chunk_count, len(tasks)))
+    chunks: List[List[Tuple[str, Optional[Dict[str, Any]]]]] = [[] for _ in range(chunk_count)]
+    heap = [(0, index) for index in range(chunk_count)]
+    for file_path, entry, size in sorted(tasks, key=lambda task: task[2], reverse=True):
+        total, index = heapq.heappop(heap)
+        chunks[index].append((file_path, entry))
+        heapq.heappush(heap, (total + size, index))
+    return [chunk for chunk in chunks if chunk]
+
+# Runner owned by each worker process, built once by the pool initializer.
+_worker_runner: Optional[LintRunner] = None
+
+def init_worker(config: Dict[str, Any], verify_hashes: bool = False, profile: bool = False):
+    """Process pool initializer: builds the worker's LintRunner once."""
+    global _worker_runner
+    _worker_runner = LintRunner(config, verify_hashes=verify_hashes, stats=RunStats() if profile else None)
+
+def lint_chunk(tasks: List[Tuple[str, Optional[Dict[str, Any]]]]) -> Tuple[List[EncodedResult], Optional[Dict[str, Any]]]:
+    """
+    Lints a chunk of (file_path, cache_entry) tasks inside a worker process.
+    Returns the encoded results and, when profiling, the worker's exported
+    stats for the chunk.
+    """
+    results = []
+    for file_path, entry in tasks:
+        cache = {file_path: entry} if entry else {}
+        results.append(encode_result(*_worker_runner.run(file_path, cache)))
+    stats = _worker_runner.stats
+    if stats is None:
+        return results, None
+    exported = stats.export()
+    stats.reset()
+    return results, exported
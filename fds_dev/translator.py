@@ -1,10 +1,13 @@
 """FDS-Dev module."""
 
-import requests
+import time
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List
 
 class BaseTranslator(ABC):
+    # Provider name used in metrics.
+    name = 'base'
+
     @abstractmethod
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         pass
@@ -14,6 +17,8 @@ class EchoTranslator(BaseTranslator):
     A simple translator for testing purposes. It returns the original text,
     prefixed with the language codes.
     """
+    name = 'echo'
+
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         return f"[{source_lang} -> {target_lang}] {text}"
 
@@ -22,6 +27,8 @@ class DeepLTranslator(BaseTranslator):
     A translator using the DeepL API.
     Requires an API key to be set in the config.
     """
+    name = 'deepl'
+
     def __init__(self, api_key: str, is_free_api: bool = True, timeout: float = 5.0):
         self.api_key = api_key
         self.api_url = "https://api-free.deepl.com/v2/translate" if is_free_api else "https://api.deepl.com/v2/translate"
@@ -31,6 +38,9 @@ class DeepLTranslator(BaseTranslator):
         if not self.api_key:
             raise ValueError("DeepL API key is not provided.")
 
+        # Network libraries are only needed once a request is actually made.
+        import requests
+
         payload = {
             "auth_key": self.api_key,
             "text": text,
@@ -59,6 +69,9 @@ class TranslationEngine:
         self.config = config.get('translator', {})
         self.provider_name = self.config.get('provider', 'echo')
         self.translator = self._get_translator()
+        # Characters sent to the provider and the latency of each call, for --metrics-file.
+        self.characters_sent = 0
+        self.latencies: List[float] = []
 
     def _get_translator(self) -> BaseTranslator:
         if self.provider_name == 'deepl':
@@ -74,7 +87,12 @@ class TranslationEngine:
         return EchoTranslator()
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
-        return self.translator.translate(text, source_lang, target_lang)
+        started = time.perf_counter()
+        try:
+            return self.translator.translate(text, source_lang, target_lang)
+        finally:
+            self.characters_sent += len(text)
+            self.latencies.append(time.perf_counter() - started)
 
 if __name__ == '__main__':
     # Example usage:
@@ -0,0 +1,101 @@
+"""FDS-Dev module."""
+
+import os
+import subprocess
+from typing import Dict, Iterable, List, Optional
+
+from fds_dev.discovery import MARKDOWN_SUFFIXES, is_excluded, parse_ignore_patterns
+
+class GitError(RuntimeError):
+    """Raised when a git command fails or the target is not inside a work tree."""
+
+def _git(args: List[str], cwd: str, input_data: Optional[bytes] = None) -> bytes:
+    try:
+        completed = subprocess.run(
+            ['git', *args], cwd=cwd, input=input_data,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+        )
+    except FileNotFoundError as e:
+        raise GitError("git executable not found.") from e
+    if completed.returncode != 0:
+        message = completed.stderr.decode('utf-8', errors='replace').strip()
+        raise GitError(f"git {' '.join(args)} failed: {message}")
+    return completed.stdout
+
+def _target_dir(target: str) -> str:
+    absolute = os.path.abspath(target)
+    return absolute if os.path.isdir(absolute) else os.path.dirname(absolute)
+
+def git_root(target: str) -> str:
+    """Returns the top-level directory of the work tree containing ``target``."""
+    return _git(['rev-parse', '--show-toplevel'], cwd=_target_dir(target)).decode('utf-8').strip()
+
+def _select(target: str, root: str, names: Iterable[str], exclude: Optional[Iterable[str]]) -> List[str]:
+    """
+    Maps repository-relative paths to lint paths under ``target``, spelled the
+    same way directory discovery spells them so cache keys stay stable.
+    """
+    target_abs = os.path.abspath(target)
+    target_is_dir = os.path.isdir(target_abs)
+    patterns = parse_ignore_patterns(exclude or [])
+    selected = []
+    for name in names:
+        absolute = os.path.normpath(os.path.join(root, name))
+        if not target_is_dir:
+            if absolute == target_abs:
+                selected.append(target)
+            continue
+        relative = os.path.relpath(absolute, target_abs)
+        if relative.startswith(os.pardir):
+            continue
+        if not relative.lower().endswith(MARKDOWN_SUFFIXES):
+            continue
+        posix_relative = relative.replace(os.sep, '/')
+        if any(part.startswith('.') for part in posix_relative.split('/')):
+            continue
+        if is_excluded(patterns, posix_relative):
+            continue
+        selected.append(os.path.join(target, relative))
+    return selected
+
+def _split_z(output: bytes) -> List[str]:
+    return [name for name in output.decode('utf-8', errors='surrogateescape').split('\0') if name]
+
+def changed_files(target: str, ref: str, exclude: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Markdown files under ``target`` that were added, copied, modified or
+    renamed between ``ref`` and the working tree.
+    """
+    root = git_root(target)
+    output = _git(['diff', '--name-only', '-z', '--diff-filter=ACMR', ref, '--'], cwd=root)
+    return _select(target, root, _split_z(output), exclude)
+
+def staged_files(target: str, exclude: Optional[Iterable[str]] = None) -> Dict[str, bytes]:
+    """
+    Markdown files under ``target`` with staged changes, mapped to the blob
+    contents recorded in the index (not the working tree).
+    """
+    root = git_root(target)
+    names = _split_z(_git(['diff', '--cached', '--name-only', '-z', '--diff-filter=ACMR', '--'], cwd=root))
+    selected = _select(target, root, names, exclude)
+    if not selected:
+        return {}
+
+    # Resolve repository-relative names for the selected paths and read all
+    # blobs through a single 'git cat-file --batch' process.
+    specs = [os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/') for path in selected]
+    request = ''.join(f":{spec}\n" for spec in specs).encode('utf-8')
+    output = _git(['cat-file', '--batch'], cwd=root, input_data=request)
+
+    blobs: Dict[str, bytes] = {}
+    cursor = 0
+    for path in selected:
+        header_end = output.index(b'\n', cursor)
+        header = output[cursor:header_end].split()
+        cursor = header_end + 1
+        if len(header) < 3 or header[-1] == b'missing':
+            continue
+        size = int(header[2])
+        blobs[path] = output[cursor:cursor + size]
+        cursor += size + 1
+    return blobs
@@ -0,0 +1,50 @@
+"""FDS-Dev module."""
+
+import os
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fds_dev.discovery import discover_files
+
+Signature = Tuple[int, int, int]
+
+class PollingWatcher:
+    """
+    Detects added, modified and removed Markdown files under a path by
+    comparing stat snapshots taken with the same walk ``fds lint`` uses.
+    Only the standard library is needed, so it works on every platform.
+    """
+    def __init__(self, path: str, exclude: Optional[Iterable[str]] = None, interval: float = 0.5):
+        self.path = path
+        self.exclude = list(exclude or [])
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Signature]:
+        snapshot: Dict[str, Signature] = {}
+        for file_path in discover_files(self.path, exclude=self.exclude):
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return snapshot
+
+    def poll(self) -> Tuple[List[str], List[str]]:
+        """
+        Returns the (changed, removed) files since the previous poll.
+        New files count as changed.
+        """
+        current = self._scan()
+        changed = [file_path for file_path, signature in current.items() if self.snapshot.get(file_path) != signature]
+        removed = [file_path for file_path in self.snapshot if file_path not in current]
+        self.snapshot = current
+        return changed, removed
+
+    def changes(self, should_stop: Callable[[], bool] = lambda: False) -> Iterator[Tuple[List[str], List[str]]]:
+        """Polls every ``interval`` seconds and yields each non-empty change set."""
+        while not should_stop():
+            time.sleep(self.interval)
+            changed, removed = self.poll()
+            if changed or removed:
+                yield changed, removed
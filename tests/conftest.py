@@ -0,0 +1,15 @@
+import inspect
+
+import pytest
+from click.testing import CliRunner
+
+
+@pytest.fixture
+def cli_runner():
+    """
+    A CliRunner that captures stderr apart from stdout. Click 8.2 always
+    does; older releases (the ones available on Python 3.9) need mix_stderr=False.
+    """
+    if "mix_stderr" in inspect.signature(CliRunner.__init__).parameters:
+        return CliRunner(mix_stderr=False)
+    return CliRunner()
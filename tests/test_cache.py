@@ -0,0 +1,94 @@
+import json
+import sqlite3
+
+import pytest
+
+from fds_dev.cache import (
+    JsonCacheBackend,
+    SqliteCacheBackend,
+    open_cache,
+    resolve_cache_path,
+)
+
+
+ENTRY = {"hash": "abc", "mtime_ns": 1, "size": 2, "inode": 3, "ruleset": "r", "rules": {}}
+
+
+def test_resolve_cache_path_for_directory_and_file(tmp_path):
+    doc = tmp_path / "README.md"
+    doc.write_text("# Title\n", encoding="utf-8")
+
+    assert resolve_cache_path(str(tmp_path)) == tmp_path / ".fds_cache.json"
+    assert resolve_cache_path(str(doc), "sqlite") == tmp_path / ".fds_cache.sqlite"
+
+
+def test_open_cache_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cache backend"):
+        open_cache(str(tmp_path), "redis")
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_entries_round_trip(tmp_path, backend):
+    with open_cache(str(tmp_path), backend) as cache:
+        assert cache.get("a.md") is None
+        cache["a.md"] = ENTRY
+        assert cache.get("a.md") == ENTRY
+
+    with open_cache(str(tmp_path), backend) as cache:
+        assert cache["a.md"] == ENTRY
+        assert "b.md" not in cache
+
+
+def test_json_backend_ignores_corrupt_file(tmp_path):
+    path = tmp_path / ".fds_cache.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    cache = JsonCacheBackend(path)
+    assert cache.get("a.md") is None
+
+
+def test_json_backend_only_writes_when_changed(tmp_path):
+    path = tmp_path / ".fds_cache.json"
+    JsonCacheBackend(path).close()
+    assert not path.exists()
+
+    cache = JsonCacheBackend(path)
+    cache.put("a.md", ENTRY)
+    cache.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a.md": ENTRY}
+
+
+def test_sqlite_backend_commits_in_batches(tmp_path):
+    path = tmp_path / ".fds_cache.sqlite"
+    cache = SqliteCacheBackend(path, batch_size=2)
+
+    def stored_rows():
+        with sqlite3.connect(str(path)) as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    cache.put("a.md", ENTRY)
+    assert stored_rows() == 0
+    cache.put("b.md", ENTRY)
+    assert stored_rows() == 2
+    cache.put("c.md", ENTRY)
+    cache.close()
+    assert stored_rows() == 3
+
+
+def test_sqlite_backend_uses_wal_mode(tmp_path):
+    cache = SqliteCacheBackend(tmp_path / ".fds_cache.sqlite")
+    mode = cache._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    cache.close()
+    assert mode == "wal"
+
+
+def test_sqlite_backend_resets_outdated_schema(tmp_path):
+    path = tmp_path / ".fds_cache.sqlite"
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("CREATE TABLE entries (path TEXT, legacy TEXT)")
+        conn.execute("INSERT INTO entries VALUES ('a.md', 'x')")
+
+    with SqliteCacheBackend(path) as cache:
+        assert cache.get("a.md") is None
+        cache.put("a.md", ENTRY)
+        assert cache.get("a.md") == ENTRY
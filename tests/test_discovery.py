@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from fds_dev import discovery
+from fds_dev.discovery import discover_files, parse_ignore_patterns
+
+
+@pytest.fixture
+def docs_tree(tmp_path):
+    """A small docs tree with vendored, hidden and build directories."""
+    files = [
+        "README.md",
+        "guide.markdown",
+        "notes.txt",
+        "docs/intro.md",
+        "docs/drafts/wip.md",
+        "docs/api/generated.md",
+        "docs/api/keep.md",
+        "node_modules/pkg/README.md",
+        "build/out.md",
+        ".git/HEAD.md",
+    ]
+    for name in files:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# Title\n", encoding="utf-8")
+    return tmp_path
+
+
+def _relative(root, paths):
+    return sorted(os.path.relpath(p, root).replace(os.sep, "/") for p in paths)
+
+
+def test_finds_markdown_files_and_skips_hidden_entries(docs_tree):
+    found = _relative(docs_tree, discover_files(str(docs_tree)))
+
+    assert "README.md" in found
+    assert "guide.markdown" in found
+    assert "notes.txt" not in found
+    assert ".git/HEAD.md" not in found
+
+
+def test_honors_gitignore_and_prunes_directories(monkeypatch, docs_tree):
+    (docs_tree / ".gitignore").write_text("node_modules/\n/build\n# comment\n", encoding="utf-8")
+    (docs_tree / "docs" / ".gitignore").write_text("api/*.md\n!keep.md\n", encoding="utf-8")
+    listed = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.path.relpath(path, docs_tree))
+        return real_scandir(path)
+
+    monkeypatch.setattr(discovery.os, "scandir", recording_scandir)
+    found = _relative(docs_tree, discover_files(str(docs_tree)))
+
+    assert found == ["README.md", "docs/api/keep.md", "docs/drafts/wip.md", "docs/intro.md", "guide.markdown"]
+    assert not any(path.startswith(("node_modules", "build")) for path in listed)
+
+
+def test_exclude_globs_are_relative_to_the_root(docs_tree):
+    found = _relative(docs_tree, discover_files(str(docs_tree), exclude=["**/drafts/**", "node_modules", "build/"]))
+
+    assert "docs/drafts/wip.md" not in found
+    assert "docs/intro.md" in found
+    assert not any(path.startswith(("node_modules", "build")) for path in found)
+
+
+def test_file_target_is_yielded_as_is(docs_tree):
+    target = str(docs_tree / "notes.txt")
+    assert list(discover_files(target)) == [target]
+
+
+def test_discovery_is_lazy(docs_tree):
+    walker = discover_files(str(docs_tree))
+    first = next(walker)
+    assert first.endswith(".md") or first.endswith(".markdown")
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.md", "a/b/c.md", False, True),
+        ("/top.md", "top.md", False, True),
+        ("/top.md", "sub/top.md", False, False),
+        ("docs/*.md", "docs/a.md", False, True),
+        ("docs/*.md", "docs/sub/a.md", False, False),
+        ("**/tmp", "a/b/tmp", True, True),
+        ("out/", "out", False, False),
+        ("out/", "out", True, True),
+        ("file[0-9].md", "file7.md", False, True),
+        ("a/**/z.md", "a/z.md", False, True),
+        ("a/**/z.md", "a/b/c/z.md", False, True),
+    ],
+)
+def test_ignore_pattern_semantics(pattern, path, is_dir, expected):
+    patterns = parse_ignore_patterns([pattern])
+    assert discovery._is_ignored(patterns, path, is_dir) is expected
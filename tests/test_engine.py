@@ -0,0 +1,73 @@
+from fds_dev.engine import RuleEngine
+from fds_dev.parser import MarkdownParser
+from fds_dev.rules import BaseRule, LintError, RequireSectionLicense, SectionOrder, VisitorRule
+
+CONTENT = "# Title [a](#title)\nText with [b](other.md).\n## License\n"
+
+
+class LineRule(VisitorRule):
+    def begin(self, ctx):
+        ctx.state = []
+
+    def visit_line(self, line_number, line, ctx):
+        ctx.state.append(line)
+
+    def visit_header(self, header, ctx):
+        ctx.state.append(f"header {header.text}")
+
+    def end(self, ctx):
+        ctx.report(1, " | ".join(ctx.state))
+
+
+class LegacyRule(BaseRule):
+    def apply(self, doc):
+        return [LintError(line_number=link.line_number, message=link.target, rule_name=self.name) for link in doc.links]
+
+
+def test_subscriptions_follow_overridden_handlers():
+    assert SectionOrder.subscriptions() == {"header"}
+    assert SectionOrder.requires == {"headers"}
+    assert LineRule.subscriptions() == {"line", "header"}
+    assert LineRule.requires == {"text", "headers"}
+
+
+def test_events_arrive_in_document_order():
+    events = []
+
+    class Ordered(VisitorRule):
+        def visit_header(self, header, ctx):
+            events.append(("header", header.line_number))
+
+        def visit_link(self, link, ctx):
+            events.append(("link", link.line_number))
+
+    RuleEngine([Ordered({})]).run(MarkdownParser().parse_text("doc.md", CONTENT))
+
+    assert events == [("header", 1), ("link", 1), ("link", 2), ("header", 3)]
+
+
+def test_line_events_interleave_with_structure():
+    errors = RuleEngine([LineRule({})]).run(MarkdownParser().parse_text("doc.md", CONTENT))
+
+    assert errors[0].message == (
+        "# Title [a](#title) | header Title [a](#title) | Text with [b](other.md). | ## License | header License")
+
+
+def test_apply_rules_are_adapted_and_errors_keep_rule_order():
+    doc = MarkdownParser().parse_text("doc.md", "# Title\n[b](other.md)\n")
+    engine = RuleEngine([LegacyRule({}), RequireSectionLicense({})])
+
+    errors = engine.run(doc)
+
+    assert [(e.rule_name, e.message) for e in errors] == [
+        ("legacy-rule", "other.md"), ("require-section-license", "Document is missing a 'License' section.")]
+    assert engine.run(doc) == errors
+
+
+def test_unsubscribed_features_are_not_extracted():
+    doc = MarkdownParser().parse_text("doc.md", CONTENT, features=())
+
+    RuleEngine([RequireSectionLicense({})]).run(doc)
+
+    assert doc._headers is not None
+    assert doc._links is None
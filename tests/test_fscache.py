@@ -0,0 +1,77 @@
+import os
+
+from fds_dev.fscache import DirectoryCache
+from fds_dev.rules import BrokenLinkCheckRule
+from fds_dev.parser import MarkdownParser
+from fds_dev.profiling import RunStats
+
+
+def _tree(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "Guide.md").write_text("# Guide\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_each_directory_is_listed_once(tmp_path, monkeypatch):
+    root = _tree(tmp_path)
+    cache = DirectoryCache()
+    monkeypatch.setattr(os.path, "exists", lambda _path: False)
+
+    for _ in range(3):
+        assert cache.exists(str(root / "docs" / "Guide.md"))
+        assert cache.exists(str(root / "docs" / "sub" / ".." / "Guide.md"))
+        assert not cache.exists(str(root / "docs" / "missing.md"))
+
+    assert cache.scans == 1
+    assert cache.stats() == {"hits": 7, "misses": 2, "scans": 1}
+
+
+def test_missing_parent_directory(tmp_path):
+    cache = DirectoryCache()
+    assert not cache.exists(str(tmp_path / "nope" / "a.md"))
+    assert cache.is_file(str(_tree(tmp_path) / "docs" / "Guide.md"))
+    assert not cache.is_file(str(tmp_path / "docs"))
+
+
+def test_case_sensitive_mode_requires_exact_names(tmp_path):
+    root = _tree(tmp_path)
+    strict = DirectoryCache(case_sensitive=True)
+
+    assert strict.exists(str(root / "docs" / "Guide.md"))
+    assert not strict.exists(str(root / "docs" / "guide.md"))
+    assert not strict.exists(str(root / "Docs" / "Guide.md"))
+
+
+def test_clear_picks_up_new_files(tmp_path):
+    cache = DirectoryCache()
+    target = tmp_path / "new.md"
+    assert not cache.exists(str(target))
+    target.write_text("", encoding="utf-8")
+    assert not cache.exists(str(target))
+    cache.clear()
+    assert cache.exists(str(target))
+
+
+def test_link_rule_checks_files_through_the_cache(tmp_path):
+    root = _tree(tmp_path)
+    doc_path = root / "README.md"
+    doc_path.write_text("[a](docs/Guide.md) [b](docs/Guide.md#guide) [c](docs/guide.md)\n", encoding="utf-8")
+    rule = BrokenLinkCheckRule({"case_sensitive": True})
+
+    errors = rule.apply(MarkdownParser().parse(str(doc_path)))
+
+    assert [e.message for e in errors] == ["Broken file link: 'docs/guide.md' does not exist."]
+    assert rule.fs.hits > 0
+
+
+def test_link_rule_records_cache_hits_and_misses_into_attached_stats(tmp_path):
+    root = _tree(tmp_path)
+    doc_path = root / "README.md"
+    doc_path.write_text("[a](docs/Guide.md) [b](docs/Guide.md) [c](missing.md)\n", encoding="utf-8")
+    rule = BrokenLinkCheckRule({})
+    rule.stats = RunStats()
+
+    rule.apply(MarkdownParser().parse(str(doc_path)))
+
+    assert rule.stats.counts == {"links.anchor": 0, "links.file": 3, "dircache.hits": 1, "dircache.misses": 2}
+    assert "dircache.hits: 1" in rule.stats.report()
@@ -0,0 +1,30 @@
+from fds_dev.index import HeadingIndex, slugify
+
+
+def test_slugify_matches_heading_anchors():
+    assert slugify("  Getting Started!  ") == "getting-started"
+    assert slugify("API v2.0") == "api-v20"
+
+
+def test_index_normalizes_path_spellings(tmp_path):
+    index = HeadingIndex()
+    index.add(str(tmp_path / "docs" / "guide.md"), ["install"])
+
+    assert index.get(str(tmp_path / "docs" / ".." / "docs" / "guide.md")) == frozenset({"install"})
+    assert len(index) == 1
+
+
+def test_index_loads_unknown_files_once():
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return None if path.endswith("missing.md") else ["intro"]
+
+    index = HeadingIndex(loader=loader)
+
+    assert index.get("other.md") == frozenset({"intro"})
+    assert index.get("other.md") == frozenset({"intro"})
+    assert "missing.md" not in index
+    assert "missing.md" not in index
+    assert calls == ["other.md", "missing.md"]
@@ -0,0 +1,165 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fds_dev import linkcheck
+from fds_dev.linkcheck import LINK_CACHE_FILENAME, LinkCache, LinkChecker
+from fds_dev.parser import MarkdownParser
+from fds_dev.rules import BrokenLinkCheckRule
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, with_body):
+        self.server.requests.append((self.command, self.path))
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        time.sleep(0.02)
+        with self.server.lock:
+            self.server.active -= 1
+        path = self.path.split("?")[0]
+        if path == "/no-head" and self.command == "HEAD":
+            status = 405
+        elif path in ("/ok", "/no-head"):
+            status = 200
+        else:
+            status = 404
+        body = b"hello" if with_body else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(b"hello")))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.lock = threading.Lock()
+    httpd.active = httpd.peak = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_checker_reports_status_and_retries_rejected_head(server):
+    checker = LinkChecker(timeout=2)
+    urls = [_url(server, "/ok"), _url(server, "/missing"), _url(server, "/no-head")]
+
+    results = checker.check(urls + urls)
+
+    assert results == {urls[0]: True, urls[1]: False, urls[2]: True}
+    assert ("GET", "/no-head") in server.requests
+    assert sum(1 for request in server.requests if request == ("HEAD", "/ok")) == 1
+
+
+def test_checker_limits_requests_per_host(server):
+    urls = [_url(server, f"/ok?page={index}") for index in range(8)]
+
+    LinkChecker(timeout=2, max_workers=8, per_host=2).check(urls)
+
+    assert len(server.requests) == 8
+    assert server.peak <= 2
+
+
+def test_checker_treats_connection_errors_as_broken():
+    assert LinkChecker(timeout=0.5).check(["http://127.0.0.1:9/unreachable"]) == {"http://127.0.0.1:9/unreachable": False}
+
+
+def test_link_cache_expires_and_persists(tmp_path, monkeypatch):
+    path = tmp_path / LINK_CACHE_FILENAME
+    now = [1000.0]
+    monkeypatch.setattr(linkcheck.time, "time", lambda: now[0])
+
+    cache = LinkCache(path, ttl=60)
+    cache.put("https://a.example", True)
+    cache.save()
+
+    assert LinkCache(path, ttl=60).get("https://a.example") is True
+    now[0] += 61
+    assert LinkCache(path, ttl=60).get("https://a.example") is None
+
+
+def test_rule_checks_each_url_once_and_caches_across_runs(tmp_path, server):
+    ok, missing = _url(server, "/ok"), _url(server, "/missing")
+    facts_by_file = {}
+    for name in ("a.md", "b.md"):
+        path = tmp_path / name
+        path.write_text(f"[ok]({ok})\n[gone]({missing})\n", encoding="utf-8")
+        rule = BrokenLinkCheckRule({"check_external": True})
+        facts_by_file[str(path)] = rule.collect(MarkdownParser().parse(str(path)))
+
+    def run():
+        rule = BrokenLinkCheckRule({"check_external": True})
+        rule.cache_dir = str(tmp_path)
+        return rule.check_project(facts_by_file)
+
+    errors = run()
+    assert sorted(errors) == sorted(facts_by_file)
+    assert all(e.message == f"Broken external link: '{missing}' is unreachable." for e in errors[str(tmp_path / "a.md")])
+    requests_after_first_run = len(server.requests)
+    assert requests_after_first_run == 3  # HEAD ok, HEAD + GET missing
+
+    assert run().keys() == errors.keys()
+    assert len(server.requests) == requests_after_first_run
+    assert (tmp_path / LINK_CACHE_FILENAME).exists()
+
+
+def test_link_cache_expires_failures_sooner(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(linkcheck.time, "time", lambda: now[0])
+    cache = LinkCache(ttl=600, failure_ttl=60)
+    cache.put("https://ok.example", True)
+    cache.put("https://down.example", False)
+
+    now[0] += 61
+
+    assert cache.get("https://ok.example") is True
+    assert cache.get("https://down.example") is None
+    assert LinkCache(ttl=30, failure_ttl=60).failure_ttl == 30
+
+
+def test_rule_rechecks_a_failed_url_after_the_failure_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(linkcheck.time, "time", lambda: now[0])
+    outcomes = [False, True]
+    checked = []
+
+    def check_url(self, url):
+        checked.append(url)
+        return outcomes.pop(0)
+
+    monkeypatch.setattr(LinkChecker, "check_url", check_url)
+    path = tmp_path / "a.md"
+    path.write_text("[flaky](https://flaky.example)\n", encoding="utf-8")
+    facts = BrokenLinkCheckRule({"check_external": True}).collect(MarkdownParser().parse(str(path)))
+
+    def run():
+        rule = BrokenLinkCheckRule({"check_external": True, "failure_cache_ttl": 60})
+        rule.cache_dir = str(tmp_path)
+        return rule.check_project({str(path): facts})
+
+    assert run()  # A timeout or 5xx reports the link as broken.
+    assert run()  # Served from the cache within the failure TTL.
+    now[0] += 61
+    assert run() == {}
+    assert checked == ["https://flaky.example", "https://flaky.example"]
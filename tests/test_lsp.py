@@ -0,0 +1,206 @@
+import io
+import json
+import time
+
+import pytest
+
+from fds_dev.lsp import DocumentBuffer, LanguageServer, uri_to_path
+from fds_dev.parser import MarkdownParser
+
+
+def _frame(payload):
+    body = json.dumps(payload).encode("utf-8")
+    return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+
+def _read_frames(data):
+    messages = []
+    stream = io.BytesIO(data)
+    while True:
+        header = stream.readline()
+        if not header:
+            return messages
+        length = int(header.split(b":")[1])
+        stream.readline()
+        messages.append(json.loads(stream.read(length)))
+
+
+def _change(start_line, start_char, end_line, end_char, text):
+    return {
+        "range": {
+            "start": {"line": start_line, "character": start_char},
+            "end": {"line": end_line, "character": end_char},
+        },
+        "text": text,
+    }
+
+
+def _assert_same_structure(buffer):
+    expected = MarkdownParser().parse_text(buffer.path, buffer.text)
+    actual = buffer.document()
+    assert actual.headers == expected.headers
+    assert actual.links == expected.links
+    assert actual.fences == expected.fences
+
+
+def test_incremental_edits_match_full_parse():
+    buffer = DocumentBuffer("doc.md", "# Title\n\nSee [a](#title).\n## License\n", MarkdownParser())
+
+    buffer.apply_change(_change(1, 0, 1, 0, "## Inserted\nMore [b](other.md)\n"))
+    _assert_same_structure(buffer)
+    buffer.apply_change(_change(0, 2, 0, 7, "Renamed"))
+    _assert_same_structure(buffer)
+    buffer.apply_change(_change(1, 0, 3, 0, ""))
+    _assert_same_structure(buffer)
+
+    assert [h.text for h in buffer.document().headers] == ["Renamed", "License"]
+
+
+def test_opening_a_fence_hides_the_lines_below():
+    buffer = DocumentBuffer("doc.md", "# Title\n\n# Code?\n[a](b.md)\n\n## End\n", MarkdownParser())
+
+    buffer.apply_change(_change(1, 0, 1, 0, "```"))
+    _assert_same_structure(buffer)
+    assert [h.text for h in buffer.document().headers] == ["Title"]
+    buffer.apply_change(_change(4, 0, 4, 0, "```"))
+    _assert_same_structure(buffer)
+    assert [h.text for h in buffer.document().headers] == ["Title", "End"]
+
+
+def test_edit_only_reparses_touched_lines(monkeypatch):
+    parser = MarkdownParser()
+    buffer = DocumentBuffer("doc.md", "\n".join(f"## Section {i}" for i in range(100)), parser)
+    calls = []
+    original = parser.parse_line
+    monkeypatch.setattr(parser, "parse_line", lambda line, n: calls.append(line) or original(line, n))
+
+    buffer.apply_change(_change(50, 3, 50, 10, "Part"))
+
+    assert calls == ["## Part 50"]
+    assert buffer.document().headers[50].line_number == 51
+
+
+def test_change_offsets_are_utf16_code_units():
+    buffer = DocumentBuffer("doc.md", "# \U0001F600 Title", MarkdownParser())
+    buffer.apply_change(_change(0, 5, 0, 10, "Name"))
+    assert buffer.lines == ["# \U0001F600 Name"]
+
+
+def test_full_text_change_replaces_buffer():
+    buffer = DocumentBuffer("doc.md", "# Old\n", MarkdownParser())
+    buffer.apply_change({"text": "# New\n## License\n"})
+    assert [h.text for h in buffer.document().headers] == ["New", "License"]
+
+
+def test_uri_to_path():
+    assert uri_to_path("file:///tmp/docs/My%20Guide.md") == "/tmp/docs/My Guide.md"
+
+
+def test_server_session_publishes_diagnostics(tmp_path):
+    (tmp_path / ".fdsrc.yaml").write_text("rules:\n  require-section-license: on\n", encoding="utf-8")
+    uri = (tmp_path / "README.md").as_uri()
+    requests = b"".join(
+        _frame(payload)
+        for payload in [
+            {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+            {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+            {"jsonrpc": "2.0", "method": "textDocument/didOpen",
+             "params": {"textDocument": {"uri": uri, "languageId": "markdown", "version": 1, "text": "# Title\n"}}},
+            {"jsonrpc": "2.0", "method": "textDocument/didChange",
+             "params": {"textDocument": {"uri": uri, "version": 2},
+                        "contentChanges": [_change(1, 0, 1, 0, "## License\n")]}},
+            {"jsonrpc": "2.0", "id": 2, "method": "hover", "params": {}},
+            {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]
+    )
+    output = io.BytesIO()
+    server = LanguageServer(io.BytesIO(requests), output, debounce=0.0)
+
+    assert server.serve() == 0
+
+    messages = _read_frames(output.getvalue())
+    init = next(m for m in messages if m.get("id") == 1)
+    assert init["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    assert next(m for m in messages if m.get("id") == 2)["error"]["code"] == -32601
+    diagnostics = [m["params"]["diagnostics"] for m in messages if m.get("method") == "textDocument/publishDiagnostics"]
+    assert diagnostics[-1] == []
+    assert any(d and d[0]["code"] == "require-section-license" for d in diagnostics)
+
+
+def test_debounce_coalesces_rapid_changes(tmp_path):
+    server = LanguageServer(io.BytesIO(), io.BytesIO(), debounce=10.0)
+    uri = (tmp_path / "doc.md").as_uri()
+    server.handle({"method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": "# A\n"}}})
+    published = []
+    server.publish = lambda uri, buffer: published.append(buffer.text)
+
+    server._publish_due()
+    for column, char in enumerate("bcd", start=3):
+        server.handle({"method": "textDocument/didChange",
+                       "params": {"textDocument": {"uri": uri}, "contentChanges": [_change(0, column, 0, column, char)]}})
+    server._publish_due()
+    assert published == ["# A\n"]
+
+    server._publish_due(flush=True)
+    assert published == ["# A\n", "# Abcd\n"]
+
+
+def test_publish_latency_on_large_readme(tmp_path):
+    text = "".join(f"## Section {i}\n\nSee [link](#section-{i}) and [file](docs/{i}.md).\n\n" for i in range(2000))
+    server = LanguageServer(io.BytesIO(), io.BytesIO())
+    uri = (tmp_path / "README.md").as_uri()
+    server.handle({"method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": text}}})
+    server._runner_for = lambda path: __import__("fds_dev.runner").runner.LintRunner(
+        {"rules": {"require-section-license": "on", "section-order": {"order": ["Section 1", "Section 2"]}}}
+    )
+
+    start = time.perf_counter()
+    server.handle({"method": "textDocument/didChange",
+                   "params": {"textDocument": {"uri": uri}, "contentChanges": [_change(4, 0, 4, 0, "## License\n")]}})
+    server._publish_due(flush=True)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5  # generous bound for slow CI machines; typically a few ms
+
+
+def test_malformed_params_fail_only_their_message(tmp_path):
+    uri = (tmp_path / "README.md").as_uri()
+    requests = b"".join(
+        _frame(payload)
+        for payload in [
+            {"jsonrpc": "2.0", "id": 1, "method": "textDocument/didOpen", "params": {}},
+            {"jsonrpc": "2.0", "method": "textDocument/didSave", "params": {"textDocument": {}}},
+            {"jsonrpc": "2.0", "method": "textDocument/didOpen",
+             "params": {"textDocument": {"uri": uri, "text": "# Title\n"}}},
+            {"jsonrpc": "2.0", "method": "textDocument/didChange",
+             "params": {"textDocument": {"uri": uri}, "contentChanges": "not a list"}},
+            {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]
+    )
+    output = io.BytesIO()
+    server = LanguageServer(io.BytesIO(requests), output, debounce=0.0)
+
+    assert server.serve() == 0
+
+    messages = _read_frames(output.getvalue())
+    assert next(m for m in messages if m.get("id") == 1)["error"]["code"] == -32602
+    assert next(m for m in messages if m.get("id") == 2)["result"] is None
+    assert any(m.get("method") == "textDocument/publishDiagnostics" for m in messages)
+
+
+def test_diagnostics_skip_external_link_checks(tmp_path, monkeypatch):
+    (tmp_path / ".fdsrc.yaml").write_text("rules:\n  broken-link-check:\n    check_external: true\n", encoding="utf-8")
+    monkeypatch.setattr("fds_dev.linkcheck.LinkChecker.check", lambda self, urls: pytest.fail("network checked"))
+    server = LanguageServer(io.BytesIO(), io.BytesIO(), debounce=0.0)
+    uri = (tmp_path / "README.md").as_uri()
+    server.handle({"method": "textDocument/didOpen",
+                   "params": {"textDocument": {"uri": uri, "text": "# T\n[a](https://example.invalid) [b](#gone)\n"}}})
+    published = []
+    server.send = published.append
+
+    server._publish_due(flush=True)
+
+    diagnostics = published[-1]["params"]["diagnostics"]
+    assert [d["message"] for d in diagnostics] == ["Broken anchor link: '#gone' does not match any heading."]
@@ -0,0 +1,126 @@
+import pytest
+from click.testing import CliRunner
+
+from fds_dev import main as main_module
+from fds_dev.main import cli, execute_plan, plan_execution
+from fds_dev.runner import LintRunner
+
+
+def _misses(count, size=100):
+    return [(f"doc{i}.md", None, size) for i in range(count)]
+
+
+@pytest.fixture
+def many_cpus(monkeypatch):
+    monkeypatch.setattr(main_module.os, "cpu_count", lambda: 8)
+
+
+def test_small_job_runs_inline(many_cpus):
+    plan = plan_execution(_misses(1))
+    assert (plan.mode, plan.workers) == ("inline", 1)
+
+
+def test_nothing_to_lint_runs_inline(many_cpus):
+    assert plan_execution([], cache_hits=500).mode == "inline"
+
+
+def test_large_job_uses_processes(many_cpus):
+    plan = plan_execution(_misses(200, size=10_000))
+    assert (plan.mode, plan.workers) == ("process", 8)
+    assert plan.total_bytes == 2_000_000
+
+
+def test_few_but_large_files_use_processes(many_cpus):
+    assert plan_execution(_misses(4, size=1_000_000)).mode == "process"
+
+
+def test_auto_never_picks_threads(many_cpus):
+    # Network checks run in the project phase, so per-file work is CPU bound.
+    for count, size in ((1, 100), (3, 100), (200, 10_000)):
+        assert plan_execution(_misses(count, size)).mode != "thread"
+
+
+def test_single_cpu_runs_inline(monkeypatch):
+    monkeypatch.setattr(main_module.os, "cpu_count", lambda: 1)
+    assert plan_execution(_misses(500, size=10_000)).mode == "inline"
+
+
+def test_overrides_take_precedence(many_cpus):
+    assert plan_execution(_misses(500, size=10_000), jobs=1).mode == "inline"
+    plan = plan_execution(_misses(3), jobs=2, executor="process")
+    assert (plan.mode, plan.workers) == ("process", 2)
+    assert plan_execution(_misses(2), jobs=16, executor="thread").workers == 2
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+def test_execute_plan_modes_agree(tmp_path, mode):
+    paths = []
+    for index, content in enumerate(["# A\n## License\n", "# B\n"]):
+        path = tmp_path / f"doc{index}.md"
+        path.write_text(content, encoding="utf-8")
+        paths.append(str(path))
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    misses = [(path, None, 10) for path in paths]
+
+    plan = plan_execution(misses, executor=mode)
+    results = {r[0]: r[3] for batch in execute_plan(plan, runner, misses) for r in batch}
+
+    assert [len(results[path]) for path in paths] == [0, 1]
+
+
+def test_lint_command_accepts_executor_options(tmp_path):
+    doc = tmp_path / "README.md"
+    doc.write_text("# Title\n", encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["lint", str(doc), "--executor", "inline", "--jobs", "2"])
+
+    assert result.exit_code == 0
+    assert "No issues found in 1 file" in result.output
+
+
+def test_lint_reports_cross_file_anchors_once_per_file(tmp_path):
+    (tmp_path / "guide.md").write_text("# Guide\n## Install\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("# Readme\n[a](guide.md#install) [b](guide.md#gone) [c](missing.md)\n",
+                                        encoding="utf-8")
+    (tmp_path / ".fdsrc.yaml").write_text("rules:\n  broken-link-check: 'on'\n", encoding="utf-8")
+
+    for _ in range(2):  # The second run is served from the cache.
+        result = CliRunner().invoke(cli, ["lint", str(tmp_path)])
+        assert result.exit_code == 0, result.output
+        assert result.output.count("Found 2 issues in") == 1
+        assert "'guide.md#gone' does not match any heading in 'guide.md'" in result.output
+        assert "guide.md#install" not in result.output
+
+
+def test_lint_profile_prints_report_to_stderr(tmp_path, cli_runner):
+    (tmp_path / "README.md").write_text("# Title\n", encoding="utf-8")
+    (tmp_path / ".fdsrc.yaml").write_text("rules:\n  require-section-license: 'on'\n", encoding="utf-8")
+
+    result = cli_runner.invoke(cli, ["lint", str(tmp_path), "--profile", "--executor", "inline"])
+
+    assert result.exit_code == 0, result.output
+    assert "Profile:" in result.stderr and "Profile:" not in result.stdout
+    assert "require-section-license" in result.stderr
+    assert "cache: 0/1 file(s) from cache (0.0%)" in result.stderr
+
+
+def test_lint_treats_a_string_exclude_as_one_pattern(tmp_path):
+    (tmp_path / "drafts").mkdir()
+    (tmp_path / "drafts" / "wip.md").write_text("# Draft\n", encoding="utf-8")
+    (tmp_path / "README.md").write_text("# Readme\n", encoding="utf-8")
+    (tmp_path / ".fdsrc.yaml").write_text("exclude: 'drafts/'\n", encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["lint", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "No issues found in 1 file" in result.output
+
+
+def test_lint_rejects_an_exclude_that_is_not_a_list_of_globs(tmp_path):
+    (tmp_path / "README.md").write_text("# Readme\n", encoding="utf-8")
+    (tmp_path / ".fdsrc.yaml").write_text("exclude:\n  drafts: true\n", encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["lint", str(tmp_path)])
+
+    assert result.exit_code == 2
+    assert "'exclude' in .fdsrc.yaml" in result.output
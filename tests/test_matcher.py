@@ -0,0 +1,32 @@
+import pytest
+
+from fds_dev.matcher import SectionMatcher
+
+
+def earliest(sections, text):
+    for index, section in enumerate(sections):
+        if section.lower() in text.lower():
+            return index
+    return -1
+
+
+@pytest.mark.parametrize("sections, text", [
+    (["Usage", "Install"], "Install and usage"),
+    (["License", "Install"], "Installation"),
+    (["API", "api reference"], "The API Reference"),
+    (["b", "ab", "a"], "xab"),
+    (["C++ (legacy)", "c"], "Notes on C++ (Legacy)"),
+    (["Straße"], "STRASSE"),
+    (["", "Anything"], "Anything"),
+    (["Install", "Install"], "install"),
+    (["Install"], "Overview"),
+])
+def test_match_returns_earliest_listed_section(sections, text):
+    assert SectionMatcher(sections).match(text) == earliest(sections, text)
+
+
+def test_empty_order_matches_nothing():
+    matcher = SectionMatcher([])
+
+    assert not matcher
+    assert matcher.match("Install") == -1
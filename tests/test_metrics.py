@@ -0,0 +1,155 @@
+from click.testing import CliRunner
+
+from fds_dev.main import cli
+from fds_dev.metrics import MetricFamily, MetricsRegistry, lint_metrics
+from fds_dev.profiling import RunStats
+
+import pytest
+
+
+def samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_render_follows_openmetrics_text_format():
+    registry = MetricsRegistry()
+    registry.counter("fds_files", "Files.").inc(3)
+    registry.counter("fds_links", "Links.").inc(2, kind='a"b')
+    histogram = registry.histogram("fds_duration_seconds", "Durations.", (0.1, 1.0), unit="seconds")
+    for value in (0.05, 0.5, 0.7, 4.0):
+        histogram.observe(value, rule="r")
+
+    text = registry.render()
+
+    assert text.endswith("# EOF\n")
+    assert "# TYPE fds_files counter\n# HELP fds_files Files.\nfds_files_total 3\n" in text
+    assert "# UNIT fds_duration_seconds seconds\n" in text
+    assert samples(text) == {
+        "fds_files_total": "3",
+        'fds_links_total{kind="a\\"b"}': "2",
+        'fds_duration_seconds_bucket{rule="r",le="0.1"}': "1",
+        'fds_duration_seconds_bucket{rule="r",le="1.0"}': "3",
+        'fds_duration_seconds_bucket{rule="r",le="+Inf"}': "4",
+        'fds_duration_seconds_count{rule="r"}': "4",
+        'fds_duration_seconds_sum{rule="r"}': "5.25",
+    }
+
+
+def test_family_names_must_end_with_their_unit_and_be_unique():
+    registry = MetricsRegistry()
+    registry.counter("fds_files", "Files.")
+
+    with pytest.raises(ValueError):
+        registry.counter("fds_files", "Files again.")
+    with pytest.raises(ValueError):
+        registry.gauge("fds_duration", "Duration.", unit="seconds")
+
+
+def test_families_must_implement_sample_rendering():
+    class Summary(MetricFamily):
+        kind = "summary"
+
+    with pytest.raises(TypeError):
+        Summary("fds_summary", "Summary.")
+
+
+def test_write_replaces_the_file_atomically(tmp_path):
+    target = tmp_path / "fds.prom"
+    target.write_text("old", encoding="utf-8")
+    registry = MetricsRegistry()
+    registry.gauge("fds_up", "Up.").set(1)
+
+    registry.write(str(target))
+
+    assert target.read_text(encoding="utf-8") == "# TYPE fds_up gauge\n# HELP fds_up Up.\nfds_up 1\n# EOF\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["fds.prom"]
+
+
+def test_lint_metrics_split_rule_phases():
+    stats = RunStats()
+    stats.add_rule("broken-link-check-rule", 2_000_000)
+    stats.add_rule("broken-link-check-rule [collect]", 1_000)
+    stats.add_project("broken-link-check-rule", 3_000_000_000)
+    stats.add_count("links.file", 4)
+    stats.add_count("read_bytes", 1024)
+    stats.add_cache_result(True)
+
+    values = samples(lint_metrics(stats, files=2, issues=1, duration=0.5).render())
+
+    assert values["fds_lint_files_total"] == "2"
+    assert values["fds_lint_cache_hits_total"] == "1"
+    assert values["fds_lint_read_bytes_total"] == "1024"
+    assert values['fds_lint_links_checked_total{kind="file"}'] == "4"
+    assert values['fds_lint_rule_duration_seconds_count{phase="collect",rule="broken-link-check-rule"}'] == "1"
+    assert values['fds_lint_rule_duration_seconds_bucket{phase="project",rule="broken-link-check-rule",le="2.5"}'] == "0"
+    assert values['fds_lint_rule_duration_seconds_bucket{phase="project",rule="broken-link-check-rule",le="5.0"}'] == "1"
+
+
+def test_lint_metrics_file_counts_files_cache_and_links(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "README.md").write_text("# Readme\n[a](#readme) [b](guide.md#gone) [c](missing.md) [d](guide.md)\n",
+                                     encoding="utf-8")
+    (docs / "guide.md").write_text("# Guide\n", encoding="utf-8")
+    (docs / ".fdsrc.yaml").write_text("rules:\n  broken-link-check: 'on'\n", encoding="utf-8")
+    metrics_file = tmp_path / "fds.prom"
+
+    runs = []
+    for _ in range(2):  # The second run is served from the cache.
+        result = CliRunner().invoke(cli, ["lint", str(docs), "--metrics-file", str(metrics_file)])
+        assert result.exit_code == 0, result.output
+        runs.append(samples(metrics_file.read_text(encoding="utf-8")))
+
+    assert "Profile:" not in result.output
+    assert runs[0]["fds_lint_files_total"] == "2"
+    assert runs[0]["fds_lint_cache_misses_total"] == "2"
+    assert runs[0]["fds_lint_issues_total"] == "2"
+    assert runs[0]['fds_lint_links_checked_total{kind="anchor"}'] == "1"
+    assert runs[0]['fds_lint_links_checked_total{kind="cross-file"}'] == "1"
+    assert int(runs[0]["fds_lint_read_bytes_total"]) > 0
+    assert runs[0]["fds_lint_dircache_hits_total"] == "1"
+    assert runs[0]["fds_lint_dircache_misses_total"] == "2"
+    assert runs[1]["fds_lint_cache_hits_total"] == "2"
+    assert 'fds_lint_links_checked_total{kind="anchor"}' not in runs[1]
+
+
+def test_translate_metrics_file_records_provider_and_omega_scores(tmp_path):
+    source = tmp_path / "guide.md"
+    source.write_text("# 가이드\n\n첫 번째 문단입니다.\n\n두 번째 문단입니다.\n", encoding="utf-8")
+    (tmp_path / ".fdsrc.yaml").write_text("language:\n  source: 'ko'\n  target: 'en'\n", encoding="utf-8")
+    metrics_file = tmp_path / "translate.prom"
+
+    result = CliRunner().invoke(cli, ["translate", str(source), "--output", str(tmp_path / "out.md"),
+                                      "--metrics-file", str(metrics_file)])
+
+    assert result.exit_code == 0, result.output
+    values = samples(metrics_file.read_text(encoding="utf-8"))
+    assert values['fds_translate_documents_total{provider="echo"}'] == "1"
+    assert values['fds_translate_characters_total{provider="echo"}'] == str(len(source.read_text(encoding="utf-8")))
+    assert values['fds_translate_provider_latency_seconds_count{provider="echo"}'] == "1"
+    assert values['fds_translate_omega_score_count{provider="echo"}'] == "3"
+
+
+def test_process_workers_report_the_same_link_counts_as_inline(tmp_path):
+    content = "# Doc\n[a](#doc) [b](#doc) [c](#doc) [d](guide.md) [e](missing.md)\n"
+    counts = {}
+    for executor in ("inline", "process"):
+        docs = tmp_path / executor
+        docs.mkdir()
+        (docs / "guide.md").write_text("# Guide\n", encoding="utf-8")
+        for index in range(8):
+            (docs / f"doc_{index}.md").write_text(content, encoding="utf-8")
+        (docs / ".fdsrc.yaml").write_text("rules:\n  broken-link-check: 'on'\n", encoding="utf-8")
+        metrics_file = tmp_path / f"{executor}.prom"
+
+        # One worker receives several chunks, each exported separately.
+        result = CliRunner().invoke(cli, ["lint", str(docs), "--executor", executor, "--jobs", "1",
+                                          "--metrics-file", str(metrics_file)])
+
+        assert result.exit_code == 0, result.output
+        values = samples(metrics_file.read_text(encoding="utf-8"))
+        counts[executor] = {name: value for name, value in values.items() if "links_checked" in name}
+
+    assert counts["process"] == counts["inline"]
+    assert counts["inline"]['fds_lint_links_checked_total{kind="anchor"}'] == "24"
+    assert counts["inline"]['fds_lint_links_checked_total{kind="file"}'] == "16"
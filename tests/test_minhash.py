@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from fds_dev import minhash
+from fds_dev.minhash import LshIndex, MinHasher, choose_bands, shingles, similarity, words
+
+
+def _text(seed, count=300):
+    rng = random.Random(seed)
+    return " ".join(f"w{rng.randrange(400)}" for _ in range(count))
+
+
+def test_shingles_cover_consecutive_words():
+    tokens = words("One two, three! Four")
+
+    assert tokens == ["one", "two", "three", "four"]
+    assert len(shingles(tokens, 2)) == 3
+    assert len(shingles(tokens, 10)) == 1
+    assert shingles([], 3) == set()
+
+
+def test_signatures_are_deterministic_and_estimate_jaccard():
+    hasher = MinHasher(128)
+    first = shingles(words(_text(1)), 3)
+    tokens = words(_text(1))
+    tokens[50:60] = ["edited"] * 10
+    second = shingles(tokens, 3)
+    jaccard = len(first & second) / len(first | second)
+
+    signature = hasher.signature(first)
+    assert signature == MinHasher(128).signature(first)
+    assert all(0 <= value < (1 << 31) for value in signature)
+    assert similarity(signature, hasher.signature(second)) == pytest.approx(jaccard, abs=0.12)
+    assert hasher.signature([]) == []
+
+
+def test_pure_python_signature_is_used_without_numpy(monkeypatch):
+    monkeypatch.setattr(minhash, "_numpy", False)
+    hashes = shingles(words(_text(2)), 5)
+    hasher = MinHasher(16)
+
+    expected = [min((a * x + b) % ((1 << 31) - 1) for x in hashes) for a, b in zip(hasher.a, hasher.b)]
+    assert hasher.signature(hashes) == expected
+
+
+def test_numpy_signature_is_computed_in_blocks_and_matches_pure_python(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(minhash, "_BLOCK", 64)
+    hashes = sorted(shingles(words(_text(3, count=1000)), 5))
+    hasher = MinHasher(16)
+
+    blocked = hasher.signature(hashes)
+    monkeypatch.setattr(minhash, "_numpy", False)
+    assert blocked == hasher.signature(hashes)
+
+
+def test_choose_bands_tracks_the_threshold():
+    assert choose_bands(64, 0.8) == 8
+    assert choose_bands(64, 0.5) > choose_bands(64, 0.9)
+
+
+def test_lsh_index_clusters_only_similar_signatures():
+    hasher = MinHasher(64)
+    base = words(_text(3))
+    near = list(base)
+    near[10] = "changed"
+    index = LshIndex(64, choose_bands(64, 0.8))
+    for key, tokens in (("a.md", base), ("b.md", near), ("c.md", words(_text(4)))):
+        index.add(key, hasher.signature(shingles(tokens, 5)))
+    for n in range(3):
+        index.add(f"copy{n}.md", index.signatures["c.md"])
+
+    assert sorted(index.clusters(0.8)) == [["a.md", "b.md"], ["c.md", "copy0.md", "copy1.md", "copy2.md"]]
+
+
+def test_lsh_index_compares_every_pair_in_a_bucket():
+    # All three share the first band; only b and c are similar, and they
+    # share no other band, so the pair is only found inside a's bucket.
+    index = LshIndex(8, 4)
+    index.add("a.md", [1, 1, 5, 5, 6, 6, 7, 7])
+    index.add("b.md", [1, 1, 2, 2, 3, 3, 4, 4])
+    index.add("c.md", [1, 1, 2, 9, 3, 9, 4, 9])
+
+    assert index.clusters(0.6) == [["b.md", "c.md"]]
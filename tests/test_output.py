@@ -0,0 +1,113 @@
+import io
+import json
+
+import pytest
+
+from fds_dev.main import cli
+from fds_dev.output import ResultWriter, create_result_writer
+from fds_dev.rules import LintError
+
+
+def _errors():
+    return [
+        LintError(line_number=7, message="Second", rule_name="rule-b"),
+        LintError(line_number=2, message="First", rule_name="rule-a"),
+    ]
+
+
+def test_text_writer_reports_issues_and_summary():
+    stream = io.StringIO()
+    writer = create_result_writer("text", stream)
+    writer.write_file("a.md", _errors())
+    writer.write_file("b.md", [])
+    writer.finish()
+    output = stream.getvalue()
+    assert "Found 2 issues in a.md:" in output
+    assert output.index("L2") < output.index("L7")
+    assert "b.md" not in output
+    assert "Summary: Found 2 total issues in 1 files." in output
+
+
+def test_text_writer_reports_clean_run():
+    stream = io.StringIO()
+    writer = create_result_writer("text", stream)
+    writer.write_file("a.md", [])
+    writer.finish()
+    assert "No issues found in 1 file." in stream.getvalue()
+
+
+def test_jsonl_writer_emits_one_record_per_issue():
+    stream = io.StringIO()
+    writer = create_result_writer("jsonl", stream)
+    writer.write_file("a.md", _errors())
+    writer.write_file("b.md", [])
+    writer.finish()
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records == [
+        {"path": "a.md", "line": 2, "rule": "rule-a", "message": "First"},
+        {"path": "a.md", "line": 7, "rule": "rule-b", "message": "Second"},
+    ]
+
+
+def test_sarif_writer_produces_valid_log():
+    stream = io.StringIO()
+    writer = create_result_writer("sarif", stream)
+    writer.write_file("docs/a.md", _errors())
+    writer.write_file("b.md", [LintError(line_number=0, message="Broken", rule_name="runner")])
+    writer.finish()
+    log = json.loads(stream.getvalue())
+    run = log["runs"][0]
+    assert log["version"] == "2.1.0"
+    assert [result["ruleId"] for result in run["results"]] == ["rule-a", "rule-b", "runner"]
+    assert run["results"][0]["locations"][0]["physicalLocation"]["region"] == {"startLine": 2}
+    assert "region" not in run["results"][2]["locations"][0]["physicalLocation"]
+    assert [rule["id"] for rule in run["tool"]["driver"]["rules"]] == ["rule-a", "rule-b", "runner"]
+
+
+def test_sarif_writer_without_results():
+    stream = io.StringIO()
+    writer = create_result_writer("sarif", stream)
+    writer.finish()
+    assert json.loads(stream.getvalue())["runs"][0]["results"] == []
+
+
+def test_writer_buffers_until_threshold(monkeypatch):
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            CountingStream.writes += 1
+            return super().write(text)
+
+    monkeypatch.setattr(ResultWriter, "BUFFER_SIZE", 1024)
+    stream = CountingStream()
+    writer = create_result_writer("jsonl", stream)
+    for index in range(100):
+        writer.write_file(f"doc{index}.md", _errors())
+    writes_before_finish = CountingStream.writes
+    writer.finish()
+    assert 0 < writes_before_finish < 100
+    assert len(stream.getvalue().splitlines()) == 200
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        create_result_writer("xml", io.StringIO())
+
+
+def test_lint_format_jsonl_writes_only_records_to_stdout(tmp_path, cli_runner):
+    (tmp_path / "doc.md").write_text("# Title\n", encoding="utf-8")
+    (tmp_path / ".fdsrc.yaml").write_text("rules:\n  require-section-license: 'on'\n", encoding="utf-8")
+    result = cli_runner.invoke(cli, ["lint", str(tmp_path), "--format", "jsonl"])
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["rule"] for record in records] == ["require-section-license"]
+    assert "Found 1 file(s) to lint" in result.stderr
+
+
+def test_writers_must_implement_format_file():
+    class Incomplete(ResultWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(io.StringIO())
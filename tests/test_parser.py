@@ -1,6 +1,7 @@
 import os
+import pickle
 import pytest
-from fds_dev.parser import MarkdownParser
+from fds_dev.parser import Document, Link, MarkdownParser
 
 @pytest.fixture
 def create_test_markdown_file(tmp_path):
@@ -92,3 +93,138 @@ def test_file_not_found():
     parser = MarkdownParser()
     with pytest.raises(FileNotFoundError):
         parser.parse("non_existent_file.md")
+
+def test_fenced_code_is_not_parsed(create_test_markdown_file):
+    content = (
+        "# Title\n"
+        "```bash\n"
+        "# not a header\n"
+        "[not](a-link.md)\n"
+        "```\n"
+        "## After\n"
+        "~~~~\n"
+        "~~~\n"
+        "# still code\n"
+        "~~~~~\n"
+        "[real](b.md)\n"
+    )
+    doc = MarkdownParser().parse(create_test_markdown_file(content))
+
+    assert [h.text for h in doc.headers] == ["Title", "After"]
+    assert [link.target for link in doc.links] == ["b.md"]
+    assert doc.fences == [(2, 5), (7, 10)]
+
+def test_unclosed_fence_runs_to_end(create_test_markdown_file):
+    content = "# Title\n   ```\n# code\n```python\n# more code\n"
+    doc = MarkdownParser().parse(create_test_markdown_file(content))
+
+    assert [h.text for h in doc.headers] == ["Title"]
+    assert doc.fences == [(2, 5)]
+
+def test_inline_backticks_do_not_open_a_fence(create_test_markdown_file):
+    content = "```inline``` code\n# Header\n    ```\n# Indented fence is code, not a fence\n"
+    doc = MarkdownParser().parse(create_test_markdown_file(content))
+
+    assert [h.text for h in doc.headers] == ["Header", "Indented fence is code, not a fence"]
+    assert doc.fences == []
+
+MAPPED_SAMPLE = (
+    "# Title\r\n"
+    "Intro [guide](docs/guide.md#intro) and [site](https://example.com).\r\n"
+    "```python\r\n"
+    "# not a header [x](y.md)\r\n"
+    "```\r\n"
+    "  ## Sub   section  \n"
+    "#no-space is not a header\n"
+    "####### seven is not a header\n"
+    "```inline``` [after](#title)\n"
+    "~~~\n"
+    "# open until the end\n"
+)
+
+@pytest.mark.parametrize("content", [MAPPED_SAMPLE, MAPPED_SAMPLE.replace("~~~\n", "~~~\n~~~\n"), "", "no newline [a](b.md)"])
+def test_parse_mapped_matches_parse_text(create_test_markdown_file, content):
+    file_path = create_test_markdown_file(content)
+    parser = MarkdownParser()
+    expected = parser.parse_text(str(file_path), file_path.read_bytes().decode("utf-8"))
+    mapped = parser.parse_mapped(str(file_path))
+
+    assert mapped.headers == expected.headers
+    assert mapped.links == expected.links
+    assert mapped.fences == expected.fences
+
+@pytest.mark.parametrize("content", [
+    "#\u00a0No-break space\n# \u3000Ideographic space\n\u3000# Indented\n\t#\tTabs\n",
+    "# One\rstill one [a](#one)\n# Two\x0bstill two\n# Three\x1c\u2028\u2029\x85end [b](c.md)\n",
+    "```\rnot a fence close\n# code\n```\r\n# after\r\n\n",
+])
+def test_mapped_and_text_parsing_agree_on_whitespace_and_line_breaks(create_test_markdown_file, content):
+    file_path = create_test_markdown_file(content)
+    text = MarkdownParser(mmap_threshold=None).parse(str(file_path))
+    mapped = MarkdownParser(mmap_threshold=1).parse(str(file_path))
+
+    assert mapped.content is None and text.content is not None
+    assert (mapped.headers, mapped.links, mapped.fences) == (text.headers, text.links, text.fences)
+    assert text.line_count == content.count("\n") + (not content.endswith("\n"))
+    assert text.lines == [line.rstrip("\r") for line in content.split("\n")][:text.line_count]
+
+def test_mmap_threshold_selects_mapped_parsing(create_test_markdown_file):
+    file_path = create_test_markdown_file("# Big\n" * 10)
+
+    assert MarkdownParser(mmap_threshold=10).parse(file_path).content is None
+    assert MarkdownParser(mmap_threshold=10_000).parse(file_path).content == "# Big\n" * 10
+    assert MarkdownParser().parse(file_path).content is not None
+
+def test_line_offsets_address_lines_without_a_copy():
+    content = "# Title\r\nsecond\n\nlast"
+    doc = MarkdownParser().parse_text("doc.md", content)
+
+    assert doc.line_offsets.typecode == "I"
+    assert list(doc.line_offsets) == [0, 9, 16, 17]
+    assert doc.line_count == len(content.splitlines())
+    assert [doc.line(n) for n in range(1, doc.line_count + 1)] == content.splitlines() == doc.lines
+    assert list(Document(path="doc.md", content=content).line_offsets) == list(doc.line_offsets)
+    assert Document(path="empty.md", content="").line_count == 1
+
+def test_parsed_structures_are_slotted_and_pickle_compactly():
+    doc = MarkdownParser().parse_text("doc.md", "# Title\n[a](#title) [b](https://example.com)\n")
+
+    for item in (doc, doc.headers[0], doc.links[0]):
+        assert not hasattr(item, "__dict__")
+    restored = pickle.loads(pickle.dumps(doc))
+    assert (restored.path, restored.content, restored.headers, restored.links) == (doc.path, doc.content, doc.headers, doc.links)
+    assert b"line_number" not in pickle.dumps(doc.headers)
+    assert Link(text="x", target="y", line_number=1, kind="".join(["anc", "hor"])).kind is doc.links[0].kind
+
+def test_unrequested_features_are_extracted_on_first_access(create_test_markdown_file):
+    content = "# Title\n```\n# code\n```\nSee [a](#title).\n"
+    parser = MarkdownParser()
+    expected = parser.parse_text("doc.md", content)
+    doc = parser.parse_text("doc.md", content, features={"headers"})
+
+    assert doc._links is None
+    assert doc.headers == expected.headers
+    assert doc.links == expected.links
+    assert doc.fences == expected.fences == [(2, 4)]
+
+    file_path = create_test_markdown_file(content)
+    mapped = MarkdownParser(mmap_threshold=1).parse(str(file_path), features={"links"})
+    assert mapped.content is None and mapped._headers is None
+    assert mapped.headers == expected.headers
+    assert MarkdownParser(mmap_threshold=1).parse(str(file_path), features={"text"}).content == content
+
+def test_text_only_parse_skips_extraction():
+    doc = MarkdownParser().parse_text("doc.md", "# Title\n", features={"text"})
+
+    assert (doc._headers, doc._links, doc._fences) == (None, None, None)
+    assert doc.headers[0].text == "Title"
+
+def test_parse_bytes_matches_parse_text():
+    data = "# Título\r\n[a](#título)\r\n".encode("utf-8")
+    parser = MarkdownParser()
+
+    doc = parser.parse_bytes("doc.md", data)
+    assert doc.content == data.decode("utf-8")
+    assert doc.headers == parser.parse_text("doc.md", data.decode("utf-8")).headers
+    with pytest.raises(UnicodeDecodeError):
+        parser.parse_bytes("doc.md", b"\xff")
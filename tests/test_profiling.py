@@ -0,0 +1,80 @@
+import pytest
+
+from fds_dev.profiling import RunStats, percentile
+from fds_dev.runner import LintRunner, init_worker, lint_chunk
+
+
+@pytest.fixture
+def docs(tmp_path):
+    paths = []
+    for name, content in (("a.md", "# A\n## License\n"), ("b.md", "# B\n" + "text\n" * 200)):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile(list(range(1, 21)), 0.95) == 19
+    assert percentile([5], 0.95) == 5
+    assert percentile([], 0.95) == 0
+
+
+def test_runner_records_stages_rules_and_cache_results(docs):
+    stats = RunStats(slowest=1)
+    runner = LintRunner({"rules": {"require-section-license": "on", "section-order": {"order": ["A"]}}}, stats=stats)
+
+    results = [runner.run(path, {}) for path in docs]
+    file_path, file_hash, file_stat, errors, facts = results[0]
+    runner.run(file_path, {file_path: runner.cache_entry(file_hash, file_stat, errors, facts)})
+
+    assert {"stat", "read", "hash", "parse", "rules", "collect"} <= set(stats.stages)
+    assert len(stats.stages["parse"]) == 2
+    assert sorted(stats.rules) == ["require-section-license", "section-order"]
+    assert all(len(samples) == 2 for samples in stats.rules.values())
+    assert (stats.cache_hits, stats.cache_misses) == (1, 2)
+    assert len(stats.files) == 1
+
+
+def test_worker_stats_are_exported_per_chunk_and_merged(docs):
+    init_worker({"rules": {"require-section-license": "on"}}, profile=True)
+    totals = RunStats()
+
+    for path in docs:
+        results, exported = lint_chunk([(path, None)])
+        assert len(results) == 1
+        totals.merge(exported)
+
+    assert len(totals.rules["require-section-license"]) == 2
+    assert totals.cache_misses == 2
+    assert sorted(path for _, path in totals.files) == sorted(docs)
+
+
+def test_report_lists_rules_slowest_files_and_hit_ratio():
+    stats = RunStats(slowest=2)
+    for elapsed, path in ((3_000_000, "c.md"), (1_000_000, "a.md"), (2_000_000, "b.md")):
+        stats.add_file(path, elapsed)
+        stats.add_rule("section-order", elapsed)
+    stats.add_project("broken-link-check-rule", 5_000_000)
+    stats.add_cache_result(True)
+    stats.add_cache_result(False)
+
+    report = "\n".join(stats.report())
+
+    assert "section-order                      3       6.00     2.000     3.000" in report
+    assert "broken-link-check-rule [project]" in report
+    assert report.index("c.md") < report.index("b.md")
+    assert "a.md" not in report
+    assert "cache: 1/2 file(s) from cache (50.0%)" in report
+
+
+def test_counts_are_merged_and_reported():
+    worker = RunStats()
+    worker.add_count("read_bytes", 100)
+    totals = RunStats()
+    totals.add_count("read_bytes", 20)
+
+    totals.merge(worker.export())
+
+    assert totals.counts == {"read_bytes": 120}
+    assert totals.report()[-1] == "read_bytes: 120"
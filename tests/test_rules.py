@@ -1,3 +1,5 @@
+import os
+
 import pytest
 import requests
 
@@ -6,6 +8,7 @@ from fds_dev.rules import (
     RequireSectionLicense,
     SectionOrder,
     BrokenLinkCheckRule,
+    NearDuplicate,
 )
 
 @pytest.fixture
@@ -159,12 +162,39 @@ def test_broken_link_rule_external(monkeypatch, tmp_path):
 
     rule = BrokenLinkCheckRule({"check_external": True})
 
-    def fake_head(url, allow_redirects=True, timeout=3.0):
+    def fake_head(self, url, allow_redirects=True, timeout=3.0, **kwargs):
         raise requests.RequestException("network error")
 
-    monkeypatch.setattr("fds_dev.rules.requests.head", fake_head)
-    monkeypatch.setattr("fds_dev.rules.requests.get", fake_head)
+    monkeypatch.setattr("requests.Session.head", fake_head)
+    monkeypatch.setattr("requests.Session.get", fake_head)
 
-    errors = rule.apply(doc)
+    # External links are checked in the project-wide phase, not per file.
+    assert rule.apply(doc) == []
+    errors = rule.check_project({doc.path: rule.collect(doc)})[doc.path]
     assert len(errors) == 1
     assert "Broken external link" in errors[0].message
+
+
+def test_near_duplicate_reports_copied_documents(tmp_path):
+    body = " ".join(f"word{n % 97} term{n % 13}" for n in range(120))
+    contents = {
+        "a/README.md": f"# A\n{body}\n",
+        "b/README.md": f"# B\n{body} with a small local change\n",
+        "c/README.md": "# C\n" + " ".join(f"other{n}" for n in range(200)),
+        "d/README.md": "# Short stub\n",
+    }
+    rule = NearDuplicate({})
+    facts = {}
+    for name, content in contents.items():
+        path = tmp_path / name
+        path.parent.mkdir()
+        path.write_text(content, encoding="utf-8")
+        doc = MarkdownParser().parse_text(str(path), content, NearDuplicate.requires)
+        facts[str(path)] = rule.collect(doc)
+
+    assert facts[str(tmp_path / "d/README.md")] is None
+    errors = rule.check_project({path: f for path, f in facts.items() if f})
+
+    assert sorted(errors) == [str(tmp_path / "a/README.md"), str(tmp_path / "b/README.md")]
+    message = errors[str(tmp_path / "a/README.md")][0].message
+    assert message.startswith(f"Document is a near-duplicate of '{os.path.join('..', 'b', 'README.md')}' (estimated ")
@@ -0,0 +1,263 @@
+import os
+
+import pytest
+
+from fds_dev import runner as runner_module
+from fds_dev.rules import LintError, RequireSectionLicense
+from fds_dev.runner import (
+    LintRunner,
+    _get_file_hash,
+    _get_file_stat,
+    balance_chunks,
+    decode_result,
+    encode_result,
+    init_worker,
+    lint_chunk,
+)
+
+
+@pytest.fixture
+def old_markdown_file(tmp_path):
+    """A markdown file whose mtime is far enough in the past to be trusted."""
+    path = tmp_path / "doc.md"
+    path.write_text("# Project\n\n## License\n", encoding="utf-8")
+    os.utime(path, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+    return str(path)
+
+
+def _cache_entry(file_path, runner, errors=None):
+    return runner.cache_entry(_get_file_hash(file_path), _get_file_stat(file_path), errors or [])
+
+
+def test_stat_match_skips_hashing(monkeypatch, old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    cache = {old_markdown_file: _cache_entry(old_markdown_file, runner)}
+
+    def fail_hash(_path):
+        raise AssertionError("file should not be re-hashed")
+
+    monkeypatch.setattr(runner_module, "_get_file_hash", fail_hash)
+    _, file_hash, _, errors, _ = runner.run(old_markdown_file, cache)
+
+    assert file_hash == cache[old_markdown_file]["hash"]
+    assert errors == []
+
+
+def test_verify_hashes_rehashes_on_stat_match(monkeypatch, old_markdown_file):
+    runner = LintRunner({"rules": {}}, verify_hashes=True)
+    cache = {old_markdown_file: _cache_entry(old_markdown_file, runner)}
+    calls = []
+
+    hash_bytes = runner_module._hash_bytes
+
+    def counting_hash(data):
+        calls.append(data)
+        return hash_bytes(data)
+
+    monkeypatch.setattr(runner_module, "_hash_bytes", counting_hash)
+    runner.run(old_markdown_file, cache)
+
+    assert calls == [b"# Project\n\n## License\n"]
+
+
+def test_stat_mismatch_with_same_content_reuses_cached_errors(old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    cached = [LintError(line_number=1, message="cached", rule_name="require-section-license")]
+    entry = _cache_entry(old_markdown_file, runner, cached)
+    entry["mtime_ns"] -= 1
+
+    _, _, file_stat, errors, _ = runner.run(old_markdown_file, {old_markdown_file: entry})
+
+    assert [e.message for e in errors] == ["cached"]
+    assert file_stat["mtime_ns"] == os.stat(old_markdown_file).st_mtime_ns
+
+
+def test_recently_modified_file_has_untrusted_stat(tmp_path):
+    path = tmp_path / "fresh.md"
+    path.write_text("# Fresh\n", encoding="utf-8")
+
+    assert _get_file_stat(str(path)) == {"mtime_ns": None, "size": None, "inode": None}
+
+
+def test_changed_content_is_relinted(old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    entry = _cache_entry(old_markdown_file, runner)
+    with open(old_markdown_file, "w", encoding="utf-8") as f:
+        f.write("# Project without the section\n")
+
+    _, _, _, errors, _ = runner.run(old_markdown_file, {old_markdown_file: entry})
+
+    assert len(errors) == 1
+    assert errors[0].rule_name == "require-section-license"
+
+
+def test_cache_entry_stores_errors_per_rule(old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on", "section-order": {"order": ["A"]}}})
+    errors = [LintError(line_number=3, message="missing", rule_name="require-section-license")]
+
+    entry = _cache_entry(old_markdown_file, runner, errors)
+
+    assert entry["ruleset"] == runner.ruleset_fingerprint
+    assert entry["rules"]["require-section-license"]["errors"] == [[3, "missing"]]
+    assert entry["rules"]["section-order"]["errors"] == []
+
+
+def test_only_rules_with_changed_config_are_rerun(old_markdown_file):
+    config = {"rules": {"require-section-license": "on", "section-order": {"order": ["License", "Project"]}}}
+    runner = LintRunner(config)
+    cached = [LintError(line_number=1, message="cached", rule_name="require-section-license")]
+    cache = {old_markdown_file: _cache_entry(old_markdown_file, runner, cached)}
+
+    config["rules"]["section-order"] = {"order": ["Project", "License"]}
+    updated = LintRunner(config)
+    calls = []
+    for rule in updated.rules:
+        original_begin = rule.begin
+        rule.begin = lambda ctx, _begin=original_begin, _name=rule.name: calls.append(_name) or _begin(ctx)
+
+    _, _, _, errors, _ = updated.run(old_markdown_file, cache)
+
+    assert calls == ["section-order"]
+    assert [e.message for e in errors] == ["cached"]
+
+
+def test_rule_version_bump_invalidates_cached_results(monkeypatch, old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    cached = [LintError(line_number=1, message="stale", rule_name="require-section-license")]
+    cache = {old_markdown_file: _cache_entry(old_markdown_file, runner, cached)}
+
+    monkeypatch.setattr(RequireSectionLicense, "version", RequireSectionLicense.version + 1)
+    _, _, _, errors, _ = LintRunner({"rules": {"require-section-license": "on"}}).run(old_markdown_file, cache)
+
+    assert errors == []
+
+
+def test_iter_cached_resolves_stat_hits_without_reading(monkeypatch, old_markdown_file, tmp_path):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    cached = [LintError(line_number=1, message="cached", rule_name="require-section-license")]
+    cache = {old_markdown_file: _cache_entry(old_markdown_file, runner, cached)}
+    new_file = tmp_path / "new.md"
+    new_file.write_text("# New\n", encoding="utf-8")
+
+    monkeypatch.setattr(runner_module, "_get_file_hash", lambda _path: pytest.fail("no hashing in parent"))
+    results = list(runner.iter_cached([old_markdown_file, str(new_file)], cache))
+
+    (hit_path, hit_errors, _, _), miss = results
+    assert (hit_path, [e.message for e in hit_errors]) == (old_markdown_file, ["cached"])
+    assert miss == (str(new_file), None, None, len("# New\n"))
+
+
+def test_iter_cached_keeps_entry_for_partial_reuse(old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    entry = _cache_entry(old_markdown_file, runner)
+    other = LintRunner({"rules": {"require-section-license": "on", "section-order": {"order": ["A"]}}})
+
+    [(_, errors, cached_entry, _)] = other.iter_cached([old_markdown_file], {old_markdown_file: entry})
+
+    assert errors is None
+    assert cached_entry is entry
+
+
+def test_balance_chunks_spreads_bytes_evenly():
+    tasks = [(f"{size}.md", None, size) for size in (100, 90, 50, 40, 10, 10)]
+
+    chunks = balance_chunks(tasks, 2)
+
+    totals = sorted(sum(int(path.split(".")[0]) for path, _ in chunk) for chunk in chunks)
+    assert totals == [150, 150]
+    assert balance_chunks(tasks[:1], 8) == [[("100.md", None)]]
+
+
+def test_encoded_results_round_trip():
+    errors = [LintError(line_number=4, message="msg", rule_name="rule")]
+    encoded = encode_result("a.md", "h", {"mtime_ns": 1, "size": 2, "inode": 3}, errors)
+
+    assert encoded == ("a.md", "h", (1, 2, 3), ((4, "msg", "rule"),), {})
+    assert decode_result(encoded) == ("a.md", "h", {"mtime_ns": 1, "size": 2, "inode": 3}, errors, {})
+
+
+def test_decoded_errors_share_interned_rule_names():
+    rule_name = RequireSectionLicense({}).name
+    encoded = ("a.md", "h", (1, 2, 3), ((1, "a", "".join(["require-section-", "license"])), (2, "b", rule_name)), {})
+
+    first, second = decode_result(encoded)[3]
+    assert first.rule_name is second.rule_name is rule_name
+    assert not hasattr(first, "__dict__")
+
+
+def test_lint_chunk_uses_worker_runner(old_markdown_file, tmp_path):
+    missing = tmp_path / "missing.md"
+    missing.write_text("# Nothing here\n", encoding="utf-8")
+    init_worker({"rules": {"require-section-license": "on"}})
+
+    encoded, stats = lint_chunk([(old_markdown_file, None), (str(missing), None)])
+    results = [decode_result(r) for r in encoded]
+
+    assert [len(errors) for _, _, _, errors, _ in results] == [0, 1]
+    assert stats is None
+
+
+def test_project_facts_are_cached_and_reused(monkeypatch, tmp_path):
+    guide = tmp_path / "guide.md"
+    guide.write_text("# Guide\n## Install\n", encoding="utf-8")
+    readme = tmp_path / "README.md"
+    readme.write_text("# Readme\nSee [setup](guide.md#setup).\n", encoding="utf-8")
+    runner = LintRunner({"rules": {"broken-link-check": "on"}})
+
+    results = [runner.run(str(path), {}) for path in (guide, readme)]
+    facts_by_file = {file_path: facts for file_path, _, _, _, facts in results}
+    assert facts_by_file[str(readme)]["broken-link-check-rule"]["anchors"] == [[2, "guide.md#setup"]]
+    assert runner.needs_project_check(facts_by_file[str(readme)])
+    assert not runner.needs_project_check(facts_by_file[str(guide)])
+
+    errors = runner.check_project(facts_by_file)
+    assert list(errors) == [str(readme)]
+    assert "does not match any heading in 'guide.md'" in errors[str(readme)][0].message
+
+    file_path, file_hash, file_stat, run_errors, facts = results[1]
+    entry = runner.cache_entry(file_hash, file_stat, run_errors, facts)
+    monkeypatch.setattr(runner.parser, "parse", lambda _path: pytest.fail("facts should come from the cache"))
+    assert runner.run(file_path, {file_path: entry})[4] == facts
+
+
+def test_header_only_rules_never_extract_links(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("# Project\nSee [the guide](guide.md).\n", encoding="utf-8")
+    runner = LintRunner({"rules": {"require-section-license": "on", "section-order": {"order": ["Project"]}}})
+
+    class NoLinks:
+        def finditer(self, _line):
+            raise AssertionError("links should not be extracted")
+
+    runner.parser.link_regex = NoLinks()
+    _, _, _, errors, _ = runner.run(str(path), {})
+
+    assert runner.required_features(runner.rules) == {"headers"}
+    assert [e.rule_name for e in errors] == ["require-section-license"]
+
+
+def test_changed_file_is_read_once_for_hashing_and_parsing(monkeypatch, old_markdown_file):
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    monkeypatch.setattr(runner.parser, "parse", lambda *_args: pytest.fail("the file should not be reopened"))
+
+    _, file_hash, _, errors, _ = runner.run(old_markdown_file, {})
+
+    assert file_hash == _get_file_hash(old_markdown_file)
+    assert errors == []
+
+
+def test_lint_text_lints_in_memory_markdown(tmp_path):
+    (tmp_path / "guide.md").write_text("# Guide\n", encoding="utf-8")
+    runner = LintRunner({"rules": {"require-section-license": "on", "broken-link-check": "on"}})
+
+    errors = runner.lint_text("# Readme\n[a](#nope) [b](guide.md#setup)\n", str(tmp_path / "README.md"))
+
+    assert [(e.rule_name, e.line_number) for e in errors] == [
+        ("require-section-license", 1), ("broken-link-check-rule", 2), ("broken-link-check-rule", 2)]
+    assert "in 'guide.md'" in errors[2].message
+
+
+def test_parser_mmap_threshold_comes_from_config():
+    assert LintRunner({}).parser.mmap_threshold == 64 * 1024 * 1024
+    assert LintRunner({"parser": {"mmap_threshold_mb": 0.5}}).parser.mmap_threshold == 512 * 1024
+    assert LintRunner({"parser": {"mmap_threshold_mb": 0}}).parser.mmap_threshold is None
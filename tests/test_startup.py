@@ -0,0 +1,72 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported until a command or rule actually needs them.
+HEAVY_MODULES = {
+    "requests",
+    "numpy",
+    "yaml",
+    "sqlite3",
+    "multiprocessing",
+    "subprocess",
+    "concurrent.futures.process",
+    "urllib.request",
+    "fds_dev.lsp",
+    "fds_dev.vcs",
+    "fds_dev.translator",
+    "fds_dev.i18n.code_comment_parser",
+    "fds_dev.i18n.language",
+    "fds_dev.i18n.metacognition",
+    "fds_dev.i18n.translation",
+}
+
+
+def _imported_modules(code):
+    """
+    Runs code in a fresh interpreter under -X importtime and returns the names
+    of imported modules. sys.modules is dumped as well because imports made
+    through importlib.import_module are not reported by -X importtime.
+    """
+    script = code + "\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    timed = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+    return timed | set(result.stdout.split())
+
+
+def test_cli_help_skips_heavy_imports():
+    modules = _imported_modules("from fds_dev.main import cli\ncli(['--help'], standalone_mode=False)")
+
+    assert "fds_dev.main" in modules
+    assert not HEAVY_MODULES & modules
+
+
+def test_i18n_package_imports_submodules_on_demand():
+    modules = _imported_modules("from fds_dev.i18n import LanguageDetector")
+
+    assert "fds_dev.i18n.language" in modules
+    assert "fds_dev.i18n.metacognition" not in modules
+    assert "fds_dev.i18n.translation" not in modules
+
+
+def test_i18n_lazy_exports_resolve():
+    import fds_dev.i18n as i18n
+
+    assert set(i18n.__all__) <= set(dir(i18n))
+    assert i18n.TranslationQualityOracle.__module__ == "fds_dev.i18n.metacognition"
+    with pytest.raises(AttributeError):
+        _ = i18n.DoesNotExist  # resolved through the lazy __getattr__
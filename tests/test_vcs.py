@@ -0,0 +1,119 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from fds_dev.main import cli
+from fds_dev.runner import LintRunner
+from fds_dev.vcs import GitError, changed_files, staged_files
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A git repository with one committed docs tree."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "dev")
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("# A\n\n## License\n", encoding="utf-8")
+    (docs / "b.md").write_text("# B\n\n## License\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("text\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def test_changed_since_lists_modified_markdown_under_target(repo):
+    (repo / "docs" / "a.md").write_text("# A changed\n", encoding="utf-8")
+    (repo / "notes.txt").write_text("changed\n", encoding="utf-8")
+    (repo / "README.md").write_text("# Root\n", encoding="utf-8")
+    _git(repo, "add", "README.md")
+
+    target = str(repo / "docs")
+    assert changed_files(target, "HEAD") == [os.path.join(target, "a.md")]
+    assert sorted(changed_files(str(repo), "HEAD")) == [
+        os.path.join(str(repo), "README.md"),
+        os.path.join(str(repo), "docs", "a.md"),
+    ]
+
+
+def test_changed_since_applies_exclude_globs(repo):
+    (repo / "docs" / "a.md").write_text("# A changed\n", encoding="utf-8")
+    assert changed_files(str(repo), "HEAD", exclude=["docs/"]) == []
+
+
+def test_staged_reads_index_contents_not_working_tree(repo):
+    path = repo / "docs" / "b.md"
+    path.write_text("# Staged without license\n", encoding="utf-8")
+    _git(repo, "add", "docs/b.md")
+    path.write_text("# Working tree\n\n## License\n", encoding="utf-8")
+
+    blobs = staged_files(str(repo / "docs"))
+
+    assert blobs == {str(path): b"# Staged without license\n"}
+
+
+def test_run_content_matches_run_for_same_bytes(repo):
+    path = str(repo / "docs" / "a.md")
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+
+    _, disk_hash, _, disk_errors, _ = runner.run(path, {})
+    with open(path, "rb") as f:
+        _, blob_hash, file_stat, blob_errors, _ = runner.run_content(path, f.read(), {})
+
+    assert blob_hash == disk_hash
+    assert blob_errors == disk_errors
+    assert file_stat == {}
+
+
+def test_lint_staged_reports_index_errors(repo):
+    path = repo / "docs" / "b.md"
+    path.write_text("# Staged only\n", encoding="utf-8")
+    _git(repo, "add", "docs/b.md")
+    path.write_text("# Fixed\n\n## License\n", encoding="utf-8")
+    (repo / ".fdsrc.yaml").write_text("rules:\n  require-section-license: on\n", encoding="utf-8")
+
+    result = CliRunner().invoke(cli, ["lint", str(repo / "docs"), "--staged"])
+
+    assert result.exit_code == 0, result.output
+    assert "Found 1 file(s)" in result.output
+    assert "missing a 'License' section" in result.output
+
+
+def test_git_modes_are_mutually_exclusive(repo):
+    result = CliRunner().invoke(cli, ["lint", str(repo), "--staged", "--changed-since", "HEAD"])
+    assert result.exit_code != 0
+    assert "cannot be used together" in result.output
+
+
+def test_outside_a_repository_raises(tmp_path):
+    with pytest.raises(GitError):
+        changed_files(str(tmp_path), "HEAD")
+
+
+def test_near_duplicate_only_compares_the_files_of_a_git_run(repo):
+    text = " ".join(f"word{n}" for n in range(80))
+    docs = repo / "docs"
+    (docs / "a.md").write_text(f"# A\n\n{text}\n", encoding="utf-8")
+    (docs / "b.md").write_text(f"# B\n\n{text}\n", encoding="utf-8")
+    (repo / ".fdsrc.yaml").write_text("rules:\n  near-duplicate: 'on'\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "copies")
+    (docs / "b.md").write_text(f"# B edited\n\n{text}\n", encoding="utf-8")
+
+    # b.md is the only changed file, so its unchanged copy a.md is not compared.
+    result = CliRunner().invoke(cli, ["lint", str(docs), "--changed-since", "HEAD"])
+    assert result.exit_code == 0, result.output
+    assert "near-duplicate" not in result.output
+
+    result = CliRunner().invoke(cli, ["lint", str(docs)])
+    assert "Document is a near-duplicate of 'a.md'" in result.output
@@ -0,0 +1,66 @@
+import os
+
+from fds_dev.main import watch_and_relint
+from fds_dev.output import OutputFormatter
+from fds_dev.runner import LintRunner
+from fds_dev.watch import PollingWatcher
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_poll_reports_added_modified_and_removed_files(tmp_path):
+    kept = tmp_path / "kept.md"
+    edited = tmp_path / "edited.md"
+    gone = tmp_path / "gone.md"
+    for path in (kept, edited, gone):
+        path.write_text("# Title\n", encoding="utf-8")
+    watcher = PollingWatcher(str(tmp_path))
+
+    edited.write_text("# Title, edited\n", encoding="utf-8")
+    _bump_mtime(edited)
+    gone.unlink()
+    added = tmp_path / "added.md"
+    added.write_text("# New\n", encoding="utf-8")
+
+    changed, removed = watcher.poll()
+
+    assert sorted(changed) == sorted([str(edited), str(added)])
+    assert removed == [str(gone)]
+    assert watcher.poll() == ([], [])
+
+
+def test_poll_ignores_excluded_paths(tmp_path):
+    drafts = tmp_path / "drafts"
+    drafts.mkdir()
+    watcher = PollingWatcher(str(tmp_path), exclude=["drafts/"])
+
+    (drafts / "wip.md").write_text("# WIP\n", encoding="utf-8")
+
+    assert watcher.poll() == ([], [])
+
+
+class _ScriptedWatcher:
+    def __init__(self, change_sets):
+        self.change_sets = change_sets
+
+    def changes(self):
+        yield from self.change_sets
+
+
+def test_watch_relints_changed_files_with_resident_state(tmp_path, capsys):
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Title\n", encoding="utf-8")
+    other = tmp_path / "other.md"
+    runner = LintRunner({"rules": {"require-section-license": "on"}})
+    cache = {}
+    results = [(str(doc), []), (str(other), [])]
+
+    watch_and_relint(_ScriptedWatcher([([str(doc)], [str(other)])]), runner, cache, OutputFormatter(), results)
+
+    output = capsys.readouterr().out
+    assert f"Found 1 issue in {doc}" in output
+    assert str(other) not in output
+    assert cache[str(doc)]["rules"]["require-section-license"]["errors"]